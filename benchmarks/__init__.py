@@ -0,0 +1,2 @@
+# benchmarks/__init__.py
+# This is the offline benchmarking toolkit for the application.
@@ -0,0 +1,44 @@
+# benchmarks/bench_async_core.py
+# This is the asyncio core benchmark: snapshot() (status, prefs and peer pings
+# fanned out through gather_all, retry and ping_many) against the fake daemon
+# and the fake CLI.
+
+import asyncio
+import pytest
+from .harness import PEER_COUNTS
+
+@pytest.fixture(scope="module")
+def fake_cli(tmp_path_factory):
+    from .fake_tailscale import install
+    return install(str(tmp_path_factory.mktemp("fakebin")))
+
+@pytest.fixture
+def async_core(fake_daemon, fake_cli, monkeypatch):
+    """async_core(peers) -> the async_core module, with the fake daemon and CLI behind it."""
+    def start(peers):
+        from src.core import async_core
+        fake_daemon(peers)
+        monkeypatch.setenv("TAILSCALE_CLI_PATH", fake_cli)
+        monkeypatch.setenv("FAKE_TS_PEERS", str(peers))
+        return async_core
+    return start
+
+@pytest.mark.parametrize("use_local_api", (True, False), ids=("localapi", "cli"))
+@pytest.mark.parametrize("peers", PEER_COUNTS[:3])
+def bench_snapshot(benchmark, async_core, peers, use_local_api):
+    """Status and prefs fetched concurrently, no pings."""
+    core = async_core(peers)
+    result = benchmark.pedantic(lambda: asyncio.run(core.snapshot(use_local_api)), rounds=10, warmup_rounds=1)
+    assert result["connected"]
+    assert len(result["status"]["Peer"]) == peers
+    assert result["prefs"]["ControlURL"]
+
+@pytest.mark.parametrize("ping_peers", (1, 8, 32))
+def bench_snapshot_pings(benchmark, async_core, monkeypatch, ping_peers):
+    """snapshot() plus one CLI ping per online peer, at most 8 in flight."""
+    core = async_core(100)
+    # A real ping mostly waits on the network; without that the runs only time interpreter startups
+    monkeypatch.setenv("FAKE_TS_DELAY_PING", "0.05")
+    result = benchmark.pedantic(lambda: asyncio.run(core.snapshot(ping_peers=ping_peers)), rounds=5, warmup_rounds=1)
+    assert len(result["latencies"]) == ping_peers
+    assert all(latency is not None for latency in result["latencies"].values())
@@ -0,0 +1,54 @@
+# benchmarks/bench_network_monitor.py
+# This is the network change benchmark: rtnetlink datagrams fed through a
+# socketpair into NetlinkBackend, up to the debounced network_changed signal.
+
+import socket
+import threading
+import pytest
+from src.core.network_monitor import (NetworkMonitor, NetlinkBackend, parse_netlink_messages,
+                                      NLMSG_HEADER, RTM_NEWLINK, RTM_NEWADDR)
+
+RTM_NEWROUTE = 24  # Not subscribed to; must be ignored
+IFINFOMSG_SIZE = 16
+IFADDRMSG_SIZE = 8
+
+def _nlmsg(msg_type, payload_size):
+    return NLMSG_HEADER.pack(NLMSG_HEADER.size + payload_size, msg_type, 0, 0, 0) + bytes(payload_size)
+
+def bench_parse_netlink_burst(benchmark):
+    data = (_nlmsg(RTM_NEWLINK, IFINFOMSG_SIZE) + _nlmsg(RTM_NEWADDR, IFADDRMSG_SIZE)) * 64
+    types = benchmark(parse_netlink_messages, data)
+    assert types.count(RTM_NEWLINK) == types.count(RTM_NEWADDR) == 64
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs AF_UNIX socketpair")
+def bench_netlink_change_delivery(benchmark, qapp):
+    """One RTM_NEWLINK + RTM_NEWADDR datagram to both network_changed emissions."""
+    from PySide6.QtCore import Qt
+    reader, writer = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+    monitor = NetworkMonitor(NetlinkBackend(reader), poll_timeout=0.2, debounce=0.01)
+    received = []
+    delivered = threading.Event()
+
+    def on_changed(kind):
+        received.append(kind)
+        if {"link", "address"} <= set(received):
+            delivered.set()
+    # Direct: record on the monitor thread, no GUI event loop needed
+    monitor.network_changed.connect(on_changed, Qt.DirectConnection)
+
+    datagram = (_nlmsg(RTM_NEWLINK, IFINFOMSG_SIZE) + _nlmsg(RTM_NEWROUTE, IFINFOMSG_SIZE)
+                + _nlmsg(RTM_NEWADDR, IFADDRMSG_SIZE))
+
+    def deliver():
+        received.clear()
+        delivered.clear()
+        writer.send(datagram)
+        assert delivered.wait(2.0), "network_changed did not fire"
+
+    monitor.start()
+    try:
+        benchmark.pedantic(deliver, rounds=20, warmup_rounds=1)
+        assert sorted(received) == ["address", "link"]
+    finally:
+        monitor.stop()
+        writer.close()
@@ -0,0 +1,105 @@
+# benchmarks/bench_status_ingestion.py
+# This is the status update benchmark: the Local API read, JSON decode, cache
+# write, state update and fan-out to the views, at growing tailnet sizes.
+
+import itertools
+import json
+import pytest
+from .harness import PEER_COUNTS, peak_memory
+
+@pytest.mark.parametrize("peers", PEER_COUNTS)
+def bench_local_api_read(benchmark, fake_daemon, peers):
+    from src.utils.local_api import query_local_api
+    fake_daemon(peers)
+    benchmark.extra_info["peak_bytes"] = peak_memory(query_local_api)
+    data = benchmark(query_local_api)
+    assert len(data["Peer"]) == peers
+
+@pytest.mark.parametrize("peers", PEER_COUNTS)
+def bench_status_json_decode(benchmark, fake_daemon, peers):
+    body = fake_daemon(peers).config.status_body()
+    benchmark.extra_info["body_bytes"] = len(body)
+    benchmark.extra_info["peak_bytes"] = peak_memory(json.loads, body)
+    benchmark(json.loads, body)
+
+@pytest.mark.parametrize("peers", PEER_COUNTS)
+def bench_cache_set(benchmark, fake_daemon, tmp_path, peers):
+    from src.core.cache_manager import CacheManager
+    data = json.loads(fake_daemon(peers).config.status_body())
+    cache = CacheManager(str(tmp_path / "ts_cache.json"), expiry_seconds=30)
+    value = {"connected": True, "text": "Connected", "ips": data["TailscaleIPs"], "raw_data": data}
+    benchmark.extra_info["peak_bytes"] = peak_memory(cache.set, "status", value)
+    benchmark(cache.set, "status", value)
+    benchmark.extra_info["cache_file_bytes"] = (tmp_path / "ts_cache.json").stat().st_size
+
+@pytest.mark.parametrize("peers", PEER_COUNTS)
+def bench_check_status(benchmark, qapp, fake_daemon, tmp_path, peers):
+    """TailscaleManager.check_status(force=True) with no views attached."""
+    from src.core.tailscale import TailscaleManager
+    fake_daemon(peers)
+    manager = TailscaleManager(str(tmp_path))
+    benchmark.extra_info["peak_bytes"] = peak_memory(manager.check_status, True)
+    connected, _ = benchmark(manager.check_status, True)
+    assert connected
+    manager.cleanup()
+
+def _rounds(peers):
+    return 5 if peers >= 1000 else 30
+
+@pytest.fixture
+def status_update():
+    """
+    status_update(harness, daemon, changed) -> one forced poll plus the tray menu
+    rebuild. With changed, the daemon alternates between Running and Stopped so
+    every round is a real status and netmap transition that reaches the views;
+    without it every round after the first is skipped as a repeat.
+    """
+    used = []
+    def build(harness, daemon, changed):
+        states = itertools.cycle(("Stopped", "Running"))
+        if changed:
+            used.append(daemon)
+            for state in ("Stopped", "Running"):  # Render both bodies before measuring
+                daemon.config.set_backend_state(state)
+                daemon.config.status_body()
+
+        def update():
+            if changed:
+                daemon.config.set_backend_state(next(states))
+            harness.refresh_status()
+            harness.window.update_tray_menu()
+        return update
+    yield build
+    for daemon in used:
+        daemon.config.set_backend_state("Running")  # Daemons are shared across the session
+
+@pytest.mark.parametrize("changed", (True, False), ids=("changed", "unchanged"))
+@pytest.mark.parametrize("peers", PEER_COUNTS)
+def bench_status_fanout(benchmark, fake_daemon, client, status_update, peers, changed):
+    """
+    One forced poll through the full client: coordinator, state machine,
+    three DashboardView tabs, MainWindow and the tray exit-node menu.
+    """
+    daemon = fake_daemon(peers)
+    harness = client(profiles=3)
+    update = status_update(harness, daemon, changed)
+
+    benchmark.extra_info["peak_bytes"] = peak_memory(update)
+    benchmark.pedantic(update, rounds=_rounds(peers), warmup_rounds=1)
+
+# Opening the peer list builds one widget row per peer; at 10k that takes gigabytes, so stop at 1k.
+@pytest.mark.parametrize("changed", (True, False), ids=("changed", "unchanged"))
+@pytest.mark.parametrize("peers", PEER_COUNTS[:3])
+def bench_status_fanout_peer_list(benchmark, fake_daemon, client, status_update, peers, changed):
+    """bench_status_fanout with the PeerListDialog open; changed rounds rebuild it."""
+    daemon = fake_daemon(peers)
+    harness = client(profiles=3)
+    dialog = harness.open_peer_list()
+    update = status_update(harness, daemon, changed)
+
+    benchmark.extra_info["peak_bytes"] = peak_memory(update)
+    benchmark.pedantic(update, rounds=_rounds(peers), warmup_rounds=1)
+    # Its sparklines keep pinging every online peer until the dialog is gone
+    dialog.close()
+    dialog.deleteLater()
+    harness.process_events()
@@ -0,0 +1,39 @@
+# benchmarks/bench_traffic_db.py
+# This is the traffic database benchmark on a year of synthetic history.
+# For percentiles and size growth over several years use `python -m benchmarks.traffic_db`.
+
+from datetime import datetime, timedelta
+import pytest
+from .traffic_db import generate_history, db_size
+
+PROFILES = [f"Profile {i + 1}" for i in range(5)]
+
+@pytest.fixture(scope="module")
+def traffic_db(tmp_path_factory):
+    from src.core.db_manager import DatabaseManager
+    db = DatabaseManager(str(tmp_path_factory.mktemp("traffic")))
+    end = datetime.now().replace(second=0, microsecond=0)
+    generate_history(db.db_path, PROFILES, end - timedelta(days=365), end)
+    return db
+
+def bench_insert_traffic_data(benchmark, traffic_db):
+    counter = [0]
+    def insert():
+        counter[0] += 4096
+        traffic_db.insert_traffic_data(PROFILES[0], counter[0], counter[0] * 4)
+    benchmark(insert)
+
+def bench_flush_buffer(benchmark, traffic_db):
+    def fill():
+        for profile in PROFILES:
+            traffic_db.traffic_buffer[profile] = {"sent": 1024, "recv": 8192}
+        return (), {}
+    benchmark.pedantic(traffic_db.flush_buffer, setup=fill, rounds=50)
+
+def bench_get_daily_total(benchmark, traffic_db):
+    day = datetime.now() - timedelta(days=180)
+    benchmark(traffic_db.get_daily_total, PROFILES[2], day)
+
+def bench_get_daily_history(benchmark, traffic_db):
+    benchmark.extra_info["db_bytes"] = db_size(traffic_db.db_path)
+    benchmark(traffic_db.get_daily_history, PROFILES[2], 10)
@@ -0,0 +1,41 @@
+# benchmarks/conftest.py
+# This is the pytest fixture module for the offline benchmarks.
+
+import os
+import pytest
+from .harness import DaemonPool, get_qapp
+
+@pytest.fixture(scope="session")
+def daemon_pool():
+    pool = DaemonPool()
+    yield pool
+    pool.close()
+
+@pytest.fixture
+def fake_daemon(daemon_pool, monkeypatch):
+    """fake_daemon(peers, **options) -> running FakeTailscaled, wired in via TAILSCALE_LOCALAPI_SOCKET."""
+    def start(peers, **options):
+        daemon = daemon_pool.get(peers, **options)
+        monkeypatch.setenv("TAILSCALE_LOCALAPI_SOCKET", daemon.socket_path)
+        return daemon
+    return start
+
+@pytest.fixture(scope="session")
+def qapp():
+    pytest.importorskip("PySide6")
+    return get_qapp()
+
+@pytest.fixture
+def client(qapp, tmp_path, monkeypatch):
+    """client(**options) -> ClientHarness in a fresh app directory, closed after the test."""
+    from .harness import ClientHarness
+    # Sparkline pings and CLI fallbacks fail fast instead of spawning processes mid-measurement
+    monkeypatch.setenv("TAILSCALE_CLI_PATH", os.devnull)
+    created = []
+    def build(**options):
+        harness = ClientHarness(str(tmp_path), **options)
+        created.append(harness)
+        return harness
+    yield build
+    for harness in created:
+        harness.close()
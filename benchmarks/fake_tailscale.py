@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# benchmarks/fake_tailscale.py
+# This is the scriptable stand-in for the tailscale CLI used by offline benchmarks.
+#
+# Usage:
+#   python -m benchmarks.fake_tailscale --install /tmp/fakebin   (writes /tmp/fakebin/tailscale)
+#   TAILSCALE_CLI_PATH=/tmp/fakebin/tailscale FAKE_TS_PEERS=5000 python main.py
+#
+# Behaviour is driven by environment variables so QProcess/subprocess callers
+# need no changes:
+#   FAKE_TS_PEERS=100            peers in `status --json`
+#   FAKE_TS_STATE=Running        BackendState to report
+#   FAKE_TS_DELAY=0.0            seconds every command sleeps before answering
+#   FAKE_TS_DELAY_<CMD>=0.0      per-command delay, e.g. FAKE_TS_DELAY_PING=0.2
+#   FAKE_TS_FAIL=up,ping         commands that exit 1 with an error on stderr
+#   FAKE_TS_FAIL_RATE=0.0        share of all invocations that fail
+#   FAKE_TS_HANG=netcheck        commands that never finish (until killed)
+#   FAKE_TS_AUTH_URL=https://... make `up`/`login` print an auth URL and wait
+#   FAKE_TS_LOG=/tmp/calls.log   append one line per invocation (spawn counting)
+
+import os
+import random
+import sys
+import time
+
+VERSION = "1.76.1-fake"
+
+def _env_list(name):
+    return {item.strip() for item in os.environ.get(name, "").split(",") if item.strip()}
+
+def _status_json():
+    import json
+    from benchmarks.fake_tailscaled import make_status
+    status = make_status(int(os.environ.get("FAKE_TS_PEERS", "100")), os.environ.get("FAKE_TS_STATE", "Running"))
+    return json.dumps(status, indent="  ")
+
+def _status_text():
+    if os.environ.get("FAKE_TS_STATE", "Running") != "Running":
+        return "Logged out."
+    from benchmarks.fake_tailscaled import make_status
+    status = make_status(int(os.environ.get("FAKE_TS_PEERS", "100")))
+    rows = ["100.64.0.1      bench-host           bench@       linux   -"]
+    for peer in status["Peer"].values():
+        state = "active; direct" if peer["CurAddr"] else ("idle" if peer["Online"] else "offline")
+        rows.append(f"{peer['TailscaleIPs'][0]:<15} {peer['HostName']:<20} bench@       {peer['OS']:<7} {state}")
+    return "\n".join(rows)
+
+def _prefs_json():
+    import json
+    from benchmarks.fake_tailscaled import make_prefs
+    return json.dumps(make_prefs(), indent="\t")
+
+def _ping(args):
+    target = next((a for a in reversed(args) if not a.startswith("-")), "node-00001")
+    latency = random.randint(8, 40)
+    return f"pong from {target} (100.64.0.2) via 203.0.113.1:41641 in {latency}ms"
+
+NETCHECK = """
+Report:
+\t* UDP: true
+\t* IPv4: yes, 198.51.100.7:41641
+\t* IPv6: no, but OS has support
+\t* MappingVariesByDestIP: false
+\t* PortMapping: UPnP
+\t* Nearest DERP: Frankfurt
+\t* DERP latency:
+\t\t- fra: 12.3ms  (Frankfurt)
+\t\t- lhr: 24.9ms  (London)
+\t\t- nyc: 88.1ms  (New York City)
+""".strip("\n")
+
+def run(argv):
+    """Returns (exit_code, stdout, stderr) for one CLI invocation."""
+    args = [a for a in argv if a]
+    command = next((a for a in args if not a.startswith("-")), "")
+    rest = args[args.index(command) + 1:] if command else []
+
+    log_path = os.environ.get("FAKE_TS_LOG")
+    if log_path:
+        with open(log_path, "a", encoding="utf-8") as f:
+            f.write(f"{time.time():.6f} {os.getpid()} {' '.join(args)}\n")
+
+    delay = float(os.environ.get(f"FAKE_TS_DELAY_{command.upper()}", os.environ.get("FAKE_TS_DELAY", "0")))
+    if delay:
+        time.sleep(delay)
+
+    if command in _env_list("FAKE_TS_HANG"):
+        while True:
+            time.sleep(3600)
+
+    fail_rate = float(os.environ.get("FAKE_TS_FAIL_RATE", "0"))
+    if command in _env_list("FAKE_TS_FAIL") or (fail_rate and random.random() < fail_rate):
+        return 1, "", f"{command}: fake failure injected by FAKE_TS_FAIL"
+
+    if command == "status":
+        return 0, _status_json() if "--json" in rest else _status_text(), ""
+    if command == "ping":
+        return 0, _ping(rest), ""
+    if command == "netcheck":
+        return 0, NETCHECK, ""
+    if command == "version":
+        return 0, f"{VERSION}\n  tailscale commit: 0000000\n  go version: go1.23.0", ""
+    if command == "debug" and rest[:1] == ["prefs"]:
+        return 0, _prefs_json(), ""
+    if command in ("up", "login"):
+        auth_url = os.environ.get("FAKE_TS_AUTH_URL")
+        if auth_url:
+            # Real `up` prints the URL on stderr and blocks until the browser flow completes
+            sys.stderr.write(f"\nTo authenticate, visit:\n\n\t{auth_url}\n\n")
+            sys.stderr.flush()
+            time.sleep(float(os.environ.get("FAKE_TS_AUTH_WAIT", "5")))
+            return 0, "Success.", ""
+        return 0, "", ""
+    if command in ("down", "logout", "set", "switch", "cert", "file", "serve", "funnel", "lock", "web"):
+        return 0, "", ""
+    return 1, "", f"unknown subcommand: {command or '(none)'}"
+
+def install(directory):
+    """Write an executable `tailscale` launcher into directory and return its path."""
+    os.makedirs(directory, exist_ok=True)
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if sys.platform == "win32":
+        path = os.path.join(directory, "tailscale.bat")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f'@set PYTHONPATH={repo_root};%PYTHONPATH%\r\n@"{sys.executable}" -m benchmarks.fake_tailscale %*\r\n')
+        return path
+    path = os.path.join(directory, "tailscale")
+    with open(path, "w", encoding="utf-8") as f:
+        # -S skips site-packages: spawn cost should be the client's, not interpreter startup
+        f.write(f'#!/bin/sh\nPYTHONPATH="{repo_root}${{PYTHONPATH:+:$PYTHONPATH}}" '
+                f'exec "{sys.executable}" -S -m benchmarks.fake_tailscale "$@"\n')
+    os.chmod(path, 0o755)
+    return path
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["--install"]:
+        print(install(argv[1] if len(argv) > 1 else os.path.join(os.getcwd(), "fakebin")))
+        return 0
+    code, out, err = run(argv)
+    if out:
+        sys.stdout.write(out + "\n")
+    if err:
+        sys.stderr.write(err + "\n")
+    return code
+
+if __name__ == "__main__":
+    sys.exit(main())
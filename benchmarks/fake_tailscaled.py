@@ -0,0 +1,287 @@
+# benchmarks/fake_tailscaled.py
+# This is the stand-in tailscaled Local API server for offline benchmarks.
+#
+# Usage:
+#   python -m benchmarks.fake_tailscaled --socket /tmp/fake-ts.sock --peers 5000
+#   TAILSCALE_LOCALAPI_SOCKET=/tmp/fake-ts.sock python main.py
+
+import argparse
+import json
+import os
+import random
+import socketserver
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler
+
+OS_CHOICES = ("linux", "windows", "macOS", "iOS", "android")
+DERP_REGIONS = ("fra", "nyc", "sfo", "sin", "syd", "lhr")
+
+def _iso(dt):
+    return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def make_peer(index, rng, now):
+    """One Peer entry shaped like `tailscale status --json`."""
+    online = rng.random() < 0.7
+    active = online and rng.random() < 0.3
+    direct = active and rng.random() < 0.6
+    host = f"node-{index:05d}"
+    return {
+        "ID": f"n{index:08x}CNTRL",
+        "PublicKey": f"nodekey:{index:064x}",
+        "HostName": host,
+        "DNSName": f"{host}.example.ts.net.",
+        "OS": rng.choice(OS_CHOICES),
+        "UserID": 1000 + index % 50,
+        "TailscaleIPs": [f"100.{64 + index // 65536 % 64}.{index // 256 % 256}.{index % 256}",
+                         f"fd7a:115c:a1e0::{index:x}"],
+        "AllowedIPs": [f"100.{64 + index // 65536 % 64}.{index // 256 % 256}.{index % 256}/32"],
+        "Tags": ["tag:server"] if index % 10 == 0 else None,
+        "PrimaryRoutes": ["10.0.0.0/24"] if index % 97 == 0 else None,
+        "Relay": rng.choice(DERP_REGIONS),
+        "CurAddr": f"203.0.113.{index % 250 + 1}:41641" if direct else "",
+        "RxBytes": rng.randrange(0, 1 << 30) if active else 0,
+        "TxBytes": rng.randrange(0, 1 << 30) if active else 0,
+        "Created": _iso(now - timedelta(days=rng.randrange(1, 900))),
+        "LastSeen": _iso(now - timedelta(minutes=rng.randrange(0, 10000))) if not online else "0001-01-01T00:00:00Z",
+        "KeyExpiry": _iso(now + timedelta(days=rng.randrange(-5, 180))),
+        "Online": online,
+        "Active": active,
+        "ExitNode": False,
+        "ExitNodeOption": index % 53 == 0,
+    }
+
+def make_status(peer_count, backend_state="Running", seed=0):
+    """A complete status document with peer_count peers (deterministic for a given seed)."""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    peers = {}
+    for i in range(1, peer_count + 1):
+        peer = make_peer(i, rng, now)
+        peers[peer["PublicKey"]] = peer
+    return {
+        "Version": "1.76.1-fake",
+        "BackendState": backend_state,
+        "TailscaleIPs": ["100.64.0.1", "fd7a:115c:a1e0::1"] if backend_state == "Running" else [],
+        "Self": {
+            "ID": "nSELFCNTRL",
+            "PublicKey": "nodekey:" + "0" * 64,
+            "HostName": "bench-host",
+            "DNSName": "bench-host.example.ts.net.",
+            "OS": "linux",
+            "TailscaleIPs": ["100.64.0.1", "fd7a:115c:a1e0::1"],
+            "Online": backend_state == "Running",
+            "KeyExpiry": _iso(now + timedelta(days=90)),
+        },
+        "MagicDNSSuffix": "example.ts.net",
+        "CurrentTailnet": {"Name": "example.com", "MagicDNSSuffix": "example.ts.net", "MagicDNSEnabled": True},
+        "User": {"1000": {"ID": 1000, "LoginName": "bench@example.com", "DisplayName": "Bench User"}},
+        "Peer": peers,
+    }
+
+def make_prefs():
+    return {
+        "ControlURL": "https://controlplane.tailscale.com",
+        "RouteAll": True,
+        "ExitNodeID": "",
+        "ExitNodeAllowLANAccess": False,
+        "CorpDNS": True,
+        "RunSSH": False,
+        "WantRunning": True,
+        "ShieldsUp": False,
+        "AdvertiseTags": None,
+        "Hostname": "",
+        "AdvertiseRoutes": None,
+        "NoSNAT": False,
+    }
+
+
+class FakeDaemonConfig:
+    """Response shaping knobs; safe to change while the server runs."""
+    def __init__(self, peers=100, latency=0.0, drip_bytes=0, drip_delay=0.0, chunked=False,
+                 error_rate=0.0, backend_state="Running", seed=0):
+        self.latency = latency          # Seconds before the response starts
+        self.drip_bytes = drip_bytes    # Write the body in pieces of this size (0 = all at once)
+        self.drip_delay = drip_delay    # Seconds between pieces
+        self.chunked = chunked          # Transfer-Encoding: chunked instead of Content-Length
+        self.error_rate = error_rate    # Share of requests answered with HTTP 500
+        self.seed = seed
+        self._lock = threading.Lock()
+        self._status_bodies = {}  # (peers, backend_state, seed) -> encoded body
+        self._peers = peers
+        self._backend_state = backend_state
+
+    @property
+    def peers(self):
+        return self._peers
+
+    def set_peers(self, count):
+        with self._lock:
+            self._peers = count
+
+    def set_backend_state(self, state):
+        with self._lock:
+            self._backend_state = state
+
+    def status_body(self):
+        # Rendering 50k peers takes a while, so each variant is encoded once and kept:
+        # flipping between states (or seeds) costs nothing inside a measurement
+        with self._lock:
+            key = (self._peers, self._backend_state, self.seed)
+            body = self._status_bodies.get(key)
+            if body is None:
+                document = make_status(self._peers, self._backend_state, self.seed)
+                body = self._status_bodies[key] = json.dumps(document, indent="\t").encode("utf-8")
+            return body
+
+
+class _LocalAPIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    config = None
+    stats = None
+
+    def do_GET(self):
+        self._dispatch()
+
+    def do_POST(self):
+        self._dispatch()
+
+    def _dispatch(self):
+        config = self.config
+        self.stats["requests"] += 1
+        if config.latency:
+            time.sleep(config.latency)
+        if config.error_rate and random.random() < config.error_rate:
+            self._send(500, b"fake tailscaled: injected failure\n", "text/plain")
+            return
+
+        endpoint = self.path.split("?", 1)[0]
+        if endpoint == "/localapi/v0/status":
+            self._send(200, config.status_body())
+        elif endpoint == "/localapi/v0/prefs":
+            self._send(200, json.dumps(make_prefs()).encode("utf-8"))
+        elif endpoint == "/localapi/v0/ping":
+            self._send(200, json.dumps({"LatencySeconds": 0.012, "Endpoint": "203.0.113.1:41641",
+                                        "NodeName": "node-00001"}).encode("utf-8"))
+        else:
+            self._send(404, b"not found\n", "text/plain")
+
+    def _send(self, code, body, content_type="application/json"):
+        config = self.config
+        self.send_response(code)
+        self.send_header("Content-Type", content_type)
+        if config.chunked:
+            self.send_header("Transfer-Encoding", "chunked")
+        else:
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+
+        piece = config.drip_bytes or len(body) or 1
+        for start in range(0, len(body), piece):
+            part = body[start:start + piece]
+            if config.chunked:
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(part), part))
+            else:
+                self.wfile.write(part)
+            if config.drip_delay and start + piece < len(body):
+                self.wfile.flush()
+                time.sleep(config.drip_delay)
+        if config.chunked:
+            self.wfile.write(b"0\r\n\r\n")
+        self.stats["bytes"] += len(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class FakeTailscaled:
+    """
+    Serves /localapi/v0/{status,prefs,ping} on a Unix socket from a background
+    thread. restart() drops the socket for a while, like a daemon upgrade.
+    """
+    def __init__(self, socket_path, config=None):
+        self.socket_path = socket_path
+        self.config = config or FakeDaemonConfig()
+        self.stats = {"requests": 0, "bytes": 0, "restarts": 0}
+        self.server = None
+        self.thread = None
+
+    def start(self):
+        if self.server:
+            return
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        handler = type("LocalAPIHandler", (_LocalAPIHandler,), {"config": self.config, "stats": self.stats})
+        self.server = _UnixHTTPServer(self.socket_path, handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, name="fake-tailscaled", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        if not self.server:
+            return
+        self.server.shutdown()
+        self.server.server_close()
+        try:
+            os.remove(self.socket_path)
+        except OSError:
+            pass
+        self.server = None
+        self.thread = None
+
+    def restart(self, downtime=1.0):
+        """Stop, stay unreachable for downtime seconds, then come back. Blocks."""
+        self.stop()
+        self.stats["restarts"] += 1
+        time.sleep(downtime)
+        self.start()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fake tailscaled Local API server for offline benchmarks.")
+    parser.add_argument("--socket", default="/tmp/fake-tailscaled.sock")
+    parser.add_argument("--peers", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds before each response")
+    parser.add_argument("--drip-bytes", type=int, default=0, help="write bodies in pieces of N bytes")
+    parser.add_argument("--drip-delay", type=float, default=0.0, help="seconds between pieces")
+    parser.add_argument("--chunked", action="store_true", help="use chunked transfer encoding")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests failing with 500")
+    parser.add_argument("--state", default="Running", help="BackendState to report")
+    parser.add_argument("--restart-every", type=float, default=0.0, help="restart the daemon every N seconds")
+    parser.add_argument("--restart-downtime", type=float, default=2.0)
+    args = parser.parse_args(argv)
+
+    config = FakeDaemonConfig(peers=args.peers, latency=args.latency, drip_bytes=args.drip_bytes,
+                              drip_delay=args.drip_delay, chunked=args.chunked,
+                              error_rate=args.error_rate, backend_state=args.state)
+    daemon = FakeTailscaled(args.socket, config)
+    config.status_body()  # Render up front so the first request is not an outlier
+    daemon.start()
+    print(f"Fake tailscaled serving {args.peers} peers on {args.socket} (Ctrl+C to stop)")
+    try:
+        while True:
+            if args.restart_every:
+                time.sleep(args.restart_every)
+                print("Restarting...")
+                daemon.restart(args.restart_downtime)
+            else:
+                time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.stop()
+
+if __name__ == "__main__":
+    main()
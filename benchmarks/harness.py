@@ -0,0 +1,112 @@
+# benchmarks/harness.py
+# This is the shared setup for the offline benchmarks: fake daemon sockets,
+# an offscreen Qt application and a fully wired client.
+
+import os
+import shutil
+import tempfile
+import tracemalloc
+
+# Must be set before the first QGuiApplication is created
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+PEER_COUNTS = (10, 100, 1000, 10000)
+
+class DaemonPool:
+    """One FakeTailscaled per peer count, started on first use and reused across benchmarks."""
+    def __init__(self):
+        # AF_UNIX paths are limited to ~104 bytes, so keep them short and out of pytest's tmp tree
+        self.directory = tempfile.mkdtemp(prefix="ftsd-")
+        self.daemons = {}
+
+    def get(self, peers, **options):
+        from .fake_tailscaled import FakeTailscaled, FakeDaemonConfig
+        key = (peers, tuple(sorted(options.items())))
+        daemon = self.daemons.get(key)
+        if daemon is None:
+            config = FakeDaemonConfig(peers=peers, **options)
+            config.status_body()
+            daemon = FakeTailscaled(os.path.join(self.directory, f"{len(self.daemons)}.sock"), config)
+            daemon.start()
+            self.daemons[key] = daemon
+        return daemon
+
+    def close(self):
+        for daemon in self.daemons.values():
+            daemon.stop()
+        self.daemons.clear()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+def get_qapp():
+    from PySide6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
+
+def peak_memory(func, *args, **kwargs):
+    """Peak bytes allocated by Python while running func once (tracemalloc)."""
+    tracemalloc.start()
+    try:
+        func(*args, **kwargs)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+class ClientHarness:
+    """
+    The same object graph main.py builds (Manager, TailscaleManager,
+    StateCoordinator, MainWindow) rooted in a throwaway app directory.
+    Point TAILSCALE_LOCALAPI_SOCKET / TAILSCALE_CLI_PATH at the fakes first.
+    """
+    def __init__(self, app_dir, profiles=3, advanced=True, show=False):
+        from src.core.manager import Manager
+        from src.core.models import Profile
+        from src.core.tailscale import TailscaleManager
+        from src.core.state_coordinator import StateCoordinator
+        from src.ui.main_window import MainWindow
+
+        self.app = get_qapp()
+        self.app_dir = app_dir
+        self.manager = Manager(app_dir)
+        self.manager.settings.advanced_features = advanced
+        self.manager.settings.enable_tray_switcher = advanced
+        for i in range(profiles):
+            name = f"Bench {i + 1}"
+            self.manager.profiles[name] = Profile(name=name)
+
+        self.ts_manager_raw = TailscaleManager(app_dir)
+        self.ts_manager = StateCoordinator(self.manager, self.ts_manager_raw)
+        self.window = MainWindow(self.manager, self.ts_manager)
+        if show:
+            self.window.show()
+        self.process_events()
+
+    def process_events(self):
+        from PySide6.QtCore import QEventLoop, QTimer
+        # A zero-length turn of a real event loop: unlike processEvents() it also honours
+        # deleteLater(), so peer rows replaced by a rebuild (and their ping timers) don't
+        # pile up across rounds
+        loop = QEventLoop()
+        QTimer.singleShot(0, loop.quit)
+        loop.exec()
+
+    def open_peer_list(self):
+        from src.ui.components.peer_dialog import PeerListDialog
+        dialog = PeerListDialog(self.ts_manager, self.window)
+        dialog.show()
+        self.process_events()
+        return dialog
+
+    def refresh_status(self):
+        """One forced poll through the whole pipeline, as the 3 s poll timer would do it."""
+        result = self.ts_manager_raw.check_status(force=True)
+        self.process_events()
+        return result
+
+    def close(self):
+        self.manager.db.flush_buffer()
+        self.ts_manager.cleanup()
+        if hasattr(self.window, "tray_icon"):
+            self.window.tray_icon.hide()
+        self.window.hide()
+        self.window.deleteLater()
+        self.process_events()
@@ -0,0 +1,182 @@
+# benchmarks/traffic_db.py
+# This is the traffic database benchmark and synthetic history generator.
+#
+# Usage:
+#   python -m benchmarks.traffic_db --profiles 5 --years 3 --steps 3
+#   python -m benchmarks.traffic_db --pre-sql "CREATE INDEX idx ON traffic_data(profile, date)"
+#   python -m benchmarks.traffic_db --generate-only --dir /tmp/bigdb   (then point the app at it)
+
+import argparse
+import json
+import math
+import os
+import random
+import shutil
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+FLUSH_INTERVAL = 300  # MainWindow flushes the traffic buffer every 5 minutes
+
+def generate_history(db_path, profiles, start, end, interval=FLUSH_INTERVAL, seed=0, idle_ratio=0.3):
+    """
+    Append synthetic flush rows for every profile between start and end, in
+    time order as the app would write them. Intervals with no traffic are
+    skipped like flush_buffer skips zero deltas. Returns the rows written.
+    """
+    rng = random.Random(seed ^ int(start.timestamp()))
+    step = timedelta(seconds=interval)
+    conn = sqlite3.connect(db_path)
+    try:
+        # Bulk loading only; the app's own connections keep the defaults
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.execute("PRAGMA journal_mode=MEMORY")
+        written = 0
+        batch = []
+        ts = start
+        while ts < end:
+            date_str = ts.strftime("%Y-%m-%d")
+            timestamp_str = ts.strftime("%Y-%m-%d %H:%M:%S")
+            # Busier during the working day, quiet at night
+            diurnal = 0.2 + 0.8 * max(0.0, math.sin(math.pi * (ts.hour + ts.minute / 60 - 6) / 16))
+            for profile in profiles:
+                if rng.random() < idle_ratio:
+                    continue
+                recv = int(rng.lognormvariate(13, 1.5) * diurnal)
+                sent = int(recv * rng.uniform(0.05, 0.6))
+                if sent == 0 and recv == 0:
+                    continue
+                batch.append((profile, date_str, timestamp_str, sent, recv))
+            if len(batch) >= 50000:
+                conn.executemany("INSERT INTO traffic_data (profile, date, timestamp, sent_delta, recv_delta) "
+                                 "VALUES (?, ?, ?, ?, ?)", batch)
+                written += len(batch)
+                batch.clear()
+            ts += step
+        if batch:
+            conn.executemany("INSERT INTO traffic_data (profile, date, timestamp, sent_delta, recv_delta) "
+                             "VALUES (?, ?, ?, ?, ?)", batch)
+            written += len(batch)
+        conn.commit()
+        return written
+    finally:
+        conn.close()
+
+def percentiles(samples):
+    ordered = sorted(samples)
+    def pick(q):
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    return {"p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99), "max": ordered[-1]}
+
+def _timed_calls(func, iterations):
+    samples = []
+    for i in range(iterations):
+        started = time.perf_counter()
+        func(i)
+        samples.append(time.perf_counter() - started)
+    return percentiles(samples)
+
+def measure(db, profiles, first_day, last_day, iterations=200, seed=0):
+    """Latency percentiles (seconds) of the DatabaseManager hot paths on the current data."""
+    rng = random.Random(seed)
+    span_days = max(1, (last_day - first_day).days)
+    counters = {profile: [0, 0] for profile in profiles}
+
+    def insert(i):
+        profile = profiles[i % len(profiles)]
+        counters[profile][0] += rng.randrange(1000, 10 ** 6)
+        counters[profile][1] += rng.randrange(1000, 10 ** 7)
+        db.insert_traffic_data(profile, *counters[profile])
+
+    def flush(i):
+        for profile in profiles:
+            db.traffic_buffer[profile] = {"sent": rng.randrange(1, 10 ** 6), "recv": rng.randrange(1, 10 ** 7)}
+        db.flush_buffer()
+
+    def daily_total(i):
+        day = first_day + timedelta(days=rng.randrange(span_days))
+        db.get_daily_total(rng.choice(profiles), day)
+
+    def daily_history(i):
+        db.get_daily_history(rng.choice(profiles), days=10)
+
+    return {
+        "insert_traffic_data": _timed_calls(insert, iterations),
+        "flush_buffer": _timed_calls(flush, max(1, iterations // 10)),
+        "get_daily_total": _timed_calls(daily_total, iterations),
+        "get_daily_history": _timed_calls(daily_history, iterations),
+    }
+
+def db_size(db_path):
+    return sum(os.path.getsize(p) for p in (db_path, db_path + "-wal", db_path + "-journal") if os.path.exists(p))
+
+def run(base_dir, profile_count=5, years=3.0, steps=3, iterations=200, pre_sql=(), seed=0, generate_only=False, log=print):
+    from src.core.db_manager import DatabaseManager
+
+    db = DatabaseManager(base_dir)  # Creates the schema exactly as the app does
+    for statement in pre_sql:
+        conn = sqlite3.connect(db.db_path)
+        try:
+            conn.execute(statement)
+            conn.commit()
+        finally:
+            conn.close()
+
+    profiles = [f"Profile {i + 1}" for i in range(profile_count)]
+    end = datetime.now().replace(second=0, microsecond=0)
+    start = end - timedelta(days=365 * years)
+    chunk = (end - start) / steps
+    results = []
+    total_rows = 0
+    for step in range(steps):
+        chunk_start = start + chunk * step
+        started = time.perf_counter()
+        total_rows += generate_history(db.db_path, profiles, chunk_start, chunk_start + chunk, seed=seed)
+        generate_seconds = time.perf_counter() - started
+        result = {
+            "history_days": round((chunk_start + chunk - start).days),
+            "rows": total_rows,
+            "db_bytes": db_size(db.db_path),
+            "generate_seconds": round(generate_seconds, 2),
+        }
+        if not generate_only:
+            result["latency"] = measure(db, profiles, start, chunk_start + chunk, iterations, seed)
+        results.append(result)
+        log(format_result(result))
+    return results
+
+def format_result(result):
+    lines = [f"{result['history_days']:>5} days  {result['rows']:>10,} rows  "
+             f"{result['db_bytes'] / 1048576:8.1f} MiB  (generated in {result['generate_seconds']} s)"]
+    for name, stats in result.get("latency", {}).items():
+        lines.append(f"    {name:<20} " + "  ".join(f"{k} {v * 1000:8.3f} ms" for k, v in stats.items()))
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark traffic_stats.db on synthetic multi-year history.")
+    parser.add_argument("--dir", help="app directory to build the database in (default: a temporary one)")
+    parser.add_argument("--profiles", type=int, default=5)
+    parser.add_argument("--years", type=float, default=3.0)
+    parser.add_argument("--steps", type=int, default=3, help="measure after each of N equal slices of history")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--pre-sql", action="append", default=[], help="SQL to run before loading (e.g. an index)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--generate-only", action="store_true", help="fill the database without measuring")
+    parser.add_argument("--json", dest="json_path", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    base_dir = args.dir or tempfile.mkdtemp(prefix="traffic-bench-")
+    os.makedirs(base_dir, exist_ok=True)
+    try:
+        results = run(base_dir, args.profiles, args.years, args.steps, args.iterations,
+                      args.pre_sql, args.seed, args.generate_only)
+        if args.json_path:
+            with open(args.json_path, "w", encoding="utf-8") as f:
+                json.dump({"args": vars(args), "results": results}, f, indent=2)
+    finally:
+        if not args.dir:
+            shutil.rmtree(base_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
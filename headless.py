@@ -0,0 +1,97 @@
+# headless.py
+# This is the headless entry point for the application: the connection engine
+# on a QCoreApplication, without widgets or QtGui (servers, kiosks, jump hosts).
+#
+# Usage:
+#   python headless.py                     (auto-connects if enabled in settings)
+#   python headless.py --profile Office --connect --keep-connected --metrics
+
+import argparse
+import os
+import signal
+import sys
+
+from PySide6.QtCore import QCoreApplication, QLockFile, QTimer
+from src.core.manager import Manager
+from src.core.tailscale import TailscaleManager
+from src.core.state_coordinator import StateCoordinator
+from src.core.headless_service import HeadlessService
+from src.utils.logger import setup_logger
+from src.utils.event_log import setup_event_log
+
+def default_app_dir():
+    # Same data directory as main.py, so profiles, settings and history are shared
+    if sys.platform == "win32":
+        return os.path.join(os.environ.get('APPDATA', ''), "Tailscale_VPN_Client")
+    return os.path.join(os.path.expanduser("~"), ".local", "share", "Tailscale_VPN_Client")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the Tailscale client connection engine without a GUI.")
+    parser.add_argument("--app-dir", default=default_app_dir(), help="data directory (default: the GUI's)")
+    parser.add_argument("--profile", help="profile to use (default: the last used one, else the first)")
+    connect = parser.add_mutually_exclusive_group()
+    connect.add_argument("--connect", dest="auto_connect", action="store_true", default=None,
+                         help="connect on start even if auto-connect is off in the settings")
+    connect.add_argument("--no-connect", dest="auto_connect", action="store_false",
+                         help="only monitor; never connect")
+    parser.add_argument("--keep-connected", action="store_true", help="reconnect with backoff whenever the tunnel drops")
+    parser.add_argument("--logout-on-exit", action="store_true", help="log out when stopped (the GUI requires this)")
+    parser.add_argument("--poll", type=float, default=10, help="status poll interval in seconds")
+    parser.add_argument("--metrics", action="store_true", help="start the OpenMetrics exporter even if disabled in the settings")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    os.makedirs(args.app_dir, exist_ok=True)
+    logger = setup_logger("TailscaleClient", os.path.join(args.app_dir, "app.log"))
+    setup_event_log(args.app_dir)
+    logger.info("Application starting up (headless)...")
+
+    app = QCoreApplication(sys.argv[:1])
+    app.setApplicationName("Tailscale Client Pro")
+
+    # One instance per data directory, GUI included: both would drive the same daemon
+    lock_file = QLockFile(os.path.join(args.app_dir, "app.lock"))
+    if not lock_file.tryLock(2000):
+        logger.error("An instance of Tailscale Client Pro is already running.")
+        return 1
+
+    manager = Manager(args.app_dir)
+    if args.metrics:
+        manager.settings.metrics_exporter = True  # For this run only, not saved
+
+    ts_manager_raw = TailscaleManager(args.app_dir)
+    ts_manager_raw.use_local_api = manager.settings.use_local_api
+    ts_manager_raw.sso_timeout = manager.settings.sso_timeout
+    ts_manager_raw.insecure_ssl = manager.settings.insecure_ssl
+    ts_manager = StateCoordinator(manager, ts_manager_raw)
+
+    from src.core.metrics_exporter import start_metrics_exporter
+    metrics_exporter = start_metrics_exporter(manager.settings, logger)
+
+    service = HeadlessService(manager, ts_manager, profile_name=args.profile, auto_connect=args.auto_connect,
+                              keep_connected=args.keep_connected, poll_seconds=args.poll)
+
+    def request_quit(signum, frame):
+        logger.info(f"Received {signal.Signals(signum).name}, shutting down...")
+        app.quit()
+    signal.signal(signal.SIGINT, request_quit)
+    if hasattr(signal, "SIGTERM"):
+        signal.signal(signal.SIGTERM, request_quit)
+    # Python only runs signal handlers between bytecodes; wake the interpreter regularly
+    wakeup = QTimer()
+    wakeup.timeout.connect(lambda: None)
+    wakeup.start(250)
+
+    QTimer.singleShot(0, service.start)
+    exit_code = app.exec()
+
+    service.stop(logout=args.logout_on_exit)
+    if metrics_exporter:
+        metrics_exporter.stop()
+    lock_file.unlock()
+    logger.info("Headless shutdown complete")
+    return exit_code
+
+if __name__ == "__main__":
+    sys.exit(main())
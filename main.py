@@ -13,6 +13,7 @@ from src.core.manager import Manager
 from src.core.tailscale import TailscaleManager, get_tailscale_path
 from src.ui.main_window import MainWindow
 from src.utils.logger import setup_logger, manage_sys_streams
+from src.utils.event_log import setup_event_log
 
 def is_daemon_running(logger):
     try:
@@ -67,6 +68,7 @@ if __name__ == "__main__":
     os.makedirs(app_dir, exist_ok=True)
     log_file = os.path.join(app_dir, "app.log")
     logger = setup_logger("TailscaleClient", log_file)
+    setup_event_log(app_dir)
     
     logger.info("Application starting up (PySide6 Edition)...")
 
@@ -157,9 +159,15 @@ if __name__ == "__main__":
     # Initialize system stream redirection if enabled
     manage_sys_streams(manager.settings.enable_logs, logger)
     
+    # Optional local OpenMetrics endpoint for fleet scraping
+    from src.core.metrics_exporter import start_metrics_exporter
+    metrics_exporter = start_metrics_exporter(manager.settings, logger)
+    
     window = MainWindow(manager, ts_manager)
     window.show()
     
     exit_code = app.exec()
+    if metrics_exporter:
+        metrics_exporter.stop()
     lock_file.unlock()
     sys.exit(exit_code)
\ No newline at end of file
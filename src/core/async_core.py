@@ -0,0 +1,253 @@
+# src/core/async_core.py
+# This is the asyncio connection core for the application.
+#
+# Coroutine versions of the daemon operations the Qt core drives through
+# QProcess callbacks and QTimer chains: CLI commands, Local API reads, pings,
+# and the timeouts, retries and fan-out around them. They run on any asyncio
+# loop (scripts, benchmarks, headless tools). Qt code reaches them through
+# AsyncBridge, which uses the running qasync loop when the app has one and a
+# private loop on a worker thread otherwise.
+
+import asyncio
+import io
+import json
+import re
+import sys
+import threading
+from collections import namedtuple
+from PySide6.QtCore import QObject, Signal
+from ..utils.local_api import get_local_api_path, local_api_get, _build_request, _read_response, STATUS_ENDPOINT
+from .tailscale import get_tailscale_path, describe_backend_state
+
+PREFS_ENDPOINT = "/localapi/v0/prefs"
+
+CommandResult = namedtuple("CommandResult", ["exit_code", "stdout", "stderr"])
+
+async def run_tailscale(args, timeout=30.0, binary=None):
+    """
+    Run a tailscale CLI command and return its CommandResult. The process is
+    killed if the timeout expires or the awaiting task is cancelled.
+    """
+    proc = await asyncio.create_subprocess_exec(
+        binary or get_tailscale_path(), *args,
+        stdin=asyncio.subprocess.DEVNULL, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+    except BaseException:
+        if proc.returncode is None:
+            proc.kill()
+            await asyncio.shield(proc.wait())
+        raise
+    return CommandResult(proc.returncode, stdout.decode(errors="replace"), stderr.decode(errors="replace"))
+
+async def local_api_get_async(endpoint, path=None, timeout=5.0):
+    """Async counterpart of local_api.local_api_get; same errors, same parsing."""
+    if sys.platform == "win32" or not hasattr(asyncio, "open_unix_connection"):
+        # No async named pipes on the default loop: keep the blocking read off the loop instead
+        return await asyncio.to_thread(local_api_get, endpoint, path, timeout)
+
+    async def fetch():
+        reader, writer = await asyncio.open_unix_connection(get_local_api_path(path))
+        try:
+            writer.write(_build_request(endpoint))
+            await writer.drain()
+            # The request asks for Connection: close, so EOF ends the response
+            return await reader.read()
+        finally:
+            writer.close()
+
+    try:
+        raw = await asyncio.wait_for(fetch(), timeout)
+    except asyncio.TimeoutError:
+        raise RuntimeError(f"Unix Domain Socket connection failed: timed out after {timeout}s")
+    except OSError as e:
+        raise RuntimeError(f"Unix Domain Socket connection failed: {e}")
+    body = _read_response(io.BytesIO(raw).read)
+    if not body:
+        raise RuntimeError("Empty response")
+    return json.loads(body)
+
+async def retry(factory, attempts=3, delay=0.5, backoff=2.0, timeout=None, retry_on=(Exception,)):
+    """
+    Await factory() until it succeeds, at most `attempts` times, sleeping
+    delay, delay * backoff, ... in between. `timeout` bounds each attempt.
+    Cancellation is never retried.
+    """
+    for attempt in range(1, attempts + 1):
+        try:
+            if timeout is None:
+                return await factory()
+            return await asyncio.wait_for(factory(), timeout)
+        except asyncio.CancelledError:
+            raise
+        except retry_on:
+            if attempt == attempts:
+                raise
+            await asyncio.sleep(delay)
+            delay *= backoff
+
+async def gather_all(*coros):
+    """
+    Run coroutines concurrently and return their results in order. If one
+    fails, the others are cancelled and awaited before the error propagates,
+    so nothing outlives the call (TaskGroup semantics on every Python version).
+    """
+    tasks = [asyncio.ensure_future(coro) for coro in coros]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+async def fetch_status(use_local_api=True, timeout=5.0):
+    """Status JSON from the Local API, falling back to `tailscale status --json` like TailscaleManager."""
+    if use_local_api:
+        try:
+            return await local_api_get_async(STATUS_ENDPOINT, timeout=timeout)
+        except Exception:
+            pass
+    result = await run_tailscale(["status", "--json"], timeout=timeout)
+    return json.loads(result.stdout)
+
+async def fetch_connection(use_local_api=True, timeout=5.0):
+    """(is_connected, status_text, data) for the current daemon state."""
+    data = await fetch_status(use_local_api, timeout)
+    is_connected, status_text = describe_backend_state(data.get("BackendState", ""))
+    return is_connected, status_text, data
+
+async def fetch_prefs(use_local_api=True, timeout=5.0):
+    """Live ipn.Prefs from the Local API, falling back to `tailscale debug prefs`."""
+    if use_local_api:
+        try:
+            return await local_api_get_async(PREFS_ENDPOINT, timeout=timeout)
+        except Exception:
+            pass
+    result = await run_tailscale(["debug", "prefs"], timeout=timeout)
+    output = result.stdout.strip()
+    return json.loads(output) if output else {}
+
+async def ping(ip, timeout=2.0):
+    """Round-trip latency to a peer in milliseconds, or None (same parsing as the peer list sparkline)."""
+    try:
+        result = await run_tailscale(["ping", f"--timeout={timeout:g}s", "--until=false", ip], timeout=timeout + 1.0)
+    except (asyncio.TimeoutError, OSError):
+        return None
+    match = re.search(r'in\s+(\d+)\s*ms', result.stdout)
+    return int(match.group(1)) if match else None
+
+async def ping_many(ips, concurrency=8, timeout=2.0):
+    """{ip: latency_ms or None}, with at most `concurrency` pings in flight."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(ip):
+        async with semaphore:
+            return await ping(ip, timeout)
+
+    latencies = await gather_all(*(one(ip) for ip in ips))
+    return dict(zip(ips, latencies))
+
+async def snapshot(use_local_api=True, ping_peers=0, concurrency=8, timeout=5.0):
+    """
+    Status, prefs and (optionally) pings to the first `ping_peers` online
+    peers, fetched concurrently. Returns a dict with keys connected, text,
+    status, prefs and latencies.
+    """
+    (is_connected, status_text, data), prefs = await gather_all(
+        retry(lambda: fetch_connection(use_local_api, timeout), attempts=2),
+        fetch_prefs(use_local_api, timeout))
+    ips = []
+    for peer in (data.get("Peer") or {}).values():
+        if len(ips) >= ping_peers:
+            break
+        if peer.get("Online") and peer.get("TailscaleIPs"):
+            ips.append(peer["TailscaleIPs"][0])
+    latencies = await ping_many(ips, concurrency) if ips else {}
+    return {"connected": is_connected, "text": status_text, "status": data, "prefs": prefs, "latencies": latencies}
+
+
+class AsyncBridge(QObject):
+    """
+    Runs coroutines for Qt code. With a qasync loop running on the GUI thread
+    they become tasks on it; otherwise they run on a private event loop in a
+    daemon thread. Either way callback(result, error) runs on the bridge's
+    thread (the GUI thread) and submit() returns a future that can be cancelled.
+    """
+    _finished = Signal(object, object, object)  # (callback, result, error)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+        # Queued back to the thread that owns the bridge (the GUI thread)
+        self._finished.connect(self._deliver)
+
+    def submit(self, coro, callback=None):
+        try:
+            loop = asyncio.get_running_loop()  # Only with qasync: Qt's own loop is not an asyncio loop
+        except RuntimeError:
+            loop = None
+        if loop is not None:
+            future = loop.create_task(coro)
+        else:
+            future = asyncio.run_coroutine_threadsafe(coro, self._worker_loop())
+        if callback:
+            future.add_done_callback(lambda f: self._finished.emit(callback, *self._outcome(f)))
+        return future
+
+    @staticmethod
+    def _outcome(future):
+        if future.cancelled():
+            return None, asyncio.CancelledError()
+        error = future.exception()
+        return (None, error) if error else (future.result(), None)
+
+    def _worker_loop(self):
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name="async-core", daemon=True)
+                self._thread.start()
+            return self._loop
+
+    def _deliver(self, callback, result, error):
+        if isinstance(error, asyncio.CancelledError):
+            return
+        try:
+            callback(result, error)
+        except RuntimeError:
+            # The receiving dialog was closed before the result arrived
+            pass
+
+    def shutdown(self):
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+
+
+_bridge = None
+
+def get_bridge():
+    """Shared bridge instance; the first call must come from the GUI thread."""
+    global _bridge
+    if _bridge is None:
+        _bridge = AsyncBridge()
+    return _bridge
+
+def install_qasync(app):
+    """
+    Make a qasync event loop the asyncio loop of the Qt application, so
+    AsyncBridge runs coroutines on the GUI thread. Returns the loop, or None
+    when qasync is not installed (the bridge then uses its worker thread).
+    The caller must run the app through the loop (e.g. `with loop: loop.run_forever()`).
+    """
+    try:
+        import qasync
+    except ImportError:
+        return None
+    loop = qasync.QEventLoop(app)
+    asyncio.set_event_loop(loop)
+    return loop
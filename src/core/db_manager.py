@@ -4,7 +4,10 @@
 import sqlite3
 import os
 import logging
+import time
 from datetime import datetime
+from . import metrics
+from .profiling import timed
 
 class DatabaseManager:
     def __init__(self, base_dir):
@@ -102,6 +105,7 @@ class DatabaseManager:
         finally:
             conn.close()
 
+    @timed("DatabaseManager.flush_buffer")
     def flush_buffer(self):
         """Writes all buffered traffic deltas to the database in one batch."""
         if not self.traffic_buffer:
@@ -110,12 +114,14 @@ class DatabaseManager:
         conn = self._create_connection()
         if not conn: return
         
+        started = time.perf_counter()
         try:
             cursor = conn.cursor()
             now = datetime.now()
             date_str = now.strftime("%Y-%m-%d")
             timestamp_str = now.strftime("%Y-%m-%d %H:%M:%S")
             
+            rows = 0
             for profile, data in self.traffic_buffer.items():
                 if data['sent'] == 0 and data['recv'] == 0:
                     continue
@@ -124,8 +130,11 @@ class DatabaseManager:
                     INSERT INTO traffic_data (profile, date, timestamp, sent_delta, recv_delta)
                     VALUES (?, ?, ?, ?, ?);
                 """, (profile, date_str, timestamp_str, data['sent'], data['recv']))
+                rows += 1
             
             conn.commit()
+            metrics.DB_FLUSH_SECONDS.observe(time.perf_counter() - started)
+            metrics.DB_FLUSH_ROWS.inc(rows)
             self.logger.info(f"Flushed traffic buffer for {len(self.traffic_buffer)} profiles.")
             self.traffic_buffer.clear() # Reset buffer after successful flush
         except sqlite3.Error as e:
@@ -0,0 +1,120 @@
+# src/core/dns_resolver.py
+# This is the asynchronous DNS resolver service for the application.
+
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from PySide6.QtCore import QObject, Signal
+
+class DnsResolver(QObject):
+    """
+    Resolves hostnames on a small thread pool with positive/negative TTL caching
+    and a hard timeout, so a broken resolver never blocks the GUI thread.
+    Concurrent lookups of the same host share one in-flight query.
+    """
+    _resolved = Signal(object, str, object)  # (callbacks, host, ip or None)
+
+    def __init__(self, max_workers=4, timeout=3.0, positive_ttl=300.0, negative_ttl=30.0, parent=None):
+        super().__init__(parent)
+        self.timeout = timeout
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dns-resolver")
+        self._cache = {}    # host -> (ip or None, expires_at)
+        self._pending = {}  # host -> [callbacks]
+        self._lock = threading.Lock()
+        # Queued back to the thread that owns the resolver (the GUI thread)
+        self._resolved.connect(self._deliver)
+
+    def cached(self, host):
+        """Return (hit, ip) from the cache; ip is None for a cached failure."""
+        with self._lock:
+            entry = self._cache.get(host.lower())
+            if entry and entry[1] > time.monotonic():
+                return True, entry[0]
+        return False, None
+
+    def invalidate(self, host=None):
+        with self._lock:
+            if host is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(host.lower(), None)
+
+    def lookup(self, host, callback):
+        """
+        Resolve host without blocking. callback(host, ip_or_None) runs on the resolver's
+        thread: immediately for cache hits, otherwise once resolved or timed out.
+        """
+        hit, ip = self.cached(host)
+        if hit:
+            callback(host, ip)
+            return
+
+        key = host.lower()
+        with self._lock:
+            if key in self._pending:
+                self._pending[key].append(callback)
+                return
+            self._pending[key] = [callback]
+
+        timer = threading.Timer(self.timeout, self._complete, args=(key, None))
+        timer.daemon = True
+        timer.start()
+        self._executor.submit(self._resolve_worker, key, timer)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _gethostbyname(host):
+        try:
+            return socket.gethostbyname(host)
+        except (socket.gaierror, socket.herror, UnicodeError, OSError):
+            return None
+
+    def _resolve_worker(self, key, timer):
+        ip = self._gethostbyname(key)
+        timer.cancel()
+        self._complete(key, ip)
+
+    def _store(self, key, ip):
+        ttl = self.positive_ttl if ip else self.negative_ttl
+        with self._lock:
+            self._cache[key] = (ip, time.monotonic() + ttl)
+
+    def _complete(self, key, ip):
+        with self._lock:
+            callbacks = self._pending.pop(key, None)
+        if callbacks is None and not ip:
+            # Timed out earlier and still failing: the negative entry stands
+            return
+        # A late success after a timeout still refreshes the cache
+        self._store(key, ip)
+        if callbacks:
+            self._resolved.emit(callbacks, key, ip)
+
+    def _deliver(self, callbacks, host, ip):
+        for callback in callbacks:
+            try:
+                callback(host, ip)
+            except Exception:
+                pass
+
+
+_resolver = None
+
+def get_resolver():
+    """Shared resolver instance; the first call must come from the GUI thread."""
+    global _resolver
+    if _resolver is None:
+        _resolver = DnsResolver()
+    return _resolver
+
+def shutdown_resolver():
+    """Stop the shared resolver; the next get_resolver() builds a fresh one."""
+    global _resolver
+    resolver, _resolver = _resolver, None
+    if resolver is not None:
+        resolver.shutdown()
@@ -0,0 +1,171 @@
+# src/core/headless_service.py
+# This is the headless connection service for the application (no widgets, no QtGui).
+
+import logging
+from PySide6.QtCore import QObject, QProcess, QTimer
+from . import metrics
+
+logger = logging.getLogger("TailscaleClient")
+
+class HeadlessService(QObject):
+    """
+    Runs the connection engine without a window: waits for the daemon,
+    auto-connects a profile, keeps it connected, polls the status and
+    records traffic the same way the dashboard does.
+    """
+    def __init__(self, manager, ts_manager, profile_name=None, auto_connect=None, keep_connected=False,
+                 poll_seconds=10, traffic_seconds=3, flush_seconds=300, parent=None):
+        super().__init__(parent)
+        self.manager = manager
+        self.ts_manager = ts_manager
+        self.profile = self._pick_profile(profile_name)
+        self.auto_connect = manager.settings.auto_connect if auto_connect is None else auto_connect
+        self.keep_connected = keep_connected
+
+        self._connected = False
+        self._want_connected = False
+        self._login_pending = False
+        self._awaiting_first_status = False
+        self._reconnect_delay = 0
+        self._daemon_retries = 0
+
+        self.ts_manager.connection_status_changed.connect(self._on_status_changed)
+        self.ts_manager.worker.error_received.connect(lambda message: logger.warning(message))
+        self.ts_manager.worker.sso_url_found.connect(self._on_sso_url_found)
+        self.ts_manager.worker.finished.connect(self._on_command_finished)
+
+        self.poll_timer = QTimer(self)
+        self.poll_timer.setInterval(int(poll_seconds * 1000))
+        self.poll_timer.timeout.connect(lambda: self.ts_manager.check_status(force=True))
+
+        self.traffic_timer = QTimer(self)
+        self.traffic_timer.setInterval(int(traffic_seconds * 1000))
+        self.traffic_timer.timeout.connect(self._record_traffic)
+
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setInterval(int(flush_seconds * 1000))
+        self.flush_timer.timeout.connect(self.manager.db.flush_buffer)
+
+        self.reconnect_timer = QTimer(self)
+        self.reconnect_timer.setSingleShot(True)
+        self.reconnect_timer.timeout.connect(self._on_reconnect_timer)
+
+    def _pick_profile(self, profile_name):
+        profiles = self.manager.profiles
+        for name in (profile_name, self.manager.settings.last_profile):
+            if name and name in profiles:
+                return profiles[name]
+        if profile_name:
+            logger.error(f"Profile '{profile_name}' not found; available: {', '.join(profiles) or 'none'}")
+            return None
+        return next(iter(profiles.values()), None)
+
+    def start(self):
+        logger.info(f"Headless mode starting (profile: {self.profile.name if self.profile else 'none'})")
+        self.flush_timer.start()
+        self.traffic_timer.start()
+        self._wait_for_daemon()
+
+    def _wait_for_daemon(self):
+        from src.utils.local_api import is_local_api_available
+        if not self.ts_manager.use_local_api or is_local_api_available():
+            self._on_daemon_ready()
+            return
+
+        # Same budget as the GUI's startup wait: every 2 seconds, at least 5 times
+        max_retries = max(5, self.manager.settings.startup_delay // 2)
+        if self._daemon_retries == 0:
+            logger.warning("tailscaled is not reachable yet, trying to start the service...")
+            self.ts_manager.start_service()
+        if self._daemon_retries < max_retries:
+            self._daemon_retries += 1
+            QTimer.singleShot(2000, self._wait_for_daemon)
+        else:
+            logger.error("tailscaled did not come up; continuing, the status poll will keep trying")
+            self._on_daemon_ready()
+
+    def _on_daemon_ready(self):
+        # The CLI status path answers "Checking..." and reports later, so auto-connect
+        # is decided on the first real status delivered to _on_status_changed
+        self.poll_timer.start()
+        self._awaiting_first_status = True
+        self.ts_manager.resend_status()
+        self.ts_manager.check_status(force=True)
+
+    def connect_profile(self):
+        if not self.profile:
+            logger.error("No profile to connect; create one in the GUI first")
+            return
+        self._want_connected = True
+        logger.info(f"Connecting profile '{self.profile.name}'")
+        native_profile = self.manager.native_profile_for(self.profile)
+        if native_profile:
+            self.ts_manager.switch_profile(native_profile, self.profile.name)
+        else:
+            self.ts_manager.connect(**self.manager.connect_kwargs(self.profile))
+        QTimer.singleShot(2000, lambda: self.ts_manager.check_status(force=True))
+
+    def _on_status_changed(self, is_connected, status_text):
+        was_connected, self._connected = self._connected, is_connected
+        logger.info(f"Status: {status_text}")
+        if self._awaiting_first_status:
+            self._awaiting_first_status = False
+            if self.auto_connect and not is_connected:
+                self.connect_profile()
+                return
+        if is_connected:
+            self._login_pending = False
+            self._reconnect_delay = 0
+            self.reconnect_timer.stop()
+        elif was_connected or status_text in ("Disconnected", "Stopped", "Logged Out"):
+            self._schedule_reconnect()
+
+    def _on_sso_url_found(self, url):
+        self._login_pending = True
+        logger.warning(f"Login required, open this URL to authenticate: {url}")
+
+    def _on_command_finished(self, code, status):
+        # The backoff starts once `up` (or its login) is over, never alongside it; after a
+        # clean exit the status poll that follows decides
+        self._login_pending = False
+        if code != 0 and not self._connected:
+            self._schedule_reconnect()
+
+    def _command_running(self):
+        return self.ts_manager.worker.process.state() != QProcess.NotRunning
+
+    def _on_reconnect_timer(self):
+        # A command started meanwhile (e.g. a state machine retry) reschedules when it finishes
+        if self._connected or self._login_pending or self._command_running():
+            return
+        self.connect_profile()
+
+    def _schedule_reconnect(self):
+        """Bring a dropped tunnel back up; the state machine only retries failed connects."""
+        if not (self.keep_connected and self._want_connected and self.profile):
+            return
+        if self.reconnect_timer.isActive() or self._login_pending or self._command_running():
+            return
+        # 5 s, 10 s, 20 s ... capped at 5 minutes
+        self._reconnect_delay = min(300, self._reconnect_delay * 2 or 5)
+        metrics.RECONNECT_ATTEMPTS.inc(reason="headless")
+        logger.warning(f"Tunnel is down, reconnecting in {self._reconnect_delay} s")
+        self.reconnect_timer.start(self._reconnect_delay * 1000)
+
+    def _record_traffic(self):
+        # Mirrors DashboardView._update_traffic_label for the active profile
+        if not (self._connected and self.profile):
+            return
+        stats = self.ts_manager.get_stats()
+        if stats:
+            self.manager.db.insert_traffic_data(self.profile.name, stats.bytes_sent, stats.bytes_recv)
+
+    def stop(self, logout=False):
+        for timer in (self.poll_timer, self.traffic_timer, self.flush_timer, self.reconnect_timer):
+            timer.stop()
+        self._want_connected = False
+        if logout and self._connected:
+            logger.info("Logging out before exit")
+            self.ts_manager.logout_sync()
+        self.manager.db.flush_buffer()
+        self.ts_manager.cleanup()
@@ -4,6 +4,7 @@ import shutil
 from typing import Dict, List, Optional
 from .models import Profile, AppSettings
 from ..utils.crypto import CryptoManager
+from .profiling import timed
 
 class Manager:
     def __init__(self, base_dir: str):
@@ -95,6 +96,7 @@ class Manager:
             except Exception:
                 pass
 
+    @timed("Manager.save_profiles")
     def save_profiles(self):
         # Save tab_names.json
         tab_names = {str(i+1): name for i, name in enumerate(self.profiles.keys())}
@@ -194,3 +196,37 @@ class Manager:
 
             del self.profiles[name]
             self.save_profiles()
+
+    def native_profile_for(self, profile: Optional[Profile]) -> str:
+        """The native Tailscale profile to switch to instead of `up`, if any (advanced mode only)."""
+        if profile and self.settings.advanced_features:
+            return profile.native_profile or ""
+        return ""
+
+    def connect_kwargs(self, profile: Optional[Profile], login_server: Optional[str] = None) -> dict:
+        """Keyword arguments for TailscaleManager.connect(); the advanced options only apply when enabled."""
+        advanced = bool(profile) and self.settings.advanced_features
+
+        def option(name, default):
+            return getattr(profile, name) if advanced else default
+
+        # Original app uses 'google' for SSO
+        is_sso = profile.auth_mode == "google" if profile else False
+        return {
+            "login_server": login_server if login_server is not None else (profile.login_server if profile else "https://controlplane.tailscale.com"),
+            "auth_key": None if is_sso else (profile.auth_key if profile else ""),
+            "use_sso": is_sso,
+            "profile_name": profile.name if profile else None,
+            "exit_node": option("exit_node", ""),
+            "routes": option("routes", ""),
+            "ssh": option("enable_ssh", False),
+            "accept_dns": option("accept_dns", False),
+            "allow_lan": option("allow_lan", False),
+            "disable_snat": option("disable_snat", False),
+            "hostname": option("hostname", ""),
+            "force_reset": option("force_reset", False),
+            "advertise_exit_node": option("advertise_exit_node", False),
+            "shields_up": option("shields_up", False),
+            "force_reauth": option("force_reauth", False),
+            "advertise_tags": option("advertise_tags", ""),
+        }
@@ -0,0 +1,267 @@
+# src/core/metrics.py
+# This is the metrics registry for the application.
+
+import bisect
+import threading
+
+# Latency buckets in seconds, from sub-millisecond Local API calls to slow CLI spawns
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name, help_text, labelnames=(), lock=None):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = lock or threading.Lock()
+        self._values = {}  # label values tuple -> value
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self):
+        """[(labels dict, value)] for every label combination seen so far."""
+        with self._lock:
+            items = list(self._values.items())
+        return [(dict(zip(self.labelnames, key)), self._copy(value)) for key, value in items]
+
+    def _copy(self, value):
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def total(self):
+        with self._lock:
+            return sum(self._values.values())
+
+    def samples(self):
+        # An unlabelled counter exists (at zero) before its first increment
+        if not self.labelnames and not self._values:
+            return [({}, 0)]
+        return super().samples()
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def remove(self, **labels):
+        with self._lock:
+            self._values.pop(self._key(labels), None)
+
+    def value(self, **labels):
+        with self._lock:
+            return self._values.get(self._key(labels))
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS, lock=None):
+        super().__init__(name, help_text, labelnames, lock)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Per-bucket (non-cumulative) counts, +1 slot for +Inf
+                state = {"counts": [0] * (len(self.buckets) + 1), "sum": 0.0, "count": 0, "max": 0.0}
+                self._values[key] = state
+            state["counts"][index] += 1
+            state["sum"] += value
+            state["count"] += 1
+            if value > state["max"]:
+                state["max"] = value
+
+    def _copy(self, state):
+        cumulative = []
+        running = 0
+        for count in state["counts"]:
+            running += count
+            cumulative.append(running)
+        return {
+            "buckets": list(zip(self.buckets + (float("inf"),), cumulative)),
+            "sum": state["sum"],
+            "count": state["count"],
+            "max": state["max"],
+        }
+
+    def quantile(self, q, **labels):
+        """Bucket-interpolated estimate of quantile q (0..1), or None without observations."""
+        with self._lock:
+            state = self._values.get(self._key(labels))
+            if not state or not state["count"]:
+                return None
+            counts = list(state["counts"])
+            total = state["count"]
+            observed_max = state["max"]
+        target = q * total
+        running = 0
+        lower = 0.0
+        for i, count in enumerate(counts):
+            upper = self.buckets[i] if i < len(self.buckets) else observed_max
+            if count and running + count >= target:
+                return min(observed_max, lower + (upper - lower) * (target - running) / count)
+            running += count
+            lower = upper
+        return observed_max
+
+class MetricsRegistry:
+    """Named counters, gauges and histograms, safe to update from any thread."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}
+
+    def _get_or_create(self, cls, name, help_text, labelnames, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, help_text, labelnames, **kwargs)
+                self._metrics[name] = metric
+            elif not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} already registered with a different type or labels")
+            return metric
+
+    def counter(self, name, help_text, labelnames=()):
+        return self._get_or_create(Counter, name, help_text, labelnames)
+
+    def gauge(self, name, help_text, labelnames=()):
+        return self._get_or_create(Gauge, name, help_text, labelnames)
+
+    def histogram(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._get_or_create(Histogram, name, help_text, labelnames, buckets=buckets)
+
+    def get(self, name):
+        return self._metrics.get(name)
+
+    def metrics(self):
+        with self._lock:
+            return list(self._metrics.values())
+
+    def snapshot(self):
+        """{name: {"type", "help", "samples": [(labels, value)]}} copied under the metric locks."""
+        return {
+            metric.name: {"type": metric.kind, "help": metric.help, "samples": metric.samples()}
+            for metric in self.metrics()
+        }
+
+    def reset(self):
+        for metric in self.metrics():
+            metric.clear()
+
+
+REGISTRY = MetricsRegistry()
+
+# --- Client metrics ---
+
+STATE_TRANSITIONS = REGISTRY.counter(
+    "tsclient_state_transitions_total", "Connection state machine transitions.", ("from_state", "to_state"))
+CONNECTION_STATE = REGISTRY.gauge(
+    "tsclient_connection_state", "1 for the current connection state, 0 otherwise.", ("state",))
+RECONNECT_ATTEMPTS = REGISTRY.counter(
+    "tsclient_reconnect_attempts_total", "Automatic reconnect attempts.", ("reason",))
+AUTH_FAILURES = REGISTRY.counter(
+    "tsclient_auth_failures_total", "Failed or timed-out authentications.", ("reason",))
+DAEMON_RESTARTS = REGISTRY.counter(
+    "tsclient_daemon_restarts_total", "Attempts to (re)start the tailscaled service.")
+STATUS_POLL_SECONDS = REGISTRY.histogram(
+    "tsclient_status_poll_seconds", "Time to obtain and parse daemon status.", ("source",))
+STATUS_POLL_ERRORS = REGISTRY.counter(
+    "tsclient_status_poll_errors_total", "Status polls that failed.", ("source",))
+COMMAND_SECONDS = REGISTRY.histogram(
+    "tsclient_command_seconds", "Duration of tailscale CLI commands.", ("command",),
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0))
+COMMAND_FAILURES = REGISTRY.counter(
+    "tsclient_command_failures_total", "tailscale CLI commands that exited non-zero.", ("command",))
+RELAY_USAGE = REGISTRY.gauge(
+    "tsclient_relay_usage_ratio", "Share of active peers reached through a DERP relay.")
+PEERS = REGISTRY.gauge(
+    "tsclient_peers", "Peers in the current netmap.", ("online",))
+PING_LATENCY_SECONDS = REGISTRY.histogram(
+    "tsclient_ping_latency_seconds", "Peer ping round-trip time.")
+PEER_LATENCY_SECONDS = REGISTRY.gauge(
+    "tsclient_peer_latency_seconds", "Most recent ping round-trip time per peer.", ("peer",))
+LATENCY_SPIKES = REGISTRY.counter(
+    "tsclient_latency_spikes_total", "Pings well above the peer's recent average.")
+TRAFFIC_BYTES = REGISTRY.gauge(
+    "tsclient_traffic_bytes", "Tailscale interface byte counters as reported by get_stats.", ("direction",))
+THROUGHPUT_BPS = REGISTRY.gauge(
+    "tsclient_throughput_bytes_per_second", "EWMA-smoothed Tailscale interface throughput.", ("direction",))
+DB_FLUSH_SECONDS = REGISTRY.histogram(
+    "tsclient_db_flush_seconds", "Time to flush buffered traffic deltas to SQLite.")
+DB_FLUSH_ROWS = REGISTRY.counter(
+    "tsclient_db_flushed_rows_total", "Traffic rows written by buffer flushes.")
+
+def command_label(cmd_args):
+    """Low-cardinality label for a CLI invocation: the subcommand only (never its arguments)."""
+    for arg in cmd_args:
+        if not arg.startswith("-"):
+            return arg
+    return "unknown"
+
+def record_status_metrics(raw_data):
+    """Derive peer counts and relay usage from a status JSON document."""
+    peers = (raw_data or {}).get("Peer") or {}
+    online = 0
+    active = 0
+    relayed = 0
+    for peer in peers.values():
+        if peer.get("Online"):
+            online += 1
+        if peer.get("Active"):
+            active += 1
+            # Active without a direct address means traffic goes through DERP
+            if not peer.get("CurAddr") and peer.get("Relay"):
+                relayed += 1
+    PEERS.set(online, online="true")
+    PEERS.set(len(peers) - online, online="false")
+    RELAY_USAGE.set(relayed / active if active else 0.0)
+
+def record_traffic(sample, throughput):
+    """Publish the latest TrafficSampler counter sample and smoothed throughput."""
+    if sample:
+        TRAFFIC_BYTES.set(sample.bytes_sent, direction="sent")
+        TRAFFIC_BYTES.set(sample.bytes_recv, direction="recv")
+    if throughput:
+        THROUGHPUT_BPS.set(throughput.up_ewma_bps, direction="sent")
+        THROUGHPUT_BPS.set(throughput.down_ewma_bps, direction="recv")
+
+def record_ping(peer, latency_ms, recent_ms=()):
+    """Record one ping result; a spike is 3x the recent average and at least 50 ms above it."""
+    seconds = latency_ms / 1000.0
+    PING_LATENCY_SECONDS.observe(seconds)
+    PEER_LATENCY_SECONDS.set(seconds, peer=peer)
+    if recent_ms:
+        average = sum(recent_ms) / len(recent_ms)
+        if latency_ms > average * 3 and latency_ms - average >= 50:
+            LATENCY_SPIKES.inc()
@@ -0,0 +1,173 @@
+# src/core/metrics_exporter.py
+# This is the OpenMetrics exporter for the application.
+
+import errno
+import math
+import os
+import socketserver
+import stat
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from .metrics import REGISTRY
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+DEFAULT_PORT = 9464
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_value(value):
+    if value is None:
+        return "NaN"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, float):
+        if math.isinf(value):
+            return "+Inf" if value > 0 else "-Inf"
+        if math.isnan(value):
+            return "NaN"
+    return repr(value) if isinstance(value, float) else str(value)
+
+def _labels(labels, extra=None):
+    pairs = list(labels.items()) + (list(extra.items()) if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+def render_openmetrics(registry=None):
+    """Render every metric in the registry in the OpenMetrics text format."""
+    registry = registry or REGISTRY
+    lines = []
+    for metric in registry.metrics():
+        family = metric.name
+        if metric.kind == "counter" and family.endswith("_total"):
+            family = family[:-len("_total")]  # Counter samples carry the _total suffix
+        lines.append(f"# TYPE {family} {metric.kind}")
+        lines.append(f"# HELP {family} {_escape(metric.help)}")
+        for labels, value in metric.samples():
+            if metric.kind == "histogram":
+                for bound, count in value["buckets"]:
+                    lines.append(f"{family}_bucket{_labels(labels, {'le': _format_value(float(bound))})} {count}")
+                lines.append(f"{family}_sum{_labels(labels)} {_format_value(float(value['sum']))}")
+                lines.append(f"{family}_count{_labels(labels)} {value['count']}")
+            elif metric.kind == "counter":
+                lines.append(f"{family}_total{_labels(labels)} {_format_value(value)}")
+            else:
+                lines.append(f"{family}{_labels(labels)} {_format_value(value)}")
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry = None
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404, "Only /metrics is served")
+            return
+        try:
+            body = render_openmetrics(self.registry).encode("utf-8")
+        except Exception as e:
+            self.send_error(500, str(e))
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self):
+        # Unix socket peers have no (host, port) tuple
+        if isinstance(self.client_address, tuple) and self.client_address:
+            return str(self.client_address[0])
+        return "unix"
+
+    def log_message(self, format, *args):
+        pass  # Scrapes every few seconds would flood stderr (and app.log via StreamToLogger)
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def _remove_socket(path):
+    """Remove a Unix socket at path; refuse to delete anything else a misconfigured path points to."""
+    try:
+        mode = os.lstat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise OSError(errno.EEXIST, "Not a socket, refusing to replace it", path)
+    os.remove(path)
+
+
+class MetricsExporter:
+    """
+    Serves the metrics registry as OpenMetrics text on GET /metrics, either on a
+    localhost TCP port or on a Unix domain socket, from a background thread.
+    """
+    def __init__(self, registry=None, host="127.0.0.1", port=DEFAULT_PORT, socket_path=None):
+        self.registry = registry or REGISTRY
+        self.host = host
+        self.port = port
+        self.socket_path = socket_path
+        self.server = None
+        self.thread = None
+
+    @property
+    def address(self):
+        if not self.server:
+            return None
+        if self.socket_path:
+            return self.socket_path
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+
+    def start(self):
+        if self.server:
+            return
+        handler = type("MetricsHandler", (_MetricsHandler,), {"registry": self.registry})
+        if self.socket_path:
+            _remove_socket(self.socket_path)  # Stale socket from a previous run
+            # Created 0600 from the start: a chmod after bind leaves a window where anyone can connect
+            old_umask = os.umask(0o177)
+            try:
+                self.server = _UnixHTTPServer(self.socket_path, handler)
+            finally:
+                os.umask(old_umask)
+        else:
+            self.server = ThreadingHTTPServer((self.host, self.port), handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, name="metrics-exporter", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        if not self.server:
+            return
+        self.server.shutdown()
+        self.server.server_close()
+        if self.socket_path:
+            try:
+                _remove_socket(self.socket_path)
+            except OSError:
+                pass
+        self.server = None
+        self.thread = None
+
+
+def start_metrics_exporter(settings, logger=None):
+    """Start the exporter if enabled in AppSettings; returns it, or None."""
+    if not getattr(settings, "metrics_exporter", False):
+        return None
+    socket_path = getattr(settings, "metrics_socket", "") or None
+    if socket_path and not hasattr(socketserver, "UnixStreamServer"):
+        socket_path = None  # No AF_UNIX servers on this platform: fall back to TCP
+    exporter = MetricsExporter(port=getattr(settings, "metrics_port", DEFAULT_PORT), socket_path=socket_path)
+    try:
+        exporter.start()
+    except OSError as e:
+        if logger:
+            logger.error(f"Failed to start metrics exporter: {e}")
+        return None
+    if logger:
+        logger.info(f"Metrics exporter listening on {exporter.address}")
+    return exporter
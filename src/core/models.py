@@ -49,6 +49,9 @@ class AppSettings:
     enable_tray_switcher: bool = False
     insecure_ssl: bool = False
     startup_delay: int = 10
+    metrics_exporter: bool = False
+    metrics_port: int = 9464
+    metrics_socket: str = ""
 
 
 class LoginState(Enum):
@@ -0,0 +1,186 @@
+# src/core/network_monitor.py
+# This is the network change monitor for the application.
+
+import select
+import socket
+import struct
+import sys
+import threading
+import time
+from PySide6.QtCore import QThread, Signal
+
+# rtnetlink message types and multicast groups (linux/rtnetlink.h)
+RTM_NEWLINK = 16
+RTM_DELLINK = 17
+RTM_NEWADDR = 20
+RTM_DELADDR = 21
+RTMGRP_LINK = 0x1
+RTMGRP_IPV4_IFADDR = 0x10
+RTMGRP_IPV6_IFADDR = 0x100
+
+NLMSG_HEADER = struct.Struct("=IHHII")  # length, type, flags, seq, pid
+
+_NETLINK_EVENT_KINDS = {
+    RTM_NEWLINK: "link",
+    RTM_DELLINK: "link",
+    RTM_NEWADDR: "address",
+    RTM_DELADDR: "address",
+}
+
+# A monitor loop iteration taking longer than this (wall clock) means the host was suspended
+RESUME_GAP_SECONDS = 10.0
+
+
+def parse_netlink_messages(data):
+    """Return the message types contained in a raw rtnetlink datagram."""
+    types = []
+    offset = 0
+    while offset + NLMSG_HEADER.size <= len(data):
+        length, msg_type, _, _, _ = NLMSG_HEADER.unpack_from(data, offset)
+        if length < NLMSG_HEADER.size:
+            break
+        types.append(msg_type)
+        offset += (length + 3) & ~3  # NLMSG_ALIGN
+    return types
+
+
+class NetlinkBackend:
+    """Linux backend: blocks on an rtnetlink socket subscribed to link and address changes.
+
+    A pre-built socket-like object (anything select() accepts with recv()) can be
+    injected to feed fake netlink datagrams, e.g. one end of socket.socketpair().
+    """
+    def __init__(self, sock=None):
+        self.sock = sock
+
+    def open(self):
+        if self.sock is None:
+            sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, socket.NETLINK_ROUTE)
+            sock.bind((0, RTMGRP_LINK | RTMGRP_IPV4_IFADDR | RTMGRP_IPV6_IFADDR))
+            self.sock = sock
+
+    def wait(self, timeout):
+        """Block up to timeout seconds and return the change kinds observed."""
+        readable, _, _ = select.select([self.sock], [], [], timeout)
+        if not readable:
+            return []
+        data = self.sock.recv(65536)
+        return [_NETLINK_EVENT_KINDS[t] for t in parse_netlink_messages(data) if t in _NETLINK_EVENT_KINDS]
+
+    def close(self):
+        try:
+            if self.sock is not None:
+                self.sock.close()
+        except OSError:
+            pass
+        self.sock = None
+
+
+class PollingBackend:
+    """Portable backend: compares interface address snapshots on the monitor thread."""
+    def __init__(self, interval=5.0, snapshot_func=None):
+        self.interval = interval
+        self.snapshot_func = snapshot_func or self._snapshot
+        self._last = None
+        self._next_poll = 0.0
+        self._wakeup = threading.Event()
+
+    @staticmethod
+    def _snapshot():
+        import psutil
+        return {
+            iface: tuple(sorted(addr.address for addr in addrs))
+            for iface, addrs in psutil.net_if_addrs().items()
+        }
+
+    def open(self):
+        self._last = self.snapshot_func()
+        self._next_poll = time.monotonic() + self.interval
+
+    def wait(self, timeout):
+        delay = max(0.0, min(timeout, self._next_poll - time.monotonic()))
+        if self._wakeup.wait(delay):
+            return []
+        if time.monotonic() < self._next_poll:
+            return []
+
+        self._next_poll = time.monotonic() + self.interval
+        current = self.snapshot_func()
+        previous, self._last = self._last, current
+        if previous is None or current == previous:
+            return []
+        return ["link"] if set(current) != set(previous) else ["address"]
+
+    def close(self):
+        self._wakeup.set()
+
+
+def create_backend():
+    """Pick the most efficient change source available on this platform."""
+    if sys.platform.startswith("linux") and hasattr(socket, "AF_NETLINK"):
+        return NetlinkBackend()
+    return PollingBackend()
+
+
+class NetworkMonitor(QThread):
+    """
+    Watches for interface/address changes and host suspend/resume off the GUI thread.
+    Bursts of kernel events are debounced into a single network_changed per kind.
+    """
+    network_changed = Signal(str)   # "link" or "address"
+    system_resumed = Signal(float)  # approximate seconds the host was asleep
+
+    def __init__(self, backend=None, poll_timeout=1.0, debounce=0.5, parent=None):
+        super().__init__(parent)
+        self.backend = backend or create_backend()
+        self.poll_timeout = poll_timeout
+        self.debounce = debounce
+        self._running = False
+
+    def start(self, *args):
+        self._running = True
+        super().start(*args)
+
+    def stop(self):
+        self._running = False
+        self.backend.close()
+        self.wait(2000)
+
+    def run(self):
+        try:
+            self.backend.open()
+        except Exception:
+            # Netlink may be unavailable (sandboxing, containers): degrade to polling
+            self.backend = PollingBackend()
+            try:
+                self.backend.open()
+            except Exception:
+                return
+
+        pending = []
+        pending_since = 0.0
+        last_wall = time.time()
+        while self._running:
+            try:
+                kinds = self.backend.wait(self.debounce if pending else self.poll_timeout)
+            except Exception:
+                if not self._running:
+                    break
+                kinds = []
+                time.sleep(self.poll_timeout)
+
+            now = time.time()
+            gap = now - last_wall
+            last_wall = now
+            if gap > RESUME_GAP_SECONDS:
+                self.system_resumed.emit(gap)
+
+            if kinds:
+                if not pending:
+                    pending_since = now
+                pending.extend(k for k in kinds if k not in pending)
+            # Publish once the burst settles, or periodically under a continuous event flood
+            if pending and (not kinds or now - pending_since > self.poll_timeout * 5):
+                for kind in pending:
+                    self.network_changed.emit(kind)
+                pending = []
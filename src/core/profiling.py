@@ -0,0 +1,135 @@
+# src/core/profiling.py
+# This is the opt-in hot-path instrumentation for the application.
+
+import functools
+import io
+import os
+import time
+from .metrics import REGISTRY
+
+# Module-level flag: a disabled timer costs one global lookup and a branch
+_enabled = os.environ.get("TSCLIENT_PROFILE", "") not in ("", "0")
+
+SECTION_SECONDS = REGISTRY.histogram(
+    "tsclient_section_seconds", "Wall time of instrumented hot-path sections (only while profiling is enabled).",
+    ("section",), buckets=(0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.016, 0.033, 0.05, 0.1, 0.25, 0.5, 1.0))
+
+def set_enabled(enabled):
+    global _enabled
+    _enabled = bool(enabled)
+
+def is_enabled():
+    return _enabled
+
+def timed(section):
+    """Decorator recording the wrapped call's duration under section when profiling is enabled."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                SECTION_SECONDS.observe(time.perf_counter() - started, section=section)
+        return wrapper
+    return decorator
+
+class timing:
+    """Context manager counterpart of timed() for sections inside a function."""
+    __slots__ = ("section", "started")
+
+    def __init__(self, section):
+        self.section = section
+        self.started = None
+
+    def __enter__(self):
+        if _enabled:
+            self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if self.started is not None:
+            SECTION_SECONDS.observe(time.perf_counter() - self.started, section=self.section)
+        return False
+
+def section_summary():
+    """[(section, count, p50, p95, max, total)] in seconds, slowest total first."""
+    rows = []
+    for labels, value in SECTION_SECONDS.samples():
+        section = labels["section"]
+        rows.append((
+            section,
+            value["count"],
+            SECTION_SECONDS.quantile(0.5, section=section),
+            SECTION_SECONDS.quantile(0.95, section=section),
+            value["max"],
+            value["sum"],
+        ))
+    rows.sort(key=lambda row: row[5], reverse=True)
+    return rows
+
+
+class ProfileCapture:
+    """
+    Profiles the calling thread (the GUI thread, where jank happens) between
+    start() and stop(). Uses pyinstrument when installed, otherwise cProfile.
+    Results are written to out_dir as profile-<timestamp>.{prof,txt,html}.
+    """
+    def __init__(self, out_dir, prefer_pyinstrument=True):
+        self.out_dir = out_dir
+        self.prefer_pyinstrument = prefer_pyinstrument
+        self.backend = None
+        self._profiler = None
+
+    @property
+    def running(self):
+        return self._profiler is not None
+
+    def start(self):
+        if self._profiler is not None:
+            return
+        if self.prefer_pyinstrument:
+            try:
+                from pyinstrument import Profiler
+                self._profiler = Profiler()
+                self.backend = "pyinstrument"
+            except ImportError:
+                self._profiler = None
+        if self._profiler is None:
+            import cProfile
+            self._profiler = cProfile.Profile()
+            self.backend = "cprofile"
+        if self.backend == "pyinstrument":
+            self._profiler.start()
+        else:
+            self._profiler.enable()
+
+    def stop(self):
+        """Stop profiling and write the report; returns the list of files written."""
+        profiler, self._profiler = self._profiler, None
+        if profiler is None:
+            return []
+        os.makedirs(self.out_dir, exist_ok=True)
+        base = os.path.join(self.out_dir, time.strftime("profile-%Y%m%d-%H%M%S"))
+        written = []
+        if self.backend == "pyinstrument":
+            profiler.stop()
+            with open(base + ".txt", "w", encoding="utf-8") as f:
+                f.write(profiler.output_text(unicode=True, color=False))
+            written.append(base + ".txt")
+            with open(base + ".html", "w", encoding="utf-8") as f:
+                f.write(profiler.output_html())
+            written.append(base + ".html")
+        else:
+            import pstats
+            profiler.disable()
+            profiler.dump_stats(base + ".prof")
+            written.append(base + ".prof")
+            summary = io.StringIO()
+            pstats.Stats(profiler, stream=summary).sort_stats("cumulative").print_stats(40)
+            with open(base + ".txt", "w", encoding="utf-8") as f:
+                f.write(summary.getvalue())
+            written.append(base + ".txt")
+        return written
@@ -3,6 +3,11 @@
 import time
 from PySide6.QtCore import QObject, Signal, QTimer
 from .models import AppState
+from .traffic_sampler import TrafficSampler
+from .network_monitor import NetworkMonitor
+from .dns_resolver import get_resolver, shutdown_resolver
+from ..utils.event_log import log_event
+from . import metrics
 
 class ConnectionStateMachine(QObject):
     """
@@ -17,6 +22,8 @@ class ConnectionStateMachine(QObject):
         self.coordinator = coordinator
         self.ts_manager = ts_manager
         self._state = AppState.DISCONNECTED
+        self._state_since = time.monotonic()
+        self._publish_state_gauge(self._state)
         self._retry_count = 0
         self._max_retries = 3
         
@@ -54,6 +61,17 @@ class ConnectionStateMachine(QObject):
         
         # Apply state change
         self._state = new_state
+        now = time.monotonic()
+        log_event("state_transition", **{"from": old_state.name, "to": new_state.name, "info": info_text,
+                                         "forced": force, "prev_duration_ms": round((now - self._state_since) * 1000)})
+        self._state_since = now
+        metrics.STATE_TRANSITIONS.inc(from_state=old_state.name, to_state=new_state.name)
+        self._publish_state_gauge(new_state)
+        if old_state == AppState.CONNECTING and new_state == AppState.LOGGED_OUT and not force:
+            # The daemon went back to NeedsLogin while we were authenticating
+            metrics.AUTH_FAILURES.inc(reason="rejected")
+        elif new_state == AppState.ERROR and "auth" in (info_text or "").lower():
+            metrics.AUTH_FAILURES.inc(reason="error")
         
         # 3. STATE ENTRY SIDE EFFECTS & ACTIONS (Trigger timeouts, retries, or side effects)
         self._on_state_entry(old_state, new_state, info_text)
@@ -62,6 +80,11 @@ class ConnectionStateMachine(QObject):
         self.state_changed.emit(new_state)
         return True
 
+    @staticmethod
+    def _publish_state_gauge(current):
+        for state in AppState:
+            metrics.CONNECTION_STATE.set(1 if state == current else 0, state=state.name)
+
     def _check_transition_guard(self, old_state, new_state):
         """
         Guards that prevent race conditions, reconnect loops, and stale state transitions.
@@ -119,6 +142,7 @@ class ConnectionStateMachine(QObject):
             self._retry_count += 1
             # Exponential Backoff delay: 3s, 6s, 12s
             delay = (2 ** (self._retry_count - 1)) * 3000
+            metrics.RECONNECT_ATTEMPTS.inc(reason="backoff")
             
             # Notify of auto reconnect attempt
             self.ts_manager.worker.error_received.emit(
@@ -134,6 +158,7 @@ class ConnectionStateMachine(QObject):
     def _on_sso_timeout(self):
         """SSO Timeout ownership callback."""
         if self._state == AppState.CONNECTING:
+            metrics.AUTH_FAILURES.inc(reason="sso_timeout")
             self.ts_manager.worker.cleanup()
             self.transition_to(AppState.ERROR, "SSO Login timed out.")
             self.ts_manager.worker.error_received.emit("SSO Login timed out. Please try connecting again.")
@@ -171,6 +196,7 @@ class StateCoordinator(QObject):
     """
     connection_status_changed = Signal(bool, str)
     state_changed = Signal(object)
+    netmap_changed = Signal()
     
     def __init__(self, manager, ts_manager):
         super().__init__()
@@ -183,27 +209,45 @@ class StateCoordinator(QObject):
         
         # Forward signals from real manager to views
         self.ts_manager.connection_status_changed.connect(self._on_status_changed)
+        self.ts_manager.netmap_changed.connect(self.netmap_changed)
+        
+        # Live throughput sampling, active only while connected
+        self.traffic_sampler = TrafficSampler(self.get_stats, parent=self)
+        self.traffic_sampler.throughput_updated.connect(
+            lambda point: metrics.record_traffic(self.traffic_sampler.samples[-1] if self.traffic_sampler.samples else None, point))
         
         # Cache status to prevent multiple background processes
         self._cached_status = None
         self._last_status_query_time = 0
         self._query_cooldown_seconds = 2.0  # Coalesce queries within 2 seconds
         
-        # Self-healing and Observability metrics
-        self._last_tick_time = time.time()
-        self._last_adapters = []
-        self._observability_metrics = {
-            'reconnect_count': 0,
-            'relay_usage_pct': 0,
-            'auth_failures': 0,
-            'latency_spikes': 0,
-            'daemon_restart_count': 0
-        }
+        # Last (is_connected, status_text) sent to the views; cached repeats are not re-sent
+        self._status_fingerprint = None
+        
+        # Event-driven network change and sleep/wake detection (runs off the GUI thread)
+        self.network_monitor = NetworkMonitor(parent=self)
+        self.network_monitor.network_changed.connect(self._on_network_changed)
+        self.network_monitor.system_resumed.connect(self._on_system_resumed)
+        self.network_monitor.start()
         
     @property
     def worker(self):
         return self.ts_manager.worker
 
+    @property
+    def observability_metrics(self):
+        """Self-healing and observability summary, read from the metrics registry."""
+        return {
+            'reconnect_count': metrics.RECONNECT_ATTEMPTS.total(),
+            'relay_usage_pct': round((metrics.RELAY_USAGE.value() or 0) * 100, 1),
+            'auth_failures': metrics.AUTH_FAILURES.total(),
+            'latency_spikes': metrics.LATENCY_SPIKES.total(),
+            'daemon_restart_count': metrics.DAEMON_RESTARTS.total(),
+        }
+
+    def metrics_snapshot(self):
+        return metrics.REGISTRY.snapshot()
+
     @property
     def current_state(self):
         return self.state_machine.state
@@ -241,42 +285,25 @@ class StateCoordinator(QObject):
 
     def logout_sync(self):
         self._cached_status = None
+        self._status_fingerprint = None
         self.state_machine.transition_to(AppState.LOGGED_OUT, force=True)
         self.ts_manager.logout_sync()
 
-    def check_status(self):
+    def check_status(self, force=False):
         """
         Deduplicates and coalesces status queries. If a query is requested 
         within the cooldown window, returns the cached result immediately 
         without spawning a background process, eliminating CPU spikes.
         
-        Also acts as an active watchdog for system sleep/wake and network changes.
+        Network switches and sleep/wake are handled by the NetworkMonitor,
+        which invalidates the cache as soon as they happen.
         """
         now = time.time()
-        
-        # 1. Sleep/Wake Sensor Watchdog
-        if (now - self._last_tick_time) > 10.0:
-            # Detected system wakeup! Invalidate cache and trigger reconnect
-            self._observability_metrics['reconnect_count'] += 1
-            self._cached_status = None
-            QTimer.singleShot(0, self.check_status_sync)
-        self._last_tick_time = now
-        
-        # 2. WiFi / Network Switch Watchdog
-        try:
-            import psutil
-            current_adapters = list(psutil.net_if_addrs().keys())
-            if self._last_adapters and self._last_adapters != current_adapters:
-                # Network adapter changed! Clear cache to force clean state refresh
-                self._cached_status = None
-            self._last_adapters = current_adapters
-        except Exception:
-            pass
             
-        if self._cached_status is not None and (now - self._last_status_query_time) < self._query_cooldown_seconds:
+        if not force and self._cached_status is not None and (now - self._last_status_query_time) < self._query_cooldown_seconds:
             return self._cached_status
             
-        status = self.ts_manager.check_status()
+        status = self.ts_manager.check_status(force)
         self._cached_status = status
         self._last_status_query_time = now
         return status
@@ -284,40 +311,32 @@ class StateCoordinator(QObject):
     def check_status_sync(self):
         return self.ts_manager.check_status_sync()
 
+    def refresh_netmap(self):
+        return self.ts_manager.refresh_netmap()
+
+    def resend_status(self):
+        """Deliver the next status to the views even if it matches the last one (after a user action)."""
+        self._status_fingerprint = None
+
+    def _on_network_changed(self, kind):
+        # Network adapter or address changed! Clear cache to force clean state refresh
+        self._cached_status = None
+        self.ts_manager.invalidate_stats_interface()
+
+    def _on_system_resumed(self, suspended_seconds):
+        # Detected system wakeup! Invalidate caches and refresh the real daemon state
+        metrics.RECONNECT_ATTEMPTS.inc(reason="resume")
+        self._cached_status = None
+        self.ts_manager.invalidate_stats_interface()
+        QTimer.singleShot(0, lambda: self.ts_manager.check_status(force=True))
+
     def connect(self, login_server, auth_key=None, use_sso=False, profile_name=None, exit_node=None, routes=None, ssh=False, accept_dns=False, allow_lan=False, disable_snat=False, hostname=None, force_reset=False, advertise_exit_node=False, shields_up=False, force_reauth=False, advertise_tags=""):
         self._cached_status = None  # Invalidate cache on action
-        
-        # PROACTIVE FALLBACK CHECK
-        if login_server and profile_name:
-            import urllib.parse
-            import socket
-            from src.utils.dns_fallback import apply_fallback
-            try:
-                parsed = urllib.parse.urlparse(login_server)
-                domain = parsed.hostname
-                if domain:
-                    try:
-                        socket.gethostbyname(domain)
-                    except socket.gaierror:
-                        # Domain resolution failed! Check for fallback IP
-                        profile = self.manager.profiles.get(profile_name)
-                        if profile and getattr(profile, 'last_known_ip', None):
-                            global_fallback = getattr(self.manager.settings, 'global_dns_fallback', False)
-                            profile_fallback = getattr(profile, 'enable_dns_fallback', False)
-                            if global_fallback or profile_fallback:
-                                # Try to apply fallback
-                                fallback_success = apply_fallback(domain, profile.last_known_ip)
-                                if fallback_success:
-                                    # We can emit a specific message to the GUI
-                                    if hasattr(self, 'fallback_applied_signal'):
-                                        self.fallback_applied_signal.emit()
-                                    else:
-                                        self.ts_manager.worker.error_received.emit("Domain Unreachable: Connecting via Emergency Cached IP...")
-            except Exception:
-                pass
+        # The view shows "Connecting..." now; it must hear the outcome even if the status is unchanged
+        self.resend_status()
         
         # Register connection arguments with the State Machine
-        self.state_machine.last_connect_args = {
+        connect_args = {
             "login_server": login_server,
             "auth_key": auth_key,
             "use_sso": use_sso,
@@ -335,40 +354,78 @@ class StateCoordinator(QObject):
             "force_reauth": force_reauth,
             "advertise_tags": advertise_tags
         }
+        self.state_machine.last_connect_args = connect_args
         
         # Transition to CONNECTING state via State Machine transition controller
         self.state_machine.transition_to(AppState.CONNECTING, force=True)
         
-        self.ts_manager.connect(
-            login_server=login_server,
-            auth_key=auth_key,
-            use_sso=use_sso,
-            profile_name=profile_name,
-            exit_node=exit_node,
-            routes=routes,
-            ssh=ssh,
-            accept_dns=accept_dns,
-            allow_lan=allow_lan,
-            disable_snat=disable_snat,
-            hostname=hostname,
-            force_reset=force_reset,
-            advertise_exit_node=advertise_exit_node,
-            shields_up=shields_up,
-            force_reauth=force_reauth,
-            advertise_tags=advertise_tags
-        )
+        # PROACTIVE FALLBACK CHECK: only resolve when a cached IP could actually be used,
+        # and do it off the GUI thread so a broken resolver cannot freeze the window.
+        domain, profile = self._fallback_candidate(login_server, profile_name)
+        if domain:
+            # Polls during the lookup must not replay the cached pre-connect status
+            self.ts_manager.begin_connect()
+            get_resolver().lookup(domain, lambda host, ip: self._continue_connect(connect_args, profile, host, ip))
+        else:
+            self.ts_manager.connect(**connect_args)
+
+    def _fallback_candidate(self, login_server, profile_name):
+        """Returns (domain, profile) if an emergency cached IP may be applied for this server."""
+        if not (login_server and profile_name):
+            return None, None
+        profile = self.manager.profiles.get(profile_name)
+        if not profile or not getattr(profile, 'last_known_ip', None):
+            return None, None
+        global_fallback = getattr(self.manager.settings, 'global_dns_fallback', False)
+        profile_fallback = getattr(profile, 'enable_dns_fallback', False)
+        if not (global_fallback or profile_fallback):
+            return None, None
+        try:
+            import urllib.parse
+            return urllib.parse.urlparse(login_server).hostname, profile
+        except Exception:
+            return None, None
+
+    def _continue_connect(self, connect_args, profile, domain, ip):
+        # The user may have logged out, switched or started another connection while we resolved.
+        # Status polls in the meantime may have moved the state machine, so don't look at the state.
+        if self.state_machine.last_connect_args is not connect_args:
+            return
+            
+        if ip is None:
+            # Domain resolution failed! Try to apply the cached fallback IP
+            from src.utils.dns_fallback import apply_fallback
+            try:
+                fallback_success = apply_fallback(domain, profile.last_known_ip)
+            except Exception:
+                fallback_success = False
+            if fallback_success:
+                # We can emit a specific message to the GUI
+                if hasattr(self, 'fallback_applied_signal'):
+                    self.fallback_applied_signal.emit()
+                else:
+                    self.ts_manager.worker.error_received.emit("Domain Unreachable: Connecting via Emergency Cached IP...")
+                    
+        self.ts_manager.connect(**connect_args)
 
     def switch_profile(self, native_profile_name, profile_name=None):
         self._cached_status = None
+        self.resend_status()
+        self.state_machine.last_connect_args = None  # Supersedes a connect still resolving its server
         self.state_machine.transition_to(AppState.CONNECTING, force=True)
         self.ts_manager.switch_profile(native_profile_name, profile_name)
 
     def logout(self, profile_name=None):
         self._cached_status = None
+        self.resend_status()
+        self.state_machine.last_connect_args = None  # Cancels a pending connect and any automatic retry
         self.state_machine.transition_to(AppState.LOGGED_OUT, force=True)
         self.ts_manager.logout(profile_name)
 
     def cleanup(self):
+        shutdown_resolver()
+        self.network_monitor.stop()
+        self.traffic_sampler.stop()
         self.ts_manager.cleanup()
 
     def get_stats(self):
@@ -392,28 +449,39 @@ class StateCoordinator(QObject):
             new_state = AppState.ERROR
             
         self.state_machine.transition_to(new_state, status_text)
+        
+        # Cached repeats arrive every few seconds; the views only need real transitions
+        fingerprint = (is_connected, status_text)
+        if fingerprint == self._status_fingerprint:
+            return
+        self._status_fingerprint = fingerprint
         self.connection_status_changed.emit(is_connected, status_text)
 
     def _on_state_machine_changed(self, state):
         if state == AppState.CONNECTED:
-            # Cache the IP on successful connection
+            self.traffic_sampler.start()
+        else:
+            self.traffic_sampler.stop()
+            
+        if state == AppState.CONNECTED:
+            # Cache the IP on successful connection (resolved asynchronously)
             if self.state_machine.last_connect_args:
                 profile_name = self.state_machine.last_connect_args.get("profile_name")
                 login_server = self.state_machine.last_connect_args.get("login_server")
                 if profile_name and login_server:
                     profile = self.manager.profiles.get(profile_name)
-                    if profile:
-                        import urllib.parse
-                        import socket
+                    if profile and getattr(profile, 'enable_dns_fallback', False):
                         try:
-                            parsed = urllib.parse.urlparse(login_server)
-                            domain = parsed.hostname
-                            if domain and getattr(profile, 'enable_dns_fallback', False):
-                                ip = socket.gethostbyname(domain)
-                                if ip and getattr(profile, 'last_known_ip', None) != ip:
-                                    profile.last_known_ip = ip
-                                    self.manager.save_profiles()
+                            import urllib.parse
+                            domain = urllib.parse.urlparse(login_server).hostname
+                            if domain:
+                                get_resolver().lookup(domain, lambda host, ip: self._remember_server_ip(profile, ip))
                         except Exception:
                             pass
                             
         self.state_changed.emit(state)
+
+    def _remember_server_ip(self, profile, ip):
+        if ip and getattr(profile, 'last_known_ip', None) != ip:
+            profile.last_known_ip = ip
+            self.manager.save_profiles()
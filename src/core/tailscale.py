@@ -5,10 +5,54 @@ import sys
 import os
 import re
 import shutil
+import time
+from collections import namedtuple
 from PySide6.QtCore import QObject, Signal, QProcess
+from ..utils.event_log import log_event
+from . import metrics
+from .profiling import timed, timing
+
+# Minimal counter record mirroring the psutil snetio fields consumed by the views
+InterfaceCounters = namedtuple("InterfaceCounters", ["bytes_sent", "bytes_recv"])
+
+def describe_backend_state(state):
+    """(is_connected, status_text) for a tailscaled BackendState."""
+    if state == "Running":
+        return True, "Connected"
+    if state == "NeedsLogin":
+        return False, "Logged Out"
+    if state == "NeedsMachineAuth":
+        return False, "Pending Admin Approval"
+    return False, state or "Disconnected"
+
+_NETMAP_UNSEEN = object()
+
+def netmap_fingerprint(data):
+    """
+    Hash of the parts of a status that views render: the peers' identity,
+    addresses, presence and path, the user map and our own key expiry.
+    Counters and timestamps that change on every poll are left out.
+    """
+    if not data:
+        return None
+    self_node = data.get("Self") or {}
+    users = data.get("User") or {}
+    peers = data.get("Peer") or {}
+    return hash((
+        self_node.get("KeyExpiry") or self_node.get("Expiry"),
+        tuple(sorted((str(uid), u.get("LoginName"), u.get("DisplayName")) for uid, u in users.items())),
+        tuple((key, p.get("DNSName"), p.get("HostName"), tuple(p.get("TailscaleIPs") or ()), p.get("OS"),
+               p.get("Active"), p.get("Online"), p.get("CurAddr"), p.get("Relay"), p.get("User"),
+               tuple(p.get("Tags") or ())) for key, p in peers.items()),
+    ))
 
 def get_tailscale_path():
     """Dynamically resolve the absolute path to the Tailscale executable on macOS, Windows, and Linux."""
+    # 0. Explicit override (e.g. the benchmarks' fake CLI)
+    override = os.environ.get("TAILSCALE_CLI_PATH")
+    if override:
+        return override
+
     # 1. Check if tailscale is in system PATH
     resolved = shutil.which("tailscale")
     if resolved:
@@ -67,10 +111,13 @@ class TailscaleProcess(QObject):
         self.process.finished.connect(self._handle_finished)
         self.process.errorOccurred.connect(self._handle_error)
         self.current_command = ""
+        self.command_label = ""
+        self._command_started = None
 
     def _handle_error(self, error):
         if error == QProcess.FailedToStart:
             msg = "Tailscale is not installed on this system or is not found in your system's PATH. Please install Tailscale."
+            log_event("error", source="process", command=self.current_command, message="FailedToStart")
             self.error_received.emit(msg)
             self.finished.emit(-1, "FailedToStart")
 
@@ -113,7 +160,10 @@ class TailscaleProcess(QObject):
             pass
 
         self.current_command = " ".join(cmd_args)
+        self.command_label = metrics.command_label(cmd_args)
         self.profile_name = profile_name
+        self._command_started = time.monotonic()
+        log_event("command_spawn", command=self.current_command, profile=profile_name)
         self.process.start(get_tailscale_path(), cmd_args)
 
     def _handle_stdout(self):
@@ -142,14 +192,24 @@ class TailscaleProcess(QObject):
                     self.sso_url_found.emit(match.group(0))
                 return # Do NOT emit as a critical error
                 
+            log_event("error", source="stderr", command=self.current_command, message=data[:500])
             self.error_received.emit(data)
 
     def _handle_finished(self, exit_code, exit_status):
+        if self._command_started is not None:
+            elapsed = time.monotonic() - self._command_started
+            metrics.COMMAND_SECONDS.observe(elapsed, command=self.command_label)
+            if exit_code != 0:
+                metrics.COMMAND_FAILURES.inc(command=self.command_label)
+            log_event("command_finished", command=self.current_command, exit_code=exit_code,
+                      duration_ms=round(elapsed * 1000))
+            self._command_started = None
         self.finished.emit(exit_code, str(exit_status))
 
 class TailscaleManager(QObject):
     connection_status_changed = Signal(bool, str) # (is_connected, status_text)
     state_changed = Signal(object) # AppState transition signal
+    netmap_changed = Signal() # Peers, users or key expiry differ from the last fresh status
     
     def __init__(self, cache_dir: str = None, parent=None):
         super().__init__(parent)
@@ -185,6 +245,26 @@ class TailscaleManager(QObject):
         # Async check process
         self.status_proc = QProcess(self)
         self.status_proc.finished.connect(self._on_status_finished)
+        self.status_proc.errorOccurred.connect(self._on_status_error)
+        
+        # Resolved Tailscale interface for traffic stats (cached until IPs or addresses change)
+        self._stats_iface = None
+        self._stats_iface_ips = ()
+        self._stats_iface_checked = False
+        
+        # Fingerprint of the last netmap handed to the views (see netmap_fingerprint)
+        self._netmap_fingerprint = _NETMAP_UNSEEN
+
+    def _check_netmap(self, raw_data):
+        fingerprint = netmap_fingerprint(raw_data)
+        if fingerprint != self._netmap_fingerprint:
+            self._netmap_fingerprint = fingerprint
+            self.netmap_changed.emit()
+
+    def refresh_netmap(self):
+        """Force a fresh poll whose netmap is re-sent to the views even if unchanged."""
+        self._netmap_fingerprint = _NETMAP_UNSEEN
+        return self.check_status(force=True)
 
     def _update_state(self, status_text):
         from .models import AppState
@@ -304,6 +384,7 @@ class TailscaleManager(QObject):
         except (RuntimeError, AttributeError):
             pass
         
+    @timed("TailscaleManager.check_status")
     def check_status(self, force=False):
         """Asynchronously check tailscale status using JSON or instantly via Local API."""
         cached_status = self.cache.get("status")
@@ -315,33 +396,27 @@ class TailscaleManager(QObject):
         if self.use_local_api:
             try:
                 from src.utils.local_api import query_local_api
+                started = time.monotonic()
                 data = query_local_api()
-                is_connected = False
-                status_text = "Disconnected"
                 ips = data.get("TailscaleIPs", [])
-                state = data.get("BackendState", "")
-                
-                if state == "Running":
-                    is_connected = True
-                    status_text = "Connected"
-                elif state == "NeedsLogin":
-                    is_connected = False
-                    status_text = "Logged Out"
-                elif state == "NeedsMachineAuth":
-                    is_connected = False
-                    status_text = "Pending Admin Approval"
-                else:
-                    status_text = state or "Disconnected"
+                is_connected, status_text = describe_backend_state(data.get("BackendState", ""))
                     
                 self.cache.set("status", {"connected": is_connected, "text": status_text, "ips": ips, "raw_data": data})
+                elapsed = time.monotonic() - started
+                metrics.STATUS_POLL_SECONDS.observe(elapsed, source="localapi")
+                metrics.record_status_metrics(data)
+                log_event("status_poll", source="localapi", state=status_text, duration_ms=round(elapsed * 1000, 1))
                 self._update_state(status_text)
                 self.connection_status_changed.emit(is_connected, status_text)
+                self._check_netmap(data)
                 return is_connected, status_text
-            except Exception:
+            except Exception as e:
                 # Silently fallback to CLI process on any Local API error
-                pass
+                metrics.STATUS_POLL_ERRORS.inc(source="localapi")
+                log_event("error", source="localapi", message=str(e))
 
         if self.status_proc.state() == QProcess.NotRunning:
+            self._status_started = time.monotonic()
             self.status_proc.start(get_tailscale_path(), ["status", "--json"])
         
         # Return cached status as a placeholder if we have it, otherwise "Checking"
@@ -349,6 +424,16 @@ class TailscaleManager(QObject):
             return cached_status["connected"], cached_status["text"]
         return False, "Checking..."
 
+    def _on_status_error(self, error):
+        # finished never follows a failed start (CLI missing, bad TAILSCALE_CLI_PATH)
+        if error != QProcess.FailedToStart:
+            return
+        metrics.STATUS_POLL_ERRORS.inc(source="cli")
+        log_event("error", source="cli", command="status --json", message="FailedToStart")
+        if self._netmap_fingerprint is _NETMAP_UNSEEN:
+            # refresh_netmap() promises an answer; the views keep the peers they have
+            self.netmap_changed.emit()
+
     def _on_status_finished(self):
         output = self.status_proc.readAllStandardOutput().data().decode()
         
@@ -359,23 +444,13 @@ class TailscaleManager(QObject):
         
         try:
             import json
-            data = json.loads(output)
+            with timing("TailscaleManager.status_json_parse"):
+                data = json.loads(output)
             raw_data = data
-            state = data.get("BackendState", "")
             ips = data.get("TailscaleIPs", [])
-            
-            if state == "Running":
-                is_connected = True
-                status_text = "Connected"
-            elif state == "NeedsLogin":
-                is_connected = False
-                status_text = "Logged Out"
-            elif state == "NeedsMachineAuth":
-                is_connected = False
-                status_text = "Pending Admin Approval"
-            else:
-                status_text = state or "Disconnected"
+            is_connected, status_text = describe_backend_state(data.get("BackendState", ""))
         except Exception:
+            metrics.STATUS_POLL_ERRORS.inc(source="cli")
             if "logged out" in output.lower():
                 is_connected = False
                 status_text = "Logged Out"
@@ -384,13 +459,22 @@ class TailscaleManager(QObject):
                 status_text = "Connected"
             
         self.cache.set("status", {"connected": is_connected, "text": status_text, "ips": ips, "raw_data": raw_data})
+        started = getattr(self, "_status_started", None)
+        elapsed = time.monotonic() - started if started else None
+        if elapsed is not None:
+            metrics.STATUS_POLL_SECONDS.observe(elapsed, source="cli")
+        metrics.record_status_metrics(raw_data)
+        log_event("status_poll", source="cli", state=status_text,
+                  duration_ms=round(elapsed * 1000, 1) if elapsed is not None else None)
         self._update_state(status_text)
         self.connection_status_changed.emit(is_connected, status_text)
+        self._check_netmap(raw_data)
 
     def start_service(self):
         """Try to start Tailscale service if not running."""
         # This is a best-effort start. If it requires elevation, 
         # it might fail if the user isn't admin, but matches legacy behavior.
+        metrics.DAEMON_RESTARTS.inc()
         if sys.platform == "win32":
             # Using QProcess for non-blocking start
             QProcess.startDetached("powershell", ["-Command", "Start-Service Tailscale"])
@@ -457,8 +541,7 @@ class TailscaleManager(QObject):
             if disable_snat:
                 args.append("--snat-subnet-routes=false")
         
-        self.cache.clear() # Clear cache on new connection attempt
-        self._update_state("Connecting...")
+        self.begin_connect()
         
         # Start dynamic SSO timeout if SSO mode is enabled
         if use_sso:
@@ -469,6 +552,11 @@ class TailscaleManager(QObject):
         self.active_session = LoginSession(self.sso_timeout)
         self.active_session.start(self.worker.process)
 
+    def begin_connect(self):
+        """Mark a connection attempt as pending, before `up` runs (e.g. while its server resolves)."""
+        self.cache.clear() # Clear cache on new connection attempt
+        self._update_state("Connecting...")
+
     def switch_profile(self, native_profile_name, profile_name=None):
         """Instantly switch to a native Tailscale profile."""
         self.cache.clear()
@@ -499,33 +587,70 @@ class TailscaleManager(QObject):
         except:
             pass
 
-    def get_stats(self):
-        """Get psutil stats for the Tailscale interface."""
+    def invalidate_stats_interface(self):
+        """Forget the resolved Tailscale interface; call on address-change events."""
+        self._stats_iface = None
+        self._stats_iface_ips = ()
+        self._stats_iface_checked = False
+
+    def _resolve_stats_interface(self, ts_ips):
+        """Walk the host interfaces once to find the one holding a Tailscale IP."""
         import psutil
+        addrs = psutil.net_if_addrs()
+        
+        # 1. Try resolving by cached IP address
+        if ts_ips:
+            for iface, addr_list in addrs.items():
+                for addr in addr_list:
+                    if addr.address in ts_ips:
+                        return iface
+                        
+        # 2. Fallback to name matching
+        for iface in addrs:
+            if "tailscale" in iface.lower():
+                return iface
+        return None
+
+    def _read_iface_counters(self, iface):
+        """Read the byte counters of a single interface."""
+        if sys.platform.startswith("linux"):
+            # Fast path: only this interface's counters, no /proc/net/dev parsing
+            stats_dir = os.path.join("/sys/class/net", iface, "statistics")
+            try:
+                with open(os.path.join(stats_dir, "tx_bytes"), "r") as f:
+                    sent = int(f.read())
+                with open(os.path.join(stats_dir, "rx_bytes"), "r") as f:
+                    recv = int(f.read())
+                return InterfaceCounters(sent, recv)
+            except (OSError, ValueError):
+                pass
+                
+        import psutil
+        return psutil.net_io_counters(pernic=True).get(iface)
+
+    def get_stats(self):
+        """Get traffic counters for the Tailscale interface.
+        
+        The interface name is resolved once and reused until the Tailscale IPs change,
+        the interface disappears, or invalidate_stats_interface() is called.
+        """
         try:
-            stats = psutil.net_io_counters(pernic=True)
-            
-            # 1. Try resolving by cached IP address
             cached_status = self.cache.get("status")
-            ts_ips = cached_status.get("ips", []) if cached_status else []
-            if ts_ips:
-                addrs = psutil.net_if_addrs()
-                target_iface = None
-                for iface, addr_list in addrs.items():
-                    for addr in addr_list:
-                        if addr.address in ts_ips:
-                            target_iface = iface
-                            break
-                    if target_iface:
-                        break
+            ts_ips = tuple(cached_status.get("ips", [])) if cached_status else ()
+            
+            if not self._stats_iface_checked or (ts_ips and ts_ips != self._stats_iface_ips):
+                self._stats_iface = self._resolve_stats_interface(ts_ips)
+                self._stats_iface_ips = ts_ips
+                self._stats_iface_checked = True
                 
-                if target_iface and target_iface in stats:
-                    return stats[target_iface]
-
-            # 2. Fallback to name matching
-            for iface, data in stats.items():
-                if "tailscale" in iface.lower():
-                    return data
+            if not self._stats_iface:
+                return None
+                
+            counters = self._read_iface_counters(self._stats_iface)
+            if counters is None:
+                # Interface vanished (e.g. tailscaled restarted), re-resolve on next poll
+                self.invalidate_stats_interface()
+            return counters
         except Exception:
             pass
         return None
@@ -0,0 +1,90 @@
+# src/core/traffic_sampler.py
+# This is the traffic throughput sampler for the application.
+
+import math
+import time
+from collections import deque, namedtuple
+from PySide6.QtCore import QObject, Signal, QTimer
+
+TrafficSample = namedtuple("TrafficSample", ["timestamp", "bytes_sent", "bytes_recv"])
+Throughput = namedtuple("Throughput", ["timestamp", "up_bps", "down_bps", "up_ewma_bps", "down_ewma_bps"])
+
+class TrafficSampler(QObject):
+    """
+    Records timestamped interface counter samples in a ring buffer and derives
+    instantaneous and EWMA-smoothed throughput (bytes per second) from them.
+    """
+    throughput_updated = Signal(object)  # Throughput
+
+    def __init__(self, stats_source, interval_ms=1000, capacity=120, smoothing_seconds=5.0, parent=None):
+        super().__init__(parent)
+        self.stats_source = stats_source
+        self.smoothing_seconds = smoothing_seconds
+
+        # Ring buffers: raw counter samples and the throughput points derived from them
+        self.samples = deque(maxlen=capacity)
+        self.history = deque(maxlen=capacity)
+        self._up_ewma = None
+        self._down_ewma = None
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self.poll)
+
+    @property
+    def latest(self):
+        return self.history[-1] if self.history else None
+
+    def start(self):
+        if not self.timer.isActive():
+            self.reset()
+            self.timer.start()
+            self.poll()
+
+    def stop(self):
+        self.timer.stop()
+
+    def reset(self):
+        self.samples.clear()
+        self.history.clear()
+        self._up_ewma = None
+        self._down_ewma = None
+
+    def poll(self):
+        try:
+            stats = self.stats_source()
+        except Exception:
+            stats = None
+        if stats:
+            self.add_sample(stats.bytes_sent, stats.bytes_recv)
+
+    def add_sample(self, bytes_sent, bytes_recv, timestamp=None):
+        """Record a counter sample and return the resulting Throughput point (or None)."""
+        now = time.monotonic() if timestamp is None else timestamp
+        sample = TrafficSample(now, bytes_sent, bytes_recv)
+        prev = self.samples[-1] if self.samples else None
+
+        if prev is not None and (bytes_sent < prev.bytes_sent or bytes_recv < prev.bytes_recv):
+            # Counters went backwards (interface recreated): restart from this sample
+            self.samples.clear()
+            prev = None
+        self.samples.append(sample)
+
+        if prev is None:
+            return None
+        dt = now - prev.timestamp
+        if dt <= 0:
+            return None
+
+        up = (bytes_sent - prev.bytes_sent) / dt
+        down = (bytes_recv - prev.bytes_recv) / dt
+
+        # Time-aware EWMA so irregular sampling intervals are weighted correctly
+        alpha = 1.0 - math.exp(-dt / self.smoothing_seconds) if self.smoothing_seconds > 0 else 1.0
+        self._up_ewma = up if self._up_ewma is None else self._up_ewma + alpha * (up - self._up_ewma)
+        self._down_ewma = down if self._down_ewma is None else self._down_ewma + alpha * (down - self._down_ewma)
+
+        point = Throughput(now, up, down, self._up_ewma, self._down_ewma)
+        self.history.append(point)
+        self.throughput_updated.emit(point)
+        return point
@@ -0,0 +1,131 @@
+import os
+import time
+from datetime import datetime
+from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton, QCheckBox,
+                               QLabel, QTreeWidget, QTreeWidgetItem, QHeaderView)
+from PySide6.QtCore import Qt, QThread, Signal, QObject
+from src.utils.log_search import discover_log_files, search_logs
+
+class LogSearchWorker(QObject):
+    finished = Signal(list, float)  # (hits, seconds)
+    failed = Signal(str)
+
+    def __init__(self, paths, query, regex, ignore_case):
+        super().__init__()
+        self.paths = paths
+        self.query = query
+        self.regex = regex
+        self.ignore_case = ignore_case
+
+    def run(self):
+        started = time.perf_counter()
+        try:
+            hits = search_logs(self.paths, self.query, regex=self.regex, ignore_case=self.ignore_case)
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.finished.emit(hits, time.perf_counter() - started)
+
+class LogSearchDialog(QDialog):
+    """Searches every client log (app, per-profile and rotated backups) at once, newest hits first."""
+    def __init__(self, app_dir, parent=None, open_log=None):
+        super().__init__(parent)
+        self.app_dir = app_dir
+        self.open_log = open_log
+        self.search_thread = None
+        self.worker = None
+
+        self.setWindowTitle("Search All Logs")
+        self.resize(980, 620)
+
+        layout = QVBoxLayout(self)
+        row = QHBoxLayout()
+        self.queryEntry = QLineEdit(self)
+        self.queryEntry.setPlaceholderText("Search text (e.g. auth failed)...")
+        self.chkRegex = QCheckBox("Regex", self)
+        self.chkCase = QCheckBox("Match case", self)
+        self.btnSearch = QPushButton("Search", self)
+        row.addWidget(self.queryEntry, 1)
+        row.addWidget(self.chkRegex)
+        row.addWidget(self.chkCase)
+        row.addWidget(self.btnSearch)
+        layout.addLayout(row)
+
+        self.results = QTreeWidget(self)
+        self.results.setHeaderLabels(["Time", "File", "Line", "Text"])
+        self.results.setRootIsDecorated(False)
+        self.results.setUniformRowHeights(True)
+        self.results.header().setSectionResizeMode(3, QHeaderView.Stretch)
+        self.results.setColumnWidth(0, 170)
+        self.results.setColumnWidth(1, 190)
+        self.results.setColumnWidth(2, 60)
+        layout.addWidget(self.results, 1)
+
+        self.statusLabel = QLabel("", self)
+        layout.addWidget(self.statusLabel)
+
+        self.btnSearch.clicked.connect(self._start_search)
+        self.queryEntry.returnPressed.connect(self._start_search)
+        self.results.itemDoubleClicked.connect(self._open_hit)
+
+    def _start_search(self):
+        query = self.queryEntry.text()
+        if not query or (self.search_thread and self.search_thread.isRunning()):
+            return
+
+        paths = discover_log_files(self.app_dir)
+        if not paths:
+            self.statusLabel.setText("No log files found.")
+            return
+
+        self.btnSearch.setEnabled(False)
+        self.statusLabel.setText(f"Searching {len(paths)} files...")
+
+        self.search_thread = QThread()
+        self.worker = LogSearchWorker(paths, query, self.chkRegex.isChecked(), not self.chkCase.isChecked())
+        self.worker.moveToThread(self.search_thread)
+
+        self.search_thread.started.connect(self.worker.run)
+        self.worker.finished.connect(self._on_results)
+        self.worker.failed.connect(self._on_failed)
+
+        # Cleanup
+        self.worker.finished.connect(self.search_thread.quit)
+        self.worker.failed.connect(self.search_thread.quit)
+        self.search_thread.finished.connect(self.worker.deleteLater)
+        self.search_thread.finished.connect(self.search_thread.deleteLater)
+        self.search_thread.finished.connect(self._on_thread_finished)
+
+        self.search_thread.start()
+
+    def _on_thread_finished(self):
+        self.search_thread = None
+        self.worker = None
+        self.btnSearch.setEnabled(True)
+
+    def _on_results(self, hits, seconds):
+        self.results.setUpdatesEnabled(False)
+        self.results.clear()
+        items = []
+        for hit in hits:
+            stamp = datetime.fromtimestamp(hit.timestamp).strftime("%Y-%m-%d %H:%M:%S")
+            item = QTreeWidgetItem([stamp, os.path.relpath(hit.path, self.app_dir), str(hit.line_number), hit.text])
+            item.setData(0, Qt.UserRole, hit.path)
+            items.append(item)
+        self.results.addTopLevelItems(items)
+        self.results.setUpdatesEnabled(True)
+        self.statusLabel.setText(f"{len(hits)} matches in {seconds * 1000:.0f} ms")
+
+    def _on_failed(self, message):
+        self.statusLabel.setText(f"Search failed: {message}")
+
+    def _open_hit(self, item, column):
+        if self.open_log:
+            path = item.data(0, Qt.UserRole)
+            self.open_log(path, os.path.basename(path))
+
+    def closeEvent(self, event):
+        if self.search_thread and self.search_thread.isRunning():
+            self.search_thread.quit()
+            self.search_thread.wait(2000)
+        super().closeEvent(event)
@@ -1,12 +1,66 @@
 import os
 import sys
-from PySide6.QtWidgets import QDialog, QVBoxLayout, QMessageBox, QPushButton, QLineEdit, QTextBrowser, QCheckBox, QProgressBar, QWidget
-from PySide6.QtGui import QTextCharFormat, QColor, QTextCursor
-from PySide6.QtCore import Qt
+import bisect
+from PySide6.QtWidgets import QDialog, QVBoxLayout, QMessageBox, QPushButton, QLineEdit, QListView, QCheckBox, QProgressBar, QWidget
+from PySide6.QtGui import QColor
+from PySide6.QtCore import Qt, QTimer, QFileSystemWatcher, QAbstractListModel, QModelIndex, QThread, QObject, Signal
 from PySide6.QtUiTools import QUiLoader
 from PySide6.QtCore import QFile
+from src.utils.log_reader import tail_block, tail_rotated_lines, rotated_paths, LogFollower
+from src.utils.log_index import LogIndex
+from src.utils.log_export import export_logs, ExportCancelled
+
+class LogListModel(QAbstractListModel):
+    """Exposes the visible rows of a LogIndex to a virtualized QListView."""
+    COLOURS = {"info": "#4CAF50", "warn": "#FFC107", "error": "#F44336", "debug": "#9C27B0"}
+
+    def __init__(self, log_index, parent=None):
+        super().__init__(parent)
+        # Not "index": that would shadow QAbstractItemModel.index() and crash the view
+        self.log_index = log_index
+        self.rows = []
+        self._brushes = {level: QColor(colour) for level, colour in self.COLOURS.items()}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def data(self, model_index, role=Qt.DisplayRole):
+        if not model_index.isValid():
+            return None
+        row = self.rows[model_index.row()]
+        if role == Qt.DisplayRole:
+            return self.log_index.lines[row].rstrip("\r\n")
+        if role == Qt.ForegroundRole:
+            return self._brushes[self.log_index.levels[row]]
+        return None
+
+    def set_rows(self, rows):
+        self.beginResetModel()
+        self.rows = rows
+        self.endResetModel()
+
+    def prepend_rows(self, rows, shift):
+        """Insert rows of lines put before the index; the rows already shown move down by shift."""
+        if not rows:
+            self.rows = [row + shift for row in self.rows]
+            return
+        self.beginInsertRows(QModelIndex(), 0, len(rows) - 1)
+        self.rows = rows + [row + shift for row in self.rows]
+        self.endInsertRows()
+
+    def append_rows(self, rows):
+        if not rows: return
+        first = len(self.rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self.rows.extend(rows)
+        self.endInsertRows()
 
 class LogViewerDialog(QDialog):
+    # Lines loaded across the log and its rotated backups
+    LINE_BUDGET = 20000
+    # Tail of the live log shown right away; the rest is read and indexed on a worker thread
+    INITIAL_BYTES = 32768
+
     def __init__(self, log_path, display_name, parent=None):
         super().__init__(parent)
         self.log_file = log_path
@@ -33,7 +87,7 @@ class LogViewerDialog(QDialog):
         self.btnSearch   = self.ui.findChild(QPushButton, "searchBtn")
         self.btnRefresh  = self.ui.findChild(QPushButton, "refreshBtn")
         self.btnClear    = self.ui.findChild(QPushButton, "clearBtn")
-        self.textBrowser = self.ui.findChild(QTextBrowser, "textBrowser")
+        self.logView     = self.ui.findChild(QListView, "logView")
         self.btnClose    = self.ui.findChild(QPushButton, "closeBtn")
         self.btnExport   = self.ui.findChild(QPushButton, "exportBtn")
         
@@ -41,6 +95,17 @@ class LogViewerDialog(QDialog):
         self.btnWarn     = self.ui.findChild(QPushButton, "warningBtn")
         self.btnError    = self.ui.findChild(QPushButton, "errorBtn")
         self.btnDebug    = self.ui.findChild(QPushButton, "debugBtn")
+        self.chkFollow   = self.ui.findChild(QCheckBox, "followCheck")
+
+        # Lines are classified and tokenized once; the view only renders what is on screen
+        self.log_index = LogIndex()
+        self.model = LogListModel(self.log_index, self)
+        self._search_cache = (None, None)  # (query, matching model positions)
+        if self.logView:
+            self.logView.setModel(self.model)
+            self.logView.setUniformItemSizes(True)
+            self.logView.setLayoutMode(QListView.Batched)
+            self.logView.setSelectionMode(QListView.ExtendedSelection)
 
         # Connections
         if self.btnSearch: self.btnSearch.clicked.connect(self._search_text)
@@ -50,83 +115,171 @@ class LogViewerDialog(QDialog):
         if self.btnClose: self.btnClose.clicked.connect(self.accept)
         if self.btnExport: self.btnExport.clicked.connect(self._export_logs)
         
-        if self.btnInfo: self.btnInfo.toggled.connect(self._read_content)
-        if self.btnWarn: self.btnWarn.toggled.connect(self._read_content)
-        if self.btnError: self.btnError.toggled.connect(self._read_content)
-        if self.btnDebug: self.btnDebug.toggled.connect(self._read_content)
+        # Level toggles only swap the row list; nothing is re-read or re-parsed
+        if self.btnInfo: self.btnInfo.toggled.connect(self._apply_filter)
+        if self.btnWarn: self.btnWarn.toggled.connect(self._apply_filter)
+        if self.btnError: self.btnError.toggled.connect(self._apply_filter)
+        if self.btnDebug: self.btnDebug.toggled.connect(self._apply_filter)
+
+        # Follow mode: file watcher for prompt updates, plus a slow poll because
+        # change notifications can be coalesced or lost across rotations
+        self._follower = None
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._poll_follow)
+        self._watcher.directoryChanged.connect(self._poll_follow)
+        self._follow_timer = QTimer(self)
+        self._follow_timer.setInterval(1000)
+        self._follow_timer.timeout.connect(self._poll_follow)
+        if self.chkFollow: self.chkFollow.toggled.connect(self._set_follow)
+
+        self.export_thread = None
+        self.export_worker = None
+        self.export_progress = None
+
+        # Loads of the older lines still running; only the latest generation is applied
+        self._load_generation = 0
+        self._loads = {}  # generation -> LogLoadWorker still running
 
         self._read_content()
 
     def _read_content(self):
-        if not self.textBrowser: return
-        self.textBrowser.clear()
+        """
+        Reload the log: the live file's tail at once, then the older lines and the
+        rotated backups (up to LINE_BUDGET in all) once a worker thread has indexed them.
+        """
+        if not self.logView: return
+        for worker in self._loads.values():
+            worker.cancel()  # Superseded by this reload
+        self._load_generation += 1
+        self.log_index.clear()
 
         if not os.path.exists(self.log_file):
-            self.textBrowser.setPlainText(f"[Log file not found: {self.log_file}]")
-            return
+            self.log_index.append(f"[Log file not found: {self.log_file}]\n")
+        else:
+            try:
+                start, lines = tail_block(self.log_file, self.INITIAL_BYTES)
+                self.log_index.extend(lines[-self.LINE_BUDGET:])
+                if len(self.log_index) < self.LINE_BUDGET and (start or len(rotated_paths(self.log_file)) > 1):
+                    self._load_older(start, self.LINE_BUDGET - len(self.log_index))
+            except Exception as e:
+                self.log_index.append(f"Failed to read log: {e}\n")
+            if self._follower:
+                self._follower.seek_end()
 
-        # Colour formats
-        fmt_info    = QTextCharFormat()
-        fmt_info.setForeground(QColor("#4CAF50"))
-        fmt_warn    = QTextCharFormat()
-        fmt_warn.setForeground(QColor("#FFC107"))
-        fmt_error   = QTextCharFormat()
-        fmt_error.setForeground(QColor("#F44336"))
-        fmt_debug   = QTextCharFormat()
-        fmt_debug.setForeground(QColor("#9C27B0"))
-        fmt_default = QTextCharFormat()
-        fmt_default.setForeground(QColor("#ffffff"))
-
-        cursor = self.textBrowser.textCursor()
-        
-        show_info  = self.btnInfo.isChecked() if self.btnInfo else True
-        show_warn  = self.btnWarn.isChecked() if self.btnWarn else True
-        show_error = self.btnError.isChecked() if self.btnError else True
-        show_debug = self.btnDebug.isChecked() if self.btnDebug else True
+        self._apply_filter()
+
+    def _load_older(self, end, max_lines):
+        # Owned by the dialog, so dropping our reference never destroys a running thread
+        thread = QThread(self)
+        worker = LogLoadWorker(self.log_file, end, max_lines, self._load_generation)
+        worker.moveToThread(thread)
+        self._loads[self._load_generation] = worker
+
+        thread.started.connect(worker.run)
+        worker.finished.connect(self._on_older_loaded)
+        worker.finished.connect(thread.quit)
+        thread.finished.connect(thread.deleteLater)
+        thread.start()
+
+    def _on_older_loaded(self, generation, older):
+        self._loads.pop(generation, None)
+        if generation != self._load_generation or older is None or not self.logView:
+            return  # Reloaded meanwhile, or cancelled
+        bar = self.logView.verticalScrollBar()
+        at_bottom = bar.value() == bar.maximum()
+        shift = len(older)
+        rows = older.rows_for_levels(self._visible_levels())
+        self.log_index.prepend(older)
+        self._search_cache = (None, None)
+        self.model.prepend_rows(rows, shift)
+        if at_bottom:
+            self.logView.scrollToBottom()
+        elif self.logView.currentIndex().isValid():
+            self.logView.scrollTo(self.logView.currentIndex())
 
+    def done(self, result):
+        # The workers only read files; stop them rather than leave threads behind the dialog
+        for worker in self._loads.values():
+            worker.cancel()
+        for thread in self.findChildren(QThread):
+            thread.quit()
+            thread.wait()
+        super().done(result)
+
+    def _visible_levels(self):
+        levels = set()
+        if not self.btnInfo or self.btnInfo.isChecked(): levels.add("info")
+        if not self.btnWarn or self.btnWarn.isChecked(): levels.add("warn")
+        if not self.btnError or self.btnError.isChecked(): levels.add("error")
+        if not self.btnDebug or self.btnDebug.isChecked(): levels.add("debug")
+        return levels
+
+    def _apply_filter(self, *_):
+        self._search_cache = (None, None)
+        self.model.set_rows(self.log_index.rows_for_levels(self._visible_levels()))
+        self.logView.scrollToBottom()
+
+    def _set_follow(self, enabled):
+        if enabled:
+            self._read_content()
+            self._follower = LogFollower(self.log_file)
+            paths = [p for p in (self.log_file, os.path.dirname(self.log_file)) if os.path.exists(p)]
+            if paths:
+                self._watcher.addPaths(paths)
+            self._follow_timer.start()
+        else:
+            self._follow_timer.stop()
+            if self._watcher.files() or self._watcher.directories():
+                self._watcher.removePaths(self._watcher.files() + self._watcher.directories())
+            self._follower = None
+
+    def _poll_follow(self, *_):
+        if not self._follower or not self.logView: return
         try:
-            with open(self.log_file, "r", encoding="utf-8", errors="ignore") as f:
-                lines = f.readlines()
-                
-            tail_lines = lines[-1000:] if len(lines) > 1000 else lines
-            
-            cursor.beginEditBlock()
-            for line in tail_lines:
-                    up = line.upper()
-                    
-                    is_error = "ERROR" in up or "CRITICAL" in up or "EXCEPTION" in up
-                    is_warn  = "WARNING" in up or "WARN" in up
-                    is_debug = "DEBUG" in up
-                    is_info  = "INFO" in up and not (is_error or is_warn or is_debug)
-                    
-                    if not (is_error or is_warn or is_debug or is_info):
-                        is_info = True
-
-                    if is_error and not show_error: continue
-                    if is_warn and not show_warn: continue
-                    if is_debug and not show_debug: continue
-                    if is_info and not show_info: continue
-
-                    if is_error: fmt = fmt_error
-                    elif is_warn: fmt = fmt_warn
-                    elif is_debug: fmt = fmt_debug
-                    else: fmt = fmt_info
-                    
-                    cursor.insertText(line, fmt)
-            cursor.endEditBlock()
-        except Exception as e:
-            cursor.insertText(f"Failed to read log: {e}")
+            lines, rotated = self._follower.read_new_lines()
+        except Exception:
+            return
+        if rotated or self.log_file not in self._watcher.files():
+            # The watch is dropped when the file is renamed away; re-arm it on the new file
+            if os.path.exists(self.log_file):
+                self._watcher.addPath(self.log_file)
+        if not lines: return
 
-        self.textBrowser.moveCursor(QTextCursor.End)
+        if len(self.log_index) + len(lines) > self.LINE_BUDGET * 3 // 2:
+            # Compact occasionally rather than trimming on every append
+            kept = (self.log_index.lines + lines)[-self.LINE_BUDGET:]
+            self.log_index.clear()
+            self.log_index.extend(kept)
+            self._apply_filter()
+            return
+
+        visible = self._visible_levels()
+        new_rows = [row for row in self.log_index.extend(lines) if self.log_index.levels[row] in visible]
+        self._search_cache = (None, None)
+        self.model.append_rows(new_rows)
+        self.logView.scrollToBottom()
 
     def _search_text(self):
-        if not self.textBrowser: return
+        if not self.logView: return
         query = self.searchEntry.text()
         if not query: return
-        found = self.textBrowser.find(query)
-        if not found:
-            self.textBrowser.moveCursor(QTextCursor.Start)
-            self.textBrowser.find(query)
+
+        cached_query, positions = self._search_cache
+        if cached_query != query:
+            rows = self.log_index.search(query, self.model.rows)
+            # Map index rows to positions in the (sorted) filtered view
+            positions = [bisect.bisect_left(self.model.rows, row) for row in rows]
+            self._search_cache = (query, positions)
+        if not positions:
+            return
+
+        current = self.logView.currentIndex()
+        after = current.row() if current.isValid() else -1
+        i = bisect.bisect_right(positions, after)
+        target = positions[i] if i < len(positions) else positions[0]  # Wrap around
+        model_index = self.model.index(target, 0)
+        self.logView.setCurrentIndex(model_index)
+        self.logView.scrollTo(model_index, QListView.PositionAtCenter)
 
     def _clear_log(self):
         reply = QMessageBox.question(self, "Confirm", "Clear this log file?", QMessageBox.Yes | QMessageBox.No)
@@ -138,23 +291,110 @@ class LogViewerDialog(QDialog):
                 QMessageBox.critical(self, "Error", str(e))
 
     def _export_logs(self):
-        import zipfile
-        from PySide6.QtWidgets import QFileDialog
+        from PySide6.QtWidgets import QFileDialog, QProgressDialog
         
+        if self.export_thread and self.export_thread.isRunning():
+            return
         save_path, _ = QFileDialog.getSaveFileName(self, "Export Logs", os.path.expanduser("~/TailscaleClientPro_Logs.zip"), "ZIP Files (*.zip)")
         if not save_path:
             return
-            
+
+        self.export_progress = QProgressDialog("Bundling logs...", "Cancel", 0, 1000, self)
+        self.export_progress.setWindowTitle("Export Logs")
+        self.export_progress.setWindowModality(Qt.WindowModal)
+        self.export_progress.setMinimumDuration(300)
+
+        self.export_thread = QThread()
+        self.export_worker = LogExportWorker(os.path.dirname(self.log_file), save_path)
+        self.export_worker.moveToThread(self.export_thread)
+
+        self.export_thread.started.connect(self.export_worker.run)
+        self.export_worker.progress.connect(self._on_export_progress)
+        self.export_worker.finished.connect(self._on_export_finished)
+        self.export_worker.failed.connect(self._on_export_failed)
+        self.export_progress.canceled.connect(self.export_worker.cancel, Qt.DirectConnection)
+
+        # Cleanup
+        self.export_worker.finished.connect(self.export_thread.quit)
+        self.export_worker.failed.connect(self.export_thread.quit)
+        self.export_thread.finished.connect(self.export_worker.deleteLater)
+        self.export_thread.finished.connect(self.export_thread.deleteLater)
+
+        self.export_thread.start()
+
+    def _on_export_progress(self, permille):
+        if self.export_progress:
+            self.export_progress.setValue(permille)
+
+    def _on_export_finished(self, save_path):
+        self.export_thread = None
+        if self.export_progress:
+            self.export_progress.reset()
+        QMessageBox.information(self, "Export Successful", f"All logs have been successfully bundled and exported to:\n{save_path}")
+
+    def _on_export_failed(self, message):
+        self.export_thread = None
+        if self.export_progress:
+            self.export_progress.reset()
+        if message:
+            QMessageBox.critical(self, "Export Failed", f"An error occurred while exporting logs:\n{message}")
+
+class LogLoadWorker(QObject):
+    """Reads and indexes the log lines before byte offset end, rotated backups included."""
+    finished = Signal(int, object)  # (generation, LogIndex or None when cancelled)
+
+    def __init__(self, log_file, end, max_lines, generation):
+        super().__init__()
+        self.log_file = log_file
+        self.end = end
+        self.max_lines = max_lines
+        self.generation = generation
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        older = LogIndex()
         try:
-            log_dir = os.path.dirname(self.log_file)
-            with zipfile.ZipFile(save_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                for root, _, files in os.walk(log_dir):
-                    for file in files:
-                        if file.endswith('.log') or file.endswith('.txt'):
-                            full_file_path = os.path.join(root, file)
-                            arcname = os.path.relpath(full_file_path, log_dir)
-                            zipf.write(full_file_path, arcname)
-                            
-            QMessageBox.information(self, "Export Successful", f"All logs have been successfully bundled and exported to:\n{save_path}")
+            for line in tail_rotated_lines(self.log_file, self.max_lines, end=self.end):
+                if self._cancelled:
+                    break
+                older.append(line)
         except Exception as e:
-            QMessageBox.critical(self, "Export Failed", f"An error occurred while exporting logs:\n{e}")
+            older.clear()
+            older.append(f"Failed to read older log lines: {e}\n")
+        self.finished.emit(self.generation, None if self._cancelled else older)
+
+class LogExportWorker(QObject):
+    """Builds the log bundle off the GUI thread, reporting progress in permille."""
+    progress = Signal(int)
+    finished = Signal(str)
+    failed = Signal(str)  # Empty message when cancelled
+
+    def __init__(self, log_dir, save_path):
+        super().__init__()
+        self.log_dir = log_dir
+        self.save_path = save_path
+        self._cancelled = False
+        self._last_permille = -1
+
+    def cancel(self):
+        self._cancelled = True
+
+    def _report(self, done, total):
+        permille = min(1000, done * 1000 // total)
+        if permille != self._last_permille:  # Don't flood the GUI thread with identical updates
+            self._last_permille = permille
+            self.progress.emit(permille)
+
+    def run(self):
+        try:
+            export_logs(self.log_dir, self.save_path, progress=self._report, is_cancelled=lambda: self._cancelled)
+        except ExportCancelled:
+            self.failed.emit("")
+            return
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.finished.emit(self.save_path)
@@ -2,10 +2,13 @@
 
 import os
 import json
+import logging
 from PySide6.QtWidgets import QPushButton, QHBoxLayout, QMessageBox, QLineEdit, QComboBox, QListWidget, QListWidgetItem
 from PySide6.QtCore import QProcess, Qt
 from .simple_dialogs import BaseUiDialog
 
+logger = logging.getLogger("TailscaleClient")
+
 class NodeDialog(BaseUiDialog):
     def __init__(self, profile, manager, parent=None):
         super().__init__("node.ui", parent)
@@ -17,6 +20,10 @@ class NodeDialog(BaseUiDialog):
         # Map peer exit nodes to their advertised subnet routes for real-time suggestions
         self.exit_node_routes_map = {}
 
+        # In-flight prefs fetch, cancelled when the dialog closes
+        self.prefs_future = None
+        self.finished.connect(self._cancel_prefs_fetch)
+
         # Access native widgets through self.ui
         self.comboBoxExitNode = self.ui.findChild(QComboBox, "comboBoxExitNode")
         self.lineEditRoutes = self.ui.findChild(QLineEdit, "lineEditRoutes")
@@ -131,68 +138,81 @@ class NodeDialog(BaseUiDialog):
 
     def _fetch_active_prefs(self):
         """Fetches the live preferences from Tailscale to auto-populate the advanced options."""
-        from src.core.tailscale import get_tailscale_path
-        self.prefs_proc = QProcess(self)
-        
-        def on_prefs_finished(*args):
-            output = self.prefs_proc.readAllStandardOutput().data().decode().strip()
-            if not output: return
-            
-            # Don't auto-populate if the user disabled it
-            if self.chkAutoPopulate and not self.chkAutoPopulate.isChecked():
-                return
+        from src.core.async_core import get_bridge, fetch_prefs
+        self._cancel_prefs_fetch()
+        use_local_api = getattr(self.manager.settings, 'use_local_api', True)
+        self.prefs_future = get_bridge().submit(fetch_prefs(use_local_api), self._on_prefs_fetched)
+
+    def _cancel_prefs_fetch(self):
+        if self.prefs_future:
+            self.prefs_future.cancel()
+            self.prefs_future = None
+
+    def _on_prefs_fetched(self, prefs, error):
+        self.prefs_future = None
+        if error is not None:
+            logger.warning(f"Could not fetch prefs: {error}")
+            return
+        if not prefs: return
+
+        # Don't auto-populate if the user disabled it
+        if self.chkAutoPopulate and not self.chkAutoPopulate.isChecked():
+            return
+
+        try:
+            # Auto-populate UI from live daemon config (preferring live config over profile config if active)
+            if self.chkSSH and prefs.get("RunSSH"):
+                self.chkSSH.setChecked(True)
+            if self.chkAcceptDNS and prefs.get("CorpDNS"):
+                self.chkAcceptDNS.setChecked(True)
+            if self.chkAllowLAN and prefs.get("ExitNodeAllowLANAccess"):
+                self.chkAllowLAN.setChecked(True)
+            if self.chkDisableSNAT and prefs.get("NoSNAT"):
+                self.chkDisableSNAT.setChecked(True)
+            if self.chkShieldsUp and prefs.get("ShieldsUp"):
+                self.chkShieldsUp.setChecked(True)
                 
-            try:
-                import json
-                prefs = json.loads(output)
+            # Exit nodes are advertised by routing 0.0.0.0/0
+            routes = prefs.get("AdvertiseRoutes") or []
+            if self.chkAdvertiseExitNode and ("0.0.0.0/0" in routes or "::/0" in routes):
+                self.chkAdvertiseExitNode.setChecked(True)
                 
-                # Auto-populate UI from live daemon config (preferring live config over profile config if active)
-                if self.chkSSH and prefs.get("RunSSH"):
-                    self.chkSSH.setChecked(True)
-                if self.chkAcceptDNS and prefs.get("CorpDNS"):
-                    self.chkAcceptDNS.setChecked(True)
-                if self.chkAllowLAN and prefs.get("ExitNodeAllowLANAccess"):
-                    self.chkAllowLAN.setChecked(True)
-                if self.chkDisableSNAT and prefs.get("NoSNAT"):
-                    self.chkDisableSNAT.setChecked(True)
-                if self.chkShieldsUp and prefs.get("ShieldsUp"):
-                    self.chkShieldsUp.setChecked(True)
-                    
-                # Exit nodes are advertised by routing 0.0.0.0/0
-                routes = prefs.get("AdvertiseRoutes") or []
-                if self.chkAdvertiseExitNode and ("0.0.0.0/0" in routes or "::/0" in routes):
-                    self.chkAdvertiseExitNode.setChecked(True)
-                    
-                # Tags
-                tags = prefs.get("AdvertiseTags") or []
-                if self.lineEditTags and tags:
-                    self.lineEditTags.setText(",".join(tags))
-                    
-                # Hostname override
-                hostname = prefs.get("Hostname")
-                if self.lineEditHostname and hostname:
-                    self.lineEditHostname.setText(hostname)
-                    
-                # Auto-resolve Emergency IP from ControlURL if blank
-                control_url = prefs.get("ControlURL")
-                if control_url and not self.profile.last_known_ip and self.lineEditEmergencyIp:
-                    import socket
-                    from urllib.parse import urlparse
-                    try:
-                        domain = urlparse(control_url).hostname
-                        if domain:
-                            ip = socket.gethostbyname(domain)
-                            if ip:
-                                self.lineEditEmergencyIp.setText(ip)
-                                self.lineEditEmergencyIp.setPlaceholderText("Resolved from live Control URL!")
-                    except Exception as res_err:
-                        print("DEBUG [node_dialog]: Could not resolve ControlURL IP:", res_err)
-                    
-            except Exception as e:
-                print("DEBUG [node_dialog]: Exception parsing prefs:", e)
+            # Tags
+            tags = prefs.get("AdvertiseTags") or []
+            if self.lineEditTags and tags:
+                self.lineEditTags.setText(",".join(tags))
+                
+            # Hostname override
+            hostname = prefs.get("Hostname")
+            if self.lineEditHostname and hostname:
+                self.lineEditHostname.setText(hostname)
+                
+            # Auto-resolve Emergency IP from ControlURL if blank
+            control_url = prefs.get("ControlURL")
+            if control_url and not self.profile.last_known_ip and self.lineEditEmergencyIp:
+                from urllib.parse import urlparse
+                from src.core.dns_resolver import get_resolver
+                try:
+                    domain = urlparse(control_url).hostname
+                    if domain:
+                        get_resolver().lookup(domain, self._on_control_url_resolved)
+                except Exception as res_err:
+                    logger.warning(f"Could not resolve the ControlURL IP: {res_err}")
                 
-        self.prefs_proc.finished.connect(on_prefs_finished)
-        self.prefs_proc.start(get_tailscale_path(), ["debug", "prefs"])
+        except Exception as e:
+            logger.warning(f"Could not parse prefs: {e}")
+
+    def _on_control_url_resolved(self, domain, ip):
+        if not ip:
+            logger.warning(f"Could not resolve the ControlURL IP of {domain}")
+            return
+        try:
+            if self.lineEditEmergencyIp and not self.lineEditEmergencyIp.text():
+                self.lineEditEmergencyIp.setText(ip)
+                self.lineEditEmergencyIp.setPlaceholderText("Resolved from live Control URL!")
+        except RuntimeError:
+            # Dialog was closed before the lookup completed
+            pass
 
     def _fetch_active_status(self):
         self.status_proc = QProcess(self)
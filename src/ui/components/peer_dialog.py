@@ -6,6 +6,7 @@ from PySide6.QtCore import Qt, QTimer, QSize, QProcess
 from PySide6.QtGui import QAction, QGuiApplication, QPainter, QPen, QColor
 from .simple_dialogs import BaseUiDialog
 from ...core.tailscale import get_tailscale_path
+from ...core.profiling import timed
 
 class PeerNameBadgeWidget(QWidget):
     def __init__(self, host_name, username="", tags=None, parent=None):
@@ -82,7 +83,10 @@ class LatencySparklineWidget(QWidget):
         # Pick the first 'in <n>ms' we can find.
         match = re.search(r'in\s+(\d+)\s*ms', output)
         if match:
-            self.values.append(int(match.group(1)))
+            latency = int(match.group(1))
+            from ...core.metrics import record_ping
+            record_ping(self.peer_ip, latency, self.values)
+            self.values.append(latency)
             if len(self.values) > 12:
                 self.values.pop(0)
             self.update()
@@ -173,7 +177,8 @@ class PeerListDialog(BaseUiDialog):
         if self.btnRefresh:
             self.btnRefresh.clicked.connect(self._trigger_refresh)
             
-        self.ts_manager.connection_status_changed.connect(self._on_status_updated)
+        # Only rebuild when the peers actually changed, not on every status poll
+        self.ts_manager.netmap_changed.connect(self._on_netmap_changed)
         
         # Configure Table Headers with Smart Resize Behaviors
         if self.tablePeers:
@@ -199,14 +204,16 @@ class PeerListDialog(BaseUiDialog):
         if self.btnRefresh:
             self.btnRefresh.setText("Refreshing...")
             self.btnRefresh.setEnabled(False)
-        self.ts_manager.check_status()
+        # Always answered by netmap_changed, even when nothing changed
+        self.ts_manager.refresh_netmap()
 
-    def _on_status_updated(self, is_connected, status_text):
+    def _on_netmap_changed(self):
         if self.btnRefresh:
             self.btnRefresh.setText("Refresh")
             self.btnRefresh.setEnabled(True)
         self._populate_peers()
 
+    @timed("PeerListDialog._populate_peers")
     def _populate_peers(self):
         if not self.tablePeers:
             return
@@ -358,7 +365,7 @@ class PeerListDialog(BaseUiDialog):
 
     def closeEvent(self, event):
         try:
-            self.ts_manager.connection_status_changed.disconnect(self._on_status_updated)
+            self.ts_manager.netmap_changed.disconnect(self._on_netmap_changed)
         except Exception:
             pass
         super().closeEvent(event)
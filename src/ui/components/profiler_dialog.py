@@ -0,0 +1,103 @@
+import os
+from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QCheckBox, QLabel,
+                               QSpinBox, QTreeWidget, QTreeWidgetItem, QHeaderView)
+from PySide6.QtCore import Qt, QTimer
+from src.core import profiling
+
+def _ms(seconds):
+    return "-" if seconds is None else f"{seconds * 1000:.2f}"
+
+class ProfilerDialog(QDialog):
+    """Live hot-path timings plus an on-demand CPU profile of the GUI thread."""
+    def __init__(self, out_dir, parent=None):
+        super().__init__(parent)
+        self.capture = profiling.ProfileCapture(out_dir)
+
+        self.setWindowTitle("Performance Profiler")
+        self.resize(760, 460)
+
+        layout = QVBoxLayout(self)
+        self.chkEnabled = QCheckBox("Record section timings", self)
+        self.chkEnabled.setChecked(profiling.is_enabled())
+        layout.addWidget(self.chkEnabled)
+
+        self.table = QTreeWidget(self)
+        self.table.setHeaderLabels(["Section", "Calls", "p50 (ms)", "p95 (ms)", "Max (ms)", "Total (ms)"])
+        self.table.setRootIsDecorated(False)
+        self.table.setUniformRowHeights(True)
+        self.table.header().setSectionResizeMode(0, QHeaderView.Stretch)
+        layout.addWidget(self.table, 1)
+
+        row = QHBoxLayout()
+        self.btnReset = QPushButton("Reset", self)
+        self.spinSeconds = QSpinBox(self)
+        self.spinSeconds.setRange(1, 120)
+        self.spinSeconds.setValue(10)
+        self.spinSeconds.setSuffix(" s")
+        self.btnCapture = QPushButton("Capture CPU Profile", self)
+        row.addWidget(self.btnReset)
+        row.addStretch(1)
+        row.addWidget(self.spinSeconds)
+        row.addWidget(self.btnCapture)
+        layout.addLayout(row)
+
+        self.statusLabel = QLabel("", self)
+        self.statusLabel.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        self.statusLabel.setWordWrap(True)
+        layout.addWidget(self.statusLabel)
+
+        self.chkEnabled.toggled.connect(profiling.set_enabled)
+        self.btnReset.clicked.connect(self._reset)
+        self.btnCapture.clicked.connect(self._start_capture)
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self._refresh)
+        self.refresh_timer.start(1000)
+        self._refresh()
+
+    def _refresh(self):
+        self.table.setUpdatesEnabled(False)
+        self.table.clear()
+        items = []
+        for section, count, p50, p95, peak, total in profiling.section_summary():
+            item = QTreeWidgetItem([section, str(count), _ms(p50), _ms(p95), _ms(peak), _ms(total)])
+            for column in range(1, 6):
+                item.setTextAlignment(column, Qt.AlignRight | Qt.AlignVCenter)
+            items.append(item)
+        self.table.addTopLevelItems(items)
+        self.table.setUpdatesEnabled(True)
+
+    def _reset(self):
+        profiling.SECTION_SECONDS.clear()
+        self._refresh()
+
+    def _start_capture(self):
+        if self.capture.running:
+            return
+        try:
+            self.capture.start()
+        except Exception as e:
+            self.statusLabel.setText(f"Could not start profiler: {e}")
+            return
+        seconds = self.spinSeconds.value()
+        self.btnCapture.setEnabled(False)
+        self.statusLabel.setText(f"Profiling the GUI thread for {seconds} s ({self.capture.backend})...")
+        QTimer.singleShot(seconds * 1000, self._finish_capture)
+
+    def _finish_capture(self):
+        if not self.capture.running:
+            return
+        try:
+            written = self.capture.stop()
+        except Exception as e:
+            self.statusLabel.setText(f"Failed to write profile: {e}")
+        else:
+            self.statusLabel.setText("Saved: " + ", ".join(os.path.basename(p) for p in written)
+                                     + f" in {self.capture.out_dir}")
+        self.btnCapture.setEnabled(True)
+
+    def done(self, result):
+        # Esc and the close button both end here: save a running capture before the dialog is deleted
+        self.refresh_timer.stop()
+        self._finish_capture()
+        super().done(result)
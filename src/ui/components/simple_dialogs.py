@@ -4,7 +4,7 @@ from PySide6.QtWidgets import (QDialog, QWidget, QVBoxLayout, QTextEdit,
                              QTableWidget, QTableWidgetItem, QHeaderView)
 from PySide6.QtUiTools import QUiLoader
 from PySide6.QtCore import QFile, Qt, QUrl, QThread, Signal, QObject
-from PySide6.QtGui import QTextOption
+from PySide6.QtGui import QTextOption, QPainter, QPen, QColor
 import hashlib
 import requests
 import re
@@ -289,6 +289,62 @@ class ReadmeDialog(BaseUiDialog):
         
         self.download_thread.start()
 
+def format_rate(bps):
+    for unit in ['B/s', 'KB/s', 'MB/s', 'GB/s']:
+        if bps < 1024:
+            return f"{bps:.1f} {unit}"
+        bps /= 1024
+    return f"{bps:.1f} TB/s"
+
+
+class ThroughputGraphWidget(QWidget):
+    """Live upload/download throughput graph fed by a TrafficSampler."""
+    def __init__(self, sampler, parent=None):
+        super().__init__(parent)
+        self.sampler = sampler
+        self.setMinimumHeight(90)
+        self.sampler.throughput_updated.connect(self._on_throughput)
+
+    def _on_throughput(self, point):
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        width = self.width()
+        height = self.height()
+        points = list(self.sampler.history)
+
+        painter.setPen(QPen(QColor("#6b7280"), 1, Qt.DashLine))
+        painter.drawLine(0, height - 1, width, height - 1)
+
+        if len(points) < 2:
+            painter.setPen(QPen(QColor("#9ca3af"), 1))
+            painter.drawText(self.rect(), Qt.AlignCenter, "Waiting for traffic samples...")
+            return
+
+        # Shared scale so upload and download are visually comparable
+        peak = max(max(p.up_ewma_bps, p.down_ewma_bps) for p in points) or 1.0
+        capacity = self.sampler.history.maxlen or len(points)
+        step = width / max(1, capacity - 1)
+        offset = capacity - len(points)
+
+        for attr, color in (("down_ewma_bps", "#10b981"), ("up_ewma_bps", "#f59e0b")):
+            painter.setPen(QPen(QColor(color), 2, Qt.SolidLine))
+            prev = None
+            for i, p in enumerate(points):
+                x = (offset + i) * step
+                y = height - 18 - (getattr(p, attr) / peak) * (height - 24)
+                if prev:
+                    painter.drawLine(prev[0], prev[1], x, y)
+                prev = (x, y)
+
+        latest = points[-1]
+        painter.setPen(QPen(QColor("#9ca3af"), 1))
+        painter.drawText(4, height - 4, f"▼ {format_rate(latest.down_ewma_bps)}   ▲ {format_rate(latest.up_ewma_bps)}")
+
+
 class TrafficDialog(BaseUiDialog):
     def __init__(self, parent=None, session_text="", daily_text="", history=None):
         super().__init__("traffic.ui", parent)
@@ -315,6 +371,15 @@ class TrafficDialog(BaseUiDialog):
         if label_daily:
             label_daily.setText(daily_text)
             
+        # Live throughput graph driven by the coordinator's traffic sampler
+        sampler = getattr(self.ts_manager, "traffic_sampler", None)
+        group_summary = self.ui.findChild(QWidget, "groupSummary")
+        if sampler and self.ui.layout():
+            self.setFixedSize(460, 660)
+            self.throughput_graph = ThroughputGraphWidget(sampler, self.ui)
+            index = self.ui.layout().indexOf(group_summary) if group_summary else -1
+            self.ui.layout().insertWidget(index + 1, self.throughput_graph)
+            
         # Connect status updates if we have the ts_manager
         if self.ts_manager:
             self.ts_manager.connection_status_changed.connect(self._on_status_changed)
@@ -2,6 +2,8 @@ import os
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QLineEdit, QPushButton, QLabel
 from PySide6.QtUiTools import QUiLoader
 from PySide6.QtCore import QFile, QTimer
+from ..core.profiling import timed
+from .styles import set_state
 
 class DashboardView(QWidget):
     def __init__(self, manager, ts_manager, profile=None):
@@ -9,6 +11,8 @@ class DashboardView(QWidget):
         self.manager = manager
         self.ts_manager = ts_manager
         self.profile = profile
+        self._last_expiry_event = None
+        self._is_connected = False
         
         # 1. Load your UI file
         loader = QUiLoader()
@@ -51,6 +55,7 @@ class DashboardView(QWidget):
             # Remove hardcoded gray - will be styled by MainWindow QSS
             
         self.ts_manager.connection_status_changed.connect(self.update_status)
+        self.ts_manager.netmap_changed.connect(self._on_netmap_changed)
         # Initial status update
         self.update_status(*self.ts_manager.check_status())
 
@@ -110,6 +115,7 @@ class DashboardView(QWidget):
                     self.lineEditUrl.setText(self.profile.login_server)
 
 
+    @timed("DashboardView.update_status")
     def update_status(self, is_connected, status_text):
         if not self.labelStatus: return
         
@@ -125,99 +131,31 @@ class DashboardView(QWidget):
 
         if not is_connected and status_text == "Pending Admin Approval":
             self.labelStatus.setText("🟡 Pending Admin Approval")
-            self.labelStatus.setStyleSheet("color: #f59e0b; font-weight: bold;")
+            set_state(self.labelStatus, "level", "warn")
             self.prev_stats = None
             if self.btnVpnAction:
                 self.btnVpnAction.setEnabled(False)
                 self.btnVpnAction.setText("Awaiting Approval...")
-                self.btnVpnAction.setStyleSheet("""
-                    QPushButton { 
-                        background-color: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 #d97706, stop:1 #92400e);
-                        color: white; font-weight: bold; border-radius: 6px; border: 1px solid #b45309;
-                    }
-                """)
+                set_state(self.btnVpnAction, "vpnState", "awaiting")
             return
 
+        # Colours live in the theme's state stylesheet (src/ui/styles.py); set_state
+        # only repolishes when a widget actually changes state, not on every poll.
         if is_connected:
             self.labelStatus.setText("🟢 Connected")
-            self.labelStatus.setStyleSheet("color: #22c55e; font-weight: bold;")
+            set_state(self.labelStatus, "level", "ok")
+            # Capture baseline for session tracking
+            self.prev_stats = self.ts_manager.get_stats()
             if self.btnVpnAction:
                 self.btnVpnAction.setEnabled(True)
-            
-            self.prev_stats = None
-            
-        # Capture baseline if not already set (for session tracking)
-        if is_connected:
-            if self.prev_stats is None:
-                self.prev_stats = self.ts_manager.get_stats()
-            
-            if self.btnVpnAction:
                 self.btnVpnAction.setText("Logout")
-                if getattr(self.window(), "resolved_theme", "light") == "vibrant":
-                    self.btnVpnAction.setStyleSheet("""
-                        QPushButton { 
-                            background-color: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 rgba(239, 68, 68, 0.25), stop:1 rgba(153, 27, 27, 0.15));
-                            color: #ef4444; 
-                            font-weight: bold; 
-                            border-radius: 8px;
-                            border: 1px solid #ef4444;
-                        }
-                        QPushButton:hover { 
-                            background-color: rgba(239, 68, 68, 0.4);
-                            color: white;
-                        }
-                    """)
-                else:
-                    self.btnVpnAction.setStyleSheet("""
-                        QPushButton { 
-                            background-color: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 #ef4444, stop:1 #b91c1c);
-                            color: white; 
-                            font-weight: bold; 
-                            border-radius: 6px;
-                            border: 1px solid #991b1b;
-                        }
-                        QPushButton:hover { 
-                            background-color: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 #f87171, stop:1 #dc2626);
-                        }
-                    """)
+                set_state(self.btnVpnAction, "vpnState", "logout")
             if self.btnChangeCredentials:
                 self.btnChangeCredentials.setEnabled(False)
-                if getattr(self.window(), "resolved_theme", "light") == "vibrant":
-                    self.btnChangeCredentials.setStyleSheet("""
-                        QPushButton { 
-                            background-color: rgba(31, 41, 55, 0.4); color: #4b5563; font-weight: bold; border-radius: 8px; border: 1px solid rgba(255,255,255,0.05);
-                        }
-                    """)
-                else:
-                    self.btnChangeCredentials.setStyleSheet("""
-                        QPushButton { 
-                            background-color: #374151; color: #9ca3af; font-weight: bold; border-radius: 6px; 
-                        }
-                    """)
-            if self.btnShowStats:
-                if getattr(self.window(), "resolved_theme", "light") == "vibrant":
-                    self.btnShowStats.setStyleSheet("""
-                        QPushButton { 
-                            background-color: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 rgba(217, 119, 6, 0.25), stop:1 rgba(146, 64, 14, 0.15));
-                            color: #d97706; font-weight: bold; border-radius: 8px; border: 1px solid #d97706;
-                        }
-                        QPushButton:hover { 
-                            background-color: rgba(217, 119, 6, 0.4); color: white;
-                        }
-                    """)
-                else:
-                    self.btnShowStats.setStyleSheet("""
-                        QPushButton { 
-                            background-color: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 #d97706, stop:1 #92400e);
-                            color: white; font-weight: bold; border-radius: 6px; border: 1px solid #b45309;
-                        }
-                        QPushButton:hover { 
-                            background-color: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 #f59e0b, stop:1 #d97706);
-                        }
-                    """)
+                set_state(self.btnChangeCredentials, "credState", "locked")
         else:
             self.labelStatus.setText("🔴 Disconnected")
-            self.labelStatus.setStyleSheet("color: #ef4444; font-weight: bold;")
+            set_state(self.labelStatus, "level", "error")
             
             # Reset baseline when disconnected
             self.prev_stats = None
@@ -225,79 +163,21 @@ class DashboardView(QWidget):
             if self.btnVpnAction:
                 self.btnVpnAction.setEnabled(True)
                 self.btnVpnAction.setText("Connect")
-                if getattr(self.window(), "resolved_theme", "light") == "vibrant":
-                    self.btnVpnAction.setStyleSheet("""
-                        QPushButton { 
-                            background-color: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 rgba(16, 185, 129, 0.25), stop:1 rgba(6, 78, 59, 0.15));
-                            color: #10b981; 
-                            font-weight: bold; 
-                            border-radius: 8px;
-                            border: 1px solid #10b981;
-                        }
-                        QPushButton:hover { 
-                            background-color: rgba(16, 185, 129, 0.4);
-                            color: white;
-                        }
-                    """)
-                else:
-                    self.btnVpnAction.setStyleSheet("""
-                        QPushButton { 
-                            background-color: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 #22c55e, stop:1 #15803d);
-                            color: white; 
-                            font-weight: bold; 
-                            border-radius: 6px;
-                            border: 1px solid #166534;
-                        }
-                        QPushButton:hover { 
-                            background-color: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 #4ade80, stop:1 #16a34a);
-                        }
-                    """)
+                set_state(self.btnVpnAction, "vpnState", "connect")
             if self.btnChangeCredentials:
                 self.btnChangeCredentials.setEnabled(True)
-                if getattr(self.window(), "resolved_theme", "light") == "vibrant":
-                    self.btnChangeCredentials.setStyleSheet("""
-                        QPushButton { 
-                            background-color: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 rgba(99, 102, 241, 0.25), stop:1 rgba(67, 56, 202, 0.15));
-                            color: #6366f1; font-weight: bold; border-radius: 8px; border: 1px solid #6366f1;
-                        }
-                        QPushButton:hover { 
-                            background-color: rgba(99, 102, 241, 0.4); color: white;
-                        }
-                    """)
-                else:
-                    self.btnChangeCredentials.setStyleSheet("""
-                        QPushButton { 
-                            background-color: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 #6366f1, stop:1 #4338ca);
-                            color: white; font-weight: bold; border-radius: 6px; border: 1px solid #4f46e5;
-                        }
-                        QPushButton:hover { 
-                            background-color: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 #818cf8, stop:1 #4f46e5);
-                        }
-                    """)
-            if self.btnShowStats:
-                if getattr(self.window(), "resolved_theme", "light") == "vibrant":
-                    self.btnShowStats.setStyleSheet("""
-                        QPushButton { 
-                            background-color: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 rgba(217, 119, 6, 0.25), stop:1 rgba(146, 64, 14, 0.15));
-                            color: #d97706; font-weight: bold; border-radius: 8px; border: 1px solid #d97706;
-                        }
-                        QPushButton:hover { 
-                            background-color: rgba(217, 119, 6, 0.4); color: white;
-                        }
-                    """)
-                else:
-                    self.btnShowStats.setStyleSheet("""
-                        QPushButton { 
-                            background-color: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 #d97706, stop:1 #92400e);
-                            color: white; font-weight: bold; border-radius: 6px; border: 1px solid #b45309;
-                        }
-                        QPushButton:hover { 
-                            background-color: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 #f59e0b, stop:1 #d97706);
-                        }
-                    """)
+                set_state(self.btnChangeCredentials, "credState", "editable")
+
+        self._is_connected = is_connected
+        self._update_expiry()
 
-        # Render Node Key Expiration Badges
-        if is_connected and self.labelExpiry:
+    def _on_netmap_changed(self):
+        # A new key expiry arrives with the netmap, not with a status transition
+        self._update_expiry()
+
+    def _update_expiry(self):
+        """Render the node key expiration badge from the cached status."""
+        if self._is_connected and self.labelExpiry:
             try:
                 status_cache = self.ts_manager.cache.get("status")
                 raw_data = status_cache.get("raw_data") if status_cache else None
@@ -312,32 +192,39 @@ class DashboardView(QWidget):
                         delta = expiry_dt - now_dt
                         days = delta.days
                         
-                        print(f"[DEBUG Node Expiry] Raw timestamp: {expiry_str} | Parsed naive: {base_time} | Days remaining: {days}")
+                        self._log_expiry_event(expiry=expiry_str, days_remaining=days)
                         
                         if days < 0:
                             self.labelExpiry.setText("🔴 Node Key Expired!")
-                            self.labelExpiry.setStyleSheet("color: #ef4444; font-weight: bold;")
+                            set_state(self.labelExpiry, "level", "error")
                         elif days < 7:
                             self.labelExpiry.setText(f"🔴 Node Key Expires in {days} days!")
-                            self.labelExpiry.setStyleSheet("color: #ef4444; font-weight: bold;")
+                            set_state(self.labelExpiry, "level", "error")
                         elif days < 30:
                             self.labelExpiry.setText(f"Core Auth Session: 🟡 Expires in {days} days")
-                            self.labelExpiry.setStyleSheet("color: #f59e0b; font-weight: bold;")
+                            set_state(self.labelExpiry, "level", "warn")
                         else:
                             self.labelExpiry.setText(f"Core Auth Session: 🟢 Key Active (Expires in {days} days)")
-                            self.labelExpiry.setStyleSheet("color: #10b981; font-weight: bold;")
+                            set_state(self.labelExpiry, "level", "active")
                     else:
-                        print("[DEBUG Node Expiry] No Expiry timestamp found in Self node.")
+                        self._log_expiry_event(expiry=None, reason="no expiry on Self node")
                         self.labelExpiry.setText("")
                 else:
-                    print("[DEBUG Node Expiry] No raw status data cached yet.")
+                    self._log_expiry_event(expiry=None, reason="no status data cached")
                     self.labelExpiry.setText("")
             except Exception as e:
-                print(f"[DEBUG Node Expiry] Parsing failed: {e}")
+                self._log_expiry_event(expiry=None, reason=f"parse failed: {e}")
                 self.labelExpiry.setText("")
         elif self.labelExpiry:
             self.labelExpiry.setText("")
 
+    def _log_expiry_event(self, **fields):
+        # Status updates arrive every few seconds; only record the expiry when it changes
+        if fields != self._last_expiry_event:
+            self._last_expiry_event = fields
+            from src.utils.event_log import log_event
+            log_event("node_expiry", profile=getattr(self.profile, "name", None), **fields)
+
     def toggle_connection(self):
         # We explicitly rely on the button's visual state because calling check_status() 
         # can return a transient False if the local API misses a beat or the cache resets.
@@ -360,64 +247,26 @@ class DashboardView(QWidget):
                     return
 
             url = self.lineEditUrl.text() if self.lineEditUrl else "https://controlplane.tailscale.com"
-            key = self.profile.auth_key if self.profile else ""
-            # Original app uses 'google' for SSO
-            is_sso = self.profile.auth_mode == "google" if self.profile else False
             
             if self.btnVpnAction:
                 self.btnVpnAction.setText("Connecting...")
-                self.btnVpnAction.setStyleSheet("""
-                    QPushButton { 
-                        background-color: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 #f59e0b, stop:1 #d97706);
-                        color: white; 
-                        font-weight: bold; 
-                        border-radius: 6px;
-                        border: 1px solid #b45309;
-                    }
-                """)
+                set_state(self.btnVpnAction, "vpnState", "connecting")
                 # Start the pulse animation
                 if hasattr(self, 'pulse_anim'):
                     self.pulse_anim.start()
             
-            exit_node = self.profile.exit_node if (self.profile and self.manager.settings.advanced_features) else ""
-            routes = self.profile.routes if (self.profile and self.manager.settings.advanced_features) else ""
-            native_profile = self.profile.native_profile if (self.profile and self.manager.settings.advanced_features) else ""
-            ssh = self.profile.enable_ssh if (self.profile and self.manager.settings.advanced_features) else False
-            accept_dns = self.profile.accept_dns if (self.profile and self.manager.settings.advanced_features) else False
-            allow_lan = self.profile.allow_lan if (self.profile and self.manager.settings.advanced_features) else False
-            disable_snat = self.profile.disable_snat if (self.profile and self.manager.settings.advanced_features) else False
-            hostname = self.profile.hostname if (self.profile and self.manager.settings.advanced_features) else ""
-            force_reset = self.profile.force_reset if (self.profile and self.manager.settings.advanced_features) else False
-            advertise_exit_node = self.profile.advertise_exit_node if (self.profile and self.manager.settings.advanced_features) else False
-            shields_up = self.profile.shields_up if (self.profile and self.manager.settings.advanced_features) else False
-            force_reauth = self.profile.force_reauth if (self.profile and self.manager.settings.advanced_features) else False
-            advertise_tags = self.profile.advertise_tags if (self.profile and self.manager.settings.advanced_features) else ""
-
+            native_profile = self.manager.native_profile_for(self.profile)
             if native_profile:
                 self.ts_manager.switch_profile(native_profile, self.profile.name if self.profile else None)
                 from PySide6.QtCore import QTimer
                 QTimer.singleShot(1500, self.ts_manager.check_status)
-            elif is_sso:
-                self.ts_manager.connect(
-                    login_server=url, auth_key=None, use_sso=True,
-                    profile_name=self.profile.name if self.profile else None,
-                    exit_node=exit_node, routes=routes, ssh=ssh, accept_dns=accept_dns,
-                    allow_lan=allow_lan, disable_snat=disable_snat, hostname=hostname,
-                    force_reset=force_reset, advertise_exit_node=advertise_exit_node,
-                    shields_up=shields_up, force_reauth=force_reauth, advertise_tags=advertise_tags
-                )
             else:
-                self.ts_manager.connect(
-                    login_server=url, auth_key=key, use_sso=False,
-                    profile_name=self.profile.name if self.profile else None,
-                    exit_node=exit_node, routes=routes, ssh=ssh, accept_dns=accept_dns,
-                    allow_lan=allow_lan, disable_snat=disable_snat, hostname=hostname,
-                    force_reset=force_reset, advertise_exit_node=advertise_exit_node,
-                    shields_up=shields_up, force_reauth=force_reauth, advertise_tags=advertise_tags
-                )
-                # Brief delay to allow command to start before checking status
-                from PySide6.QtCore import QTimer
-                QTimer.singleShot(2000, self.ts_manager.check_status)
+                connect_kwargs = self.manager.connect_kwargs(self.profile, login_server=url)
+                self.ts_manager.connect(**connect_kwargs)
+                if not connect_kwargs["use_sso"]:
+                    # Brief delay to allow command to start before checking status
+                    from PySide6.QtCore import QTimer
+                    QTimer.singleShot(2000, self.ts_manager.check_status)
 
     def _update_traffic_label(self):
         if not self.labelTraffic: return
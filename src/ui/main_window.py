@@ -38,9 +38,12 @@ class MainWindow(QMainWindow):
         self.setWindowTitle("Tailscale Client Pro")
         self.setFixedSize(420, 280)
 
+        from .theme_engine import ThemeEngine
+        self.theme_engine = ThemeEngine()
         self.current_theme = "light" # Default is LIGHT
         self.change_theme("light")
         self.last_status_text = None
+        self.profiler_dialog = None
 
         # 4. Initialize tabs
         self.refresh_tabs()
@@ -437,6 +440,10 @@ class MainWindow(QMainWindow):
         self.actionDiagnostics = QAction(self.tr("&Network Diagnostics..."), self)
         self.actionDiagnostics.triggered.connect(self.show_diagnostics)
         self.advanced_menu.addAction(self.actionDiagnostics)
+
+        self.actionProfiler = QAction(self.tr("Performance &Profiler..."), self)
+        self.actionProfiler.triggered.connect(self.show_profiler)
+        self.advanced_menu.addAction(self.actionProfiler)
         
         self.actionTraySwitcher = QAction(self.tr("Enable Quick &Exit-Node Switcher"), self)
         self.actionTraySwitcher.setCheckable(True)
@@ -475,13 +482,18 @@ class MainWindow(QMainWindow):
         
         # Determine log directory (sync with main.py logic)
         app_dir = self.manager.base_dir
+
+        action_search = QAction(self.tr("&Search All Logs..."), self)
+        action_search.triggered.connect(self.show_log_search)
+        self.menuGlobalLogs.addAction(action_search)
+        self.menuGlobalLogs.addSeparator()
         
         if not os.path.exists(app_dir):
             self.menuGlobalLogs.addAction(self.tr("No logs found")).setEnabled(False)
             return
             
         # 1. Main logs directly in app_dir
-        log_files = [(f, os.path.join(app_dir, f)) for f in os.listdir(app_dir) if f.endswith(".log")]
+        log_files = [(f, os.path.join(app_dir, f)) for f in os.listdir(app_dir) if f.endswith(".log") or f.endswith(".jsonl")]
         
         # 2. Connection logs in GlobalLogs/
         global_logs_dir = os.path.join(app_dir, "GlobalLogs")
@@ -499,6 +511,13 @@ class MainWindow(QMainWindow):
             action.triggered.connect(lambda checked, p=full_path, n=display_name: LogViewerDialog(p, n, self).show())
             self.menuGlobalLogs.addAction(action)
 
+    def show_log_search(self):
+        from .components.log_search_dialog import LogSearchDialog
+        dialog = LogSearchDialog(self.manager.base_dir, self,
+                                 open_log=lambda p, n: LogViewerDialog(p, n, self).show())
+        self._apply_theme_to_dialog(dialog)
+        dialog.show()
+
     def _poll_active_tab(self):
         if hasattr(self, 'tabWidget') and self.tabWidget:
             active_widget = self.tabWidget.currentWidget()
@@ -568,91 +587,39 @@ class MainWindow(QMainWindow):
 
     def change_theme(self, theme_name):
         from PySide6.QtWidgets import QApplication
-        from PySide6.QtGui import QGuiApplication, Qt, QColor
         
         self.current_theme = theme_name
-        
-        target_theme = theme_name
-        if theme_name == "system":
-            hints = QGuiApplication.styleHints()
-            if hasattr(hints, "colorScheme"):
-                scheme = hints.colorScheme()
-                target_theme = "dark" if scheme == Qt.ColorScheme.Dark else "light"
-            else:
-                target_theme = "light"
-        
+        target_theme = self.theme_engine.resolve(theme_name)
         self.resolved_theme = target_theme
+        app = QApplication.instance()
         
-        # Handle qt_material themes
         if theme_name.startswith("material:"):
+            # qt_material styles the entire app instance; the tabWidget keeps only the button states
             from qt_material import apply_stylesheet
-            material_theme = theme_name.split(":")[1]
-            # Apply qt_material stylesheet to the entire app instance
-            apply_stylesheet(QApplication.instance(), theme=material_theme)
-            self.current_qss = QApplication.instance().styleSheet()
-            
-            # Reset tabWidget stylesheet since qt_material handles styles globally
-            if self.tabWidget:
-                self.tabWidget.setStyleSheet("")
-                
-            # Refresh tabs
-            if self.tabWidget:
-                for i in range(self.tabWidget.count()):
-                    widget = self.tabWidget.widget(i)
-                    if widget and hasattr(widget, "update_status"):
-                        widget.update_status(*self.ts_manager.check_status())
-            return
-            
-        # Reset application-level stylesheet in case we are switching away from qt_material
-        app = QApplication.instance()
-        app.setStyleSheet("")
-        
-        # qt_material overwrites the palette and style, we must restore them
-        import sys
-        if sys.platform == "win32":
-            app.setStyle("WindowsVista")
-        app.setPalette(app.style().standardPalette())
-
-        # 1. DO NOT touch QApplication stylesheet or MainWindow Palette
-        # This keeps the Menu Bar 100% Native.
-
-        # 2. Determine Local Styles dynamically from QSS files
-        base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        qss_path = os.path.join(base_dir, "assets", "themes", f"{target_theme}.qss")
-        try:
-            with open(qss_path, "r", encoding="utf-8") as f:
-                style = f.read()
-        except Exception:
-            style = ""
-            
-        # 3. Apply style ONLY to the TabWidget
-        if self.tabWidget:
+            apply_stylesheet(app, theme=theme_name.split(":")[1])
+            self._app_style_dirty = True
+            tab_qss, self.dialog_qss = self.theme_engine.compile(target_theme, app.styleSheet())
+        else:
+            if getattr(self, "_app_style_dirty", True):
+                # qt_material overwrites the app stylesheet, palette and style, we must restore them.
+                # Only needed once after leaving it: each of these repolishes every widget.
+                app.setStyleSheet("")
+                if sys.platform == "win32":
+                    app.setStyle("WindowsVista")
+                app.setPalette(app.style().standardPalette())
+                self._app_style_dirty = False
+            # DO NOT touch the QApplication stylesheet or MainWindow palette: keeps the menu bar native
+            tab_qss, self.dialog_qss = self.theme_engine.compile(target_theme)
+        
+        # Apply style ONLY to the TabWidget. One repolish of its subtree; the dashboard
+        # buttons follow through their state properties, so the tabs need no refresh.
+        if self.tabWidget and self.tabWidget.styleSheet() != tab_qss:
             self.tabWidget.setObjectName("tabWidget")
-            self.tabWidget.setStyleSheet(style)
-        
-        self.current_qss = style
-        
-        # 4. Instantly refresh tab buttons to reflect the new theme
-        if self.tabWidget:
-            for i in range(self.tabWidget.count()):
-                widget = self.tabWidget.widget(i)
-                if widget and hasattr(widget, "update_status"):
-                    widget.update_status(*self.ts_manager.check_status())
+            self.tabWidget.setStyleSheet(tab_qss)
 
     def _apply_theme_to_dialog(self, dialog):
-        if hasattr(self, 'current_qss'):
-            dialog_style = self.current_qss.replace("#tabWidget ", "")
-            if self.resolved_theme == "dark":
-                bg = "#1a1e2e"
-                text_color = "#d1d5db"
-            elif self.resolved_theme == "vibrant":
-                bg = "#04060d"
-                text_color = "#f8fafc"
-            else:
-                bg = "#f0f0f0"
-                text_color = "#1a1a1a"
-            dialog_style = f"QDialog {{ background-color: {bg}; color: {text_color}; }} " + dialog_style
-            dialog.setStyleSheet(dialog_style)
+        if hasattr(self, 'dialog_qss'):
+            dialog.setStyleSheet(self.dialog_qss)
 
 
 
@@ -675,6 +642,8 @@ class MainWindow(QMainWindow):
         dlg = PeerListDialog(self.ts_manager, self)
         self._apply_theme_to_dialog(dlg)
         dlg.exec()
+        # Parented to the window, so it would otherwise live on and keep pinging every peer
+        dlg.deleteLater()
 
     def show_diagnostics(self):
         from .components.diagnostics_dialog import DiagnosticsDialog
@@ -682,6 +651,24 @@ class MainWindow(QMainWindow):
         self._apply_theme_to_dialog(dlg)
         dlg.exec()
 
+    def show_profiler(self):
+        # Non-modal, so the window stays usable while a capture records it
+        if self.profiler_dialog is not None:
+            self.profiler_dialog.raise_()
+            self.profiler_dialog.activateWindow()
+            return
+        from .components.profiler_dialog import ProfilerDialog
+        dlg = ProfilerDialog(self.manager.base_dir, self)
+        self._apply_theme_to_dialog(dlg)
+        dlg.finished.connect(self._on_profiler_closed)
+        self.profiler_dialog = dlg
+        dlg.show()
+
+    def _on_profiler_closed(self):
+        dlg, self.profiler_dialog = self.profiler_dialog, None
+        if dlg is not None:
+            dlg.deleteLater()
+
     def show_license(self):
         from .components.simple_dialogs import LicenseDialog
         dlg = LicenseDialog(self.resolved_theme, self)
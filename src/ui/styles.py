@@ -0,0 +1,94 @@
+# src/ui/styles.py
+# This is the state style registry for the dashboard tabs.
+#
+# Buttons and labels whose look follows the connection state carry a dynamic
+# property (vpnState, credState, level) instead of their own stylesheet. The
+# rules for every state are built once per theme family and applied together
+# with the theme on the tab widget, so a status update only touches a property
+# and repolishes when the visual state actually changed.
+
+_SOLID = {
+    "connect": ("qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 #22c55e, stop:1 #15803d)",
+                "color: white; border: 1px solid #166534;",
+                "background-color: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 #4ade80, stop:1 #16a34a);"),
+    "logout": ("qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 #ef4444, stop:1 #b91c1c)",
+               "color: white; border: 1px solid #991b1b;",
+               "background-color: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 #f87171, stop:1 #dc2626);"),
+    "connecting": ("qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 #f59e0b, stop:1 #d97706)",
+                   "color: white; border: 1px solid #b45309;", None),
+    "awaiting": ("qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 #d97706, stop:1 #92400e)",
+                 "color: white; border: 1px solid #b45309;", None),
+    "editable": ("qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 #6366f1, stop:1 #4338ca)",
+                 "color: white; border: 1px solid #4f46e5;",
+                 "background-color: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 #818cf8, stop:1 #4f46e5);"),
+    "locked": ("#374151", "color: #9ca3af;", None),
+    "stats": ("qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 #d97706, stop:1 #92400e)",
+              "color: white; border: 1px solid #b45309;",
+              "background-color: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 #f59e0b, stop:1 #d97706);"),
+}
+
+_GLASS = {
+    "connect": ("qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 rgba(16, 185, 129, 0.25), stop:1 rgba(6, 78, 59, 0.15))",
+                "color: #10b981; border: 1px solid #10b981;",
+                "background-color: rgba(16, 185, 129, 0.4); color: white;"),
+    "logout": ("qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 rgba(239, 68, 68, 0.25), stop:1 rgba(153, 27, 27, 0.15))",
+               "color: #ef4444; border: 1px solid #ef4444;",
+               "background-color: rgba(239, 68, 68, 0.4); color: white;"),
+    "connecting": _SOLID["connecting"],
+    "awaiting": _SOLID["awaiting"],
+    "editable": ("qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 rgba(99, 102, 241, 0.25), stop:1 rgba(67, 56, 202, 0.15))",
+                 "color: #6366f1; border: 1px solid #6366f1;",
+                 "background-color: rgba(99, 102, 241, 0.4); color: white;"),
+    "locked": ("rgba(31, 41, 55, 0.4)", "color: #4b5563; border: 1px solid rgba(255,255,255,0.05);", None),
+    "stats": ("qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 rgba(217, 119, 6, 0.25), stop:1 rgba(146, 64, 14, 0.15))",
+              "color: #d97706; border: 1px solid #d97706;",
+              "background-color: rgba(217, 119, 6, 0.4); color: white;"),
+}
+
+LEVEL_COLORS = {"ok": "#22c55e", "active": "#10b981", "warn": "#f59e0b", "error": "#ef4444"}
+
+# (selector, state key in the palette) for every stateful button
+_BUTTON_RULES = [
+    ('QPushButton#btn_connect[vpnState="{0}"]', state) for state in ("connect", "logout", "connecting", "awaiting")
+] + [
+    ('QPushButton#btnChangeCredentials[credState="{0}"]', state) for state in ("editable", "locked")
+] + [
+    ("QPushButton#btnShowStats", "stats"),
+]
+
+_cache = {}
+
+def theme_family(theme):
+    return "glass" if theme == "vibrant" else "solid"
+
+def _build(family, scope):
+    palette = _GLASS if family == "glass" else _SOLID
+    radius = 8 if family == "glass" else 6
+    rules = []
+    for selector, state in _BUTTON_RULES:
+        background, extra, hover = palette[state]
+        selector = scope + selector.format(state)
+        rules.append(f"{selector} {{ background-color: {background}; {extra} "
+                     f"font-weight: bold; border-radius: {radius}px; }}")
+        if hover:
+            rules.append(f"{selector}:hover {{ {hover} }}")
+    for level, color in LEVEL_COLORS.items():
+        rules.append(f'{scope}QLabel[level="{level}"] {{ color: {color}; font-weight: bold; }}')
+    return "\n".join(rules) + "\n"
+
+def state_qss(theme, scope="#tabWidget "):
+    """Stylesheet with the rules for every state of the theme's family, built once."""
+    key = (theme_family(theme), scope)
+    if key not in _cache:
+        _cache[key] = _build(key[0], scope)
+    return _cache[key]
+
+def set_state(widget, name, value):
+    """Set a style property and repolish only if it changed. Returns True when it did."""
+    if widget is None or widget.property(name) == value:
+        return False
+    widget.setProperty(name, value)
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
+    return True
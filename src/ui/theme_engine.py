@@ -0,0 +1,72 @@
+# src/ui/theme_engine.py
+# This is the theme engine for the application.
+#
+# The theme files are read once at startup. For each theme the tab widget
+# stylesheet (theme QSS plus the dashboard state rules) and the dialog variant
+# are built on first use and cached, so a theme switch is one setStyleSheet.
+
+import os
+from .styles import state_qss
+
+# (background, text) for themed dialogs; anything else gets the light pair
+DIALOG_COLORS = {
+    "dark": ("#1a1e2e", "#d1d5db"),
+    "vibrant": ("#04060d", "#f8fafc"),
+}
+DEFAULT_DIALOG_COLORS = ("#f0f0f0", "#1a1a1a")
+
+class ThemeEngine:
+    def __init__(self, themes_dir=None):
+        if themes_dir is None:
+            base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+            themes_dir = os.path.join(base_dir, "assets", "themes")
+        self.themes_dir = themes_dir
+        self._sources = {}
+        self._compiled = {}
+        self._load_all()
+
+    def _load_all(self):
+        try:
+            names = sorted(os.listdir(self.themes_dir))
+        except Exception:
+            names = []
+        for name in names:
+            if not name.endswith(".qss"):
+                continue
+            try:
+                with open(os.path.join(self.themes_dir, name), "r", encoding="utf-8") as f:
+                    self._sources[name[:-4]] = f.read()
+            except Exception:
+                continue
+
+    @property
+    def themes(self):
+        return list(self._sources)
+
+    def resolve(self, theme_name):
+        """Map "system" to the platform's light or dark scheme; other names are returned as-is."""
+        if theme_name != "system":
+            return theme_name
+        from PySide6.QtGui import QGuiApplication
+        from PySide6.QtCore import Qt
+        hints = QGuiApplication.styleHints()
+        if hasattr(hints, "colorScheme"):
+            return "dark" if hints.colorScheme() == Qt.ColorScheme.Dark else "light"
+        return "light"
+
+    def compile(self, theme, source=None):
+        """
+        Returns (tab_qss, dialog_qss) for a resolved theme name.
+        `source` replaces the theme file for styles that are applied app-wide
+        (qt_material); the tab widget then only carries the state rules.
+        """
+        if theme not in self._compiled:
+            if source is None:
+                source = self._sources.get(theme, "")
+                tab_qss = source + state_qss(theme)
+            else:
+                tab_qss = state_qss(theme)
+            bg, text_color = DIALOG_COLORS.get(theme, DEFAULT_DIALOG_COLORS)
+            dialog_qss = f"QDialog {{ background-color: {bg}; color: {text_color}; }} " + source.replace("#tabWidget ", "")
+            self._compiled[theme] = (tab_qss, dialog_qss)
+        return self._compiled[theme]
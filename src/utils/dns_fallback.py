@@ -2,7 +2,14 @@ import os
 import sys
 import ctypes
 
-HOSTS_FILE = r"C:\Windows\System32\drivers\etc\hosts"
+def _default_hosts_path():
+    if sys.platform == "win32":
+        return os.path.join(os.environ.get("SystemRoot", r"C:\Windows"), "System32", "drivers", "etc", "hosts")
+    return "/etc/hosts"
+
+# Overridable so the fallback logic can target a scratch file (tests, sandboxes)
+HOSTS_FILE = os.environ.get("TSCLIENT_HOSTS_FILE") or _default_hosts_path()
+FALLBACK_MARKER = "# Headscale Auto-Fallback"
 
 def is_admin():
     try:
@@ -10,85 +17,189 @@ def is_admin():
     except:
         return False
 
-def _edit_hosts(domain, ip=None):
+class HostsFile:
+    """
+    Parsed hosts file indexed by hostname. Many mappings are applied in one
+    rewrite, and the file is left untouched when nothing would change.
+    """
+    def __init__(self, path=None):
+        self.path = path or HOSTS_FILE
+        self.lines = []
+        self.index = {}  # hostname (lower) -> [line numbers]
+        self.stamp = None
+        self.load()
+
+    def _stat_stamp(self):
+        st = os.stat(self.path)
+        return (st.st_mtime_ns, st.st_size)
+
+    def load(self):
+        # newline='' keeps the original line endings (CRLF on Windows)
+        with open(self.path, 'r', newline='') as f:
+            self.lines = f.readlines()
+        self.stamp = self._stat_stamp()
+        self.index = {}
+        for num, line in enumerate(self.lines):
+            if line.strip().startswith('#'):
+                continue
+            parts = line.split()
+            if len(parts) >= 2:
+                self.index.setdefault(parts[1].lower(), []).append(num)
+
+    def is_stale(self):
+        try:
+            return self._stat_stamp() != self.stamp
+        except OSError:
+            return True
+
+    def lookup(self, domain):
+        """Return the IP currently mapped to domain, or None."""
+        nums = self.index.get(domain.lower())
+        return self.lines[nums[0]].split()[0] if nums else None
+
+    def _render(self, mappings):
+        drop = set()
+        additions = []
+        for domain, ip in mappings.items():
+            nums = self.index.get(domain.lower(), [])
+            if ip and len(nums) == 1 and self.lines[nums[0]].split()[0] == ip:
+                continue  # Already mapped exactly as requested
+            drop.update(nums)
+            if ip:
+                additions.append(f"{ip} {domain} {FALLBACK_MARKER}")
+        if not drop and not additions:
+            return None
+
+        new_lines = [line for num, line in enumerate(self.lines) if num not in drop]
+        if additions:
+            newline = '\r\n' if self.lines and self.lines[0].endswith('\r\n') else '\n'
+            if new_lines and not new_lines[-1].endswith('\n'):
+                new_lines.append(newline)
+            new_lines.extend(entry + newline for entry in additions)
+        return new_lines
+
+    def apply(self, mappings):
+        """
+        Apply {domain: ip} mappings (ip=None removes the domain) in a single rewrite.
+        Returns True if the file changed. Raises PermissionError if it is not writable.
+        """
+        if self.is_stale():
+            self.load()
+        new_lines = self._render(mappings)
+        if new_lines is None:
+            return False
+
+        # Another tool may have edited the file meanwhile: re-parse so its change is kept
+        if self.is_stale():
+            self.load()
+            new_lines = self._render(mappings)
+            if new_lines is None:
+                return False
+
+        self._write(new_lines)
+        self.lines = new_lines
+        self.load()
+        return True
+
+    def _write(self, lines):
+        # Rewritten in place in one write() call: replacing the file would reset its owner,
+        # ACLs and SELinux label, and fails outright on a bind-mounted /etc/hosts (containers)
+        with open(self.path, 'w', newline='') as f:
+            f.write("".join(lines))
+
+_hosts_cache = {}
+
+def get_hosts_file(path=None):
+    """Return a cached parsed HostsFile, re-reading it only when it changed on disk."""
+    path = path or HOSTS_FILE
+    hosts = _hosts_cache.get(path)
+    if hosts is None:
+        hosts = HostsFile(path)
+        _hosts_cache[path] = hosts
+    elif hosts.is_stale():
+        hosts.load()
+    return hosts
+
+def _edit_hosts_batch(mappings, hosts_path=None):
     try:
-        with open(HOSTS_FILE, 'r') as f:
-            lines = f.readlines()
-        
-        # Remove existing entries for this domain
-        new_lines = []
-        for line in lines:
-            if not line.strip().startswith('#'):
-                parts = line.split()
-                if len(parts) >= 2 and parts[1].lower() == domain.lower():
-                    continue
-            new_lines.append(line)
-            
-        # Add new if ip is provided
-        if ip:
-            if not new_lines or not new_lines[-1].endswith('\n'):
-                new_lines.append('\n')
-            new_lines.append(f"{ip} {domain} # Headscale Auto-Fallback\n")
-            
-        with open(HOSTS_FILE, 'w') as f:
-            f.writelines(new_lines)
-            
+        get_hosts_file(hosts_path).apply(mappings)
         return True
-    except Exception as e:
+    except Exception:
         return False
 
-def apply_fallback(domain, ip):
+def _edit_hosts(domain, ip=None, hosts_path=None):
+    return _edit_hosts_batch({domain: ip}, hosts_path)
+
+def _elevate(args):
+    if sys.platform != "win32":
+        return False
+    script_path = os.path.abspath(__file__)
+    params = " ".join(f'"{a}"' for a in [script_path] + list(args))
+    # ShellExecuteW returns > 32 if successful
+    ret = ctypes.windll.shell32.ShellExecuteW(None, "runas", sys.executable, params, None, 0)
+    return int(ret) > 32
+
+def apply_fallbacks(mappings, hosts_path=None):
     """
-    Attempts to map a domain to an IP in the system hosts file.
+    Maps several domains to IPs in the system hosts file with a single rewrite.
     Uses 'check-first' UAC logic to elevate only if necessary.
     """
-    # Check if domain already maps to this IP
     try:
-        import socket
-        if socket.gethostbyname(domain) == ip:
-            return True # Already resolving correctly, no need to touch hosts
-    except Exception:
-        pass
+        hosts = get_hosts_file(hosts_path)
+    except OSError:
+        return False
+
+    pending = {d: ip for d, ip in mappings.items() if hosts.lookup(d) != ip}
+    if not pending:
+        return True # Already mapped, no need to touch hosts
 
     # Try silent edit first
     try:
-        with open(HOSTS_FILE, 'a') as f:
-            pass # just checking write access
-        if _edit_hosts(domain, ip):
-            return True
+        hosts.apply(pending)
+        return True
     except PermissionError:
         pass
-        
+    except Exception:
+        return False
+
     # Needs elevation
-    script_path = os.path.abspath(__file__)
-    # ShellExecuteW returns > 32 if successful
-    ret = ctypes.windll.shell32.ShellExecuteW(None, "runas", sys.executable, f'"{script_path}" apply "{domain}" "{ip}"', None, 0)
-    return int(ret) > 32
+    args = ["apply"]
+    for domain, ip in pending.items():
+        args.extend([domain, ip])
+    return _elevate(args)
 
-def remove_fallback(domain):
+def apply_fallback(domain, ip, hosts_path=None):
+    """
+    Attempts to map a domain to an IP in the system hosts file.
+    Uses 'check-first' UAC logic to elevate only if necessary.
+    """
+    return apply_fallbacks({domain: ip}, hosts_path)
+
+def remove_fallback(domain, hosts_path=None):
     """
     Removes the domain mapping from the system hosts file.
     """
-    # Try silent first
     try:
-        with open(HOSTS_FILE, 'a') as f:
-            pass
-        if _edit_hosts(domain, None):
+        hosts = get_hosts_file(hosts_path)
+        if hosts.lookup(domain) is None:
             return True
+        # Try silent first
+        hosts.apply({domain: None})
+        return True
     except PermissionError:
         pass
-        
-    script_path = os.path.abspath(__file__)
-    ret = ctypes.windll.shell32.ShellExecuteW(None, "runas", sys.executable, f'"{script_path}" remove "{domain}"', None, 0)
-    return int(ret) > 32
+    except Exception:
+        return False
+
+    return _elevate(["remove", domain])
 
 if __name__ == "__main__":
     if len(sys.argv) >= 3:
         action = sys.argv[1]
-        domain = sys.argv[2]
-        ip = sys.argv[3] if len(sys.argv) > 3 else None
-        
-        if action == "apply" and ip:
-            _edit_hosts(domain, ip)
+        values = sys.argv[2:]
+
+        # apply <domain> <ip> [<domain> <ip> ...] | remove <domain> [<domain> ...]
+        if action == "apply" and len(values) >= 2:
+            _edit_hosts_batch(dict(zip(values[0::2], values[1::2])))
         elif action == "remove":
-            _edit_hosts(domain, None)
+            _edit_hosts_batch({domain: None for domain in values})
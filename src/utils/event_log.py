@@ -0,0 +1,65 @@
+# src/utils/event_log.py
+# This is the structured event log for the application.
+
+import json
+import logging
+import os
+import time
+from logging.handlers import RotatingFileHandler
+
+EVENT_LOG_NAME = "events.jsonl"
+
+_event_logger = None
+
+class _RawFormatter(logging.Formatter):
+    def format(self, record):
+        return record.getMessage()
+
+def _scrub(value):
+    from .logger import scrub_credentials
+    if isinstance(value, str):
+        return scrub_credentials(value)
+    if isinstance(value, (list, tuple)):
+        return [_scrub(v) for v in value]
+    return value
+
+def setup_event_log(app_dir, max_bytes=5*1024*1024, backup_count=3):
+    """Start writing events to <app_dir>/events.jsonl through the queued logging pipeline."""
+    global _event_logger
+    from .logger import attach_queue_listener
+
+    os.makedirs(app_dir, exist_ok=True)
+    handler = RotatingFileHandler(os.path.join(app_dir, EVENT_LOG_NAME), maxBytes=max_bytes,
+                                  backupCount=backup_count, encoding="utf-8")
+    handler.setFormatter(_RawFormatter())
+
+    logger = attach_queue_listener("TailscaleClient.events", logging.INFO, handler)
+    logger.propagate = False  # Keep JSON out of app.log
+    _event_logger = logger
+    return logger
+
+def log_event(kind, **fields):
+    """Record one event as a compact JSON line. A no-op until setup_event_log() has run."""
+    logger = _event_logger
+    if logger is None:
+        return
+    try:
+        event = {"ts": round(time.time(), 3), "event": kind}
+        for key, value in fields.items():
+            event[key] = _scrub(value)
+        logger.info(json.dumps(event, separators=(",", ":"), default=str))
+    except Exception:
+        pass
+
+def read_events(path, kinds=None):
+    """Yield event dicts from a JSON-lines file, optionally only the given event kinds."""
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            if kinds and not any(f'"event":"{kind}"' in line for kind in kinds):
+                continue  # Skip the JSON parse for lines that cannot match
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue
+            if not kinds or event.get("event") in kinds:
+                yield event
@@ -6,78 +6,157 @@ import sys
 import json
 import socket
 
-def query_local_api(path=None):
-    """Query the Tailscale Local API for status JSON securely and with near-zero CPU footprint."""
+DEFAULT_PIPE = r"\\.\pipe\ProtectedPrefix\administrators\Tailscale\tailscaled"
+DEFAULT_SOCKET = "/var/run/tailscale/tailscaled.sock"
+# Common macOS App Store socket path fallback
+MAC_FALLBACK_SOCKET = "/Library/Containers/io.tailscale.ipn.macos/Data/tailscaled.sock"
+STATUS_ENDPOINT = "/localapi/v0/status"
+READ_SIZE = 65536
+
+def get_local_api_path(path=None):
+    """Named Pipe (Windows) or Unix socket path; TAILSCALE_LOCALAPI_SOCKET overrides the default."""
+    path = path or os.environ.get("TAILSCALE_LOCALAPI_SOCKET")
+    if sys.platform == "win32":
+        return path or DEFAULT_PIPE
+    if path:
+        return path
+    if not os.path.exists(DEFAULT_SOCKET) and os.path.exists(MAC_FALLBACK_SOCKET):
+        return MAC_FALLBACK_SOCKET
+    return DEFAULT_SOCKET
+
+def _build_request(endpoint):
+    # Connection: close lets bodies without a length end at EOF instead of hanging
+    return (f"GET {endpoint} HTTP/1.1\r\nHost: local-tailscaled.sock\r\n"
+            f"Connection: close\r\n\r\n").encode("ascii")
+
+def _read_response(recv):
+    """
+    Read one HTTP response through recv(n) and return its body bytes. Handles
+    Content-Length, chunked transfer encoding and read-until-EOF bodies, so
+    large netmaps are never truncated at a single read.
+    """
+    buf = bytearray()
+    while True:
+        end = buf.find(b"\r\n\r\n")
+        if end != -1:
+            break
+        chunk = recv(READ_SIZE)
+        if not chunk:
+            raise RuntimeError("Connection closed before response headers")
+        buf += chunk
+
+    head = bytes(buf[:end]).decode("latin-1").split("\r\n")
+    del buf[:end + 4]
+    try:
+        code = int(head[0].split(" ", 2)[1])
+    except (IndexError, ValueError):
+        raise RuntimeError(f"Malformed status line: {head[0]!r}")
+    headers = {}
+    for line in head[1:]:
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        body = _read_chunked(buf, recv)
+    elif "content-length" in headers:
+        length = int(headers["content-length"])
+        while len(buf) < length:
+            chunk = recv(max(READ_SIZE, length - len(buf)))
+            if not chunk:
+                raise RuntimeError("Connection closed mid-body")
+            buf += chunk
+        body = bytes(buf[:length])
+    else:
+        while True:
+            chunk = recv(READ_SIZE)
+            if not chunk:
+                break
+            buf += chunk
+        body = bytes(buf)
+
+    if code != 200:
+        raise RuntimeError(f"Local API returned HTTP {code}: {body[:200].decode('utf-8', 'replace').strip()}")
+    return body
+
+def _read_chunked(buf, recv):
+    body = bytearray()
+    pos = 0
+    while True:
+        line_end = buf.find(b"\r\n", pos)
+        while line_end == -1:
+            chunk = recv(READ_SIZE)
+            if not chunk:
+                raise RuntimeError("Connection closed mid-chunk")
+            buf += chunk
+            line_end = buf.find(b"\r\n", pos)
+        size = int(bytes(buf[pos:line_end]).split(b";", 1)[0], 16)
+        start = line_end + 2
+        if size == 0:
+            return bytes(body)  # Trailers (if any) are ignored
+        while len(buf) < start + size + 2:
+            chunk = recv(max(READ_SIZE, start + size + 2 - len(buf)))
+            if not chunk:
+                raise RuntimeError("Connection closed mid-chunk")
+            buf += chunk
+        body += buf[start:start + size]
+        pos = start + size + 2
+        if pos > READ_SIZE:
+            # Drop consumed chunks so the buffer stays small on big responses
+            del buf[:pos]
+            pos = 0
+
+def local_api_get(endpoint, path=None, timeout=5.0):
+    """GET a Local API endpoint and return the decoded JSON."""
+    target = get_local_api_path(path)
     if sys.platform == "win32":
-        pipe_path = path or r"\\.\pipe\ProtectedPrefix\administrators\Tailscale\tailscaled"
         try:
             # Open Windows Named Pipe
-            f = open(pipe_path, "r+b", buffering=0)
-            request = b"GET /localapi/v0/status HTTP/1.1\r\nHost: local-tailscaled\r\n\r\n"
-            f.write(request)
-            response = f.read(65536)
-            f.close()
-            
-            parts = response.split(b"\r\n\r\n", 1)
-            if len(parts) == 2:
-                return json.loads(parts[1].decode('utf-8'))
+            with open(target, "r+b", buffering=0) as f:
+                f.write(_build_request(endpoint))
+                body = _read_response(f.read)
         except Exception as e:
             raise RuntimeError(f"Named Pipe connection failed: {e}")
     else:
-        sock_path = path or "/var/run/tailscale/tailscaled.sock"
-        # Common macOS App Store socket path fallback
-        mac_fallback = "/Library/Containers/io.tailscale.ipn.macos/Data/tailscaled.sock"
-        if not os.path.exists(sock_path) and os.path.exists(mac_fallback):
-            sock_path = mac_fallback
-            
         try:
             s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-            s.connect(sock_path)
-            request = b"GET /localapi/v0/status HTTP/1.1\r\nHost: local-tailscaled\r\n\r\n"
-            s.sendall(request)
-            
-            response = b""
-            while True:
-                chunk = s.recv(4096)
-                if not chunk:
-                    break
-                response += chunk
-            s.close()
-            
-            parts = response.split(b"\r\n\r\n", 1)
-            if len(parts) == 2:
-                return json.loads(parts[1].decode('utf-8'))
+            try:
+                s.settimeout(timeout)
+                s.connect(target)
+                s.sendall(_build_request(endpoint))
+                body = _read_response(s.recv)
+            finally:
+                s.close()
         except Exception as e:
             raise RuntimeError(f"Unix Domain Socket connection failed: {e}")
-            
-    raise RuntimeError("Unsupported platform or empty response")
+    if not body:
+        raise RuntimeError("Empty response")
+    return json.loads(body)
+
+def query_local_api(path=None):
+    """Query the Tailscale Local API for status JSON securely and with near-zero CPU footprint."""
+    return local_api_get(STATUS_ENDPOINT, path)
 
 def is_local_api_available(path=None):
     """Universal, platform-independent check to see if the Tailscale Local API is available.
     Returns True if the Named Pipe (Windows) or Unix Domain Socket (Linux/macOS) accepts connection.
     """
+    target = get_local_api_path(path)
     if sys.platform == "win32":
-        pipe_path = path or r"\\.\pipe\ProtectedPrefix\administrators\Tailscale\tailscaled"
         try:
             # Try to open the Named Pipe briefly to test availability
-            f = open(pipe_path, "r+b", buffering=0)
+            f = open(target, "r+b", buffering=0)
             f.close()
             return True
         except Exception:
             return False
     else:
-        sock_path = path or "/var/run/tailscale/tailscaled.sock"
-        mac_fallback = "/Library/Containers/io.tailscale.ipn.macos/Data/tailscaled.sock"
-        if not os.path.exists(sock_path) and os.path.exists(mac_fallback):
-            sock_path = mac_fallback
-            
-        if not os.path.exists(sock_path):
+        if not os.path.exists(target):
             return False
-            
+
         try:
             s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
             s.settimeout(0.5) # Sub-second timeout to keep checks lightning-fast
-            s.connect(sock_path)
+            s.connect(target)
             s.close()
             return True
         except Exception:
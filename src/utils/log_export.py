@@ -0,0 +1,64 @@
+# src/utils/log_export.py
+# This is the log bundle export utility for the application.
+
+import os
+import zipfile
+from .log_reader import log_stem
+
+EXPORT_EXTENSIONS = (".log", ".txt", ".jsonl")
+COPY_CHUNK = 1024 * 1024
+
+class ExportCancelled(Exception):
+    pass
+
+def collect_export_files(log_dir):
+    """(full_path, arcname, size) for every log and rotated backup under log_dir."""
+    files = []
+    for root, _, names in os.walk(log_dir):
+        for name in names:
+            if log_stem(name).endswith(EXPORT_EXTENSIONS):
+                full_path = os.path.join(root, name)
+                try:
+                    size = os.path.getsize(full_path)
+                except OSError:
+                    continue
+                files.append((full_path, os.path.relpath(full_path, log_dir), size))
+    return files
+
+def export_logs(log_dir, save_path, progress=None, is_cancelled=None):
+    """
+    Stream every log under log_dir into a zip at save_path, copying in chunks.
+    Already-gzipped backups are stored rather than deflated a second time.
+    progress(done_bytes, total_bytes) is called after each chunk; returning True
+    from is_cancelled() aborts and removes the partial archive.
+    """
+    files = collect_export_files(log_dir)
+    total = sum(size for _, _, size in files) or 1
+    done = 0
+    try:
+        with zipfile.ZipFile(save_path, "w", zipfile.ZIP_DEFLATED) as zipf:
+            for full_path, arcname, _ in files:
+                compress_type = zipfile.ZIP_STORED if full_path.endswith(".gz") else zipfile.ZIP_DEFLATED
+                info = zipfile.ZipInfo.from_file(full_path, arcname)
+                info.compress_type = compress_type
+                try:
+                    with open(full_path, "rb") as src, zipf.open(info, "w", force_zip64=True) as dst:
+                        while True:
+                            if is_cancelled and is_cancelled():
+                                raise ExportCancelled()
+                            chunk = src.read(COPY_CHUNK)
+                            if not chunk:
+                                break
+                            dst.write(chunk)
+                            done += len(chunk)
+                            if progress:
+                                progress(done, total)
+                except FileNotFoundError:
+                    continue  # Rotated or compressed away while exporting
+    except BaseException:
+        try:
+            os.remove(save_path)
+        except OSError:
+            pass
+        raise
+    return len(files)
@@ -0,0 +1,140 @@
+# src/utils/log_index.py
+# This is the in-memory log index for the application.
+
+import bisect
+import heapq
+import re
+
+LEVELS = ("info", "warn", "error", "debug")
+
+_TOKEN_RE = re.compile(r"\w+")
+
+def classify_line(line):
+    up = line.upper()
+    if "ERROR" in up or "CRITICAL" in up or "EXCEPTION" in up: return "error"
+    if "WARNING" in up or "WARN" in up: return "warn"
+    if "DEBUG" in up: return "debug"
+    return "info"
+
+def tokenize(text):
+    return _TOKEN_RE.findall(text.lower())
+
+class LogIndex:
+    """
+    Log lines classified once on insert, with a row list per level and an
+    inverted token index (token -> ascending row numbers) to narrow searches.
+    """
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.lines = []
+        self.levels = []
+        self.level_rows = {level: [] for level in LEVELS}
+        self.postings = {}
+        self._vocabulary = None  # Sorted tokens, rebuilt lazily for prefix lookups
+
+    def __len__(self):
+        return len(self.lines)
+
+    def append(self, line):
+        row = len(self.lines)
+        level = classify_line(line)
+        self.lines.append(line)
+        self.levels.append(level)
+        self.level_rows[level].append(row)
+        for token in set(tokenize(line)):
+            rows = self.postings.get(token)
+            if rows is None:
+                self.postings[token] = [row]
+                self._vocabulary = None
+            else:
+                rows.append(row)
+        return row
+
+    def extend(self, lines):
+        start = len(self.lines)
+        for line in lines:
+            self.append(line)
+        return range(start, len(self.lines))
+
+    def prepend(self, older):
+        """
+        Put the lines of another index (consumed) before this one's, shifting
+        this index's rows; nothing is classified or tokenized again.
+        """
+        shift = len(older.lines)
+        if not shift:
+            return
+        self.lines = older.lines + self.lines
+        self.levels = older.levels + self.levels
+        for level in LEVELS:
+            self.level_rows[level] = older.level_rows[level] + [row + shift for row in self.level_rows[level]]
+        postings = older.postings
+        for token, rows in self.postings.items():
+            shifted = [row + shift for row in rows]
+            existing = postings.get(token)
+            if existing is None:
+                postings[token] = shifted
+            else:
+                existing.extend(shifted)
+        self.postings = postings
+        self._vocabulary = None
+
+    def rows_for_levels(self, levels):
+        """Ascending rows whose level is in levels."""
+        selected = [self.level_rows[level] for level in LEVELS if level in levels]
+        if len(selected) == len(LEVELS):
+            return list(range(len(self.lines)))
+        if len(selected) == 1:
+            return list(selected[0])
+        return list(heapq.merge(*selected))
+
+    def _rows_for_word(self, word, starts, ends):
+        """
+        Rows with a token containing word. starts/ends require the token to
+        begin/end with it, i.e. the word is delimited on that side in the query.
+        """
+        if starts and ends:
+            return set(self.postings.get(word, ()))
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+        if starts:
+            start = bisect.bisect_left(self._vocabulary, word)
+            tokens = []
+            for token in self._vocabulary[start:]:
+                if not token.startswith(word):
+                    break
+                tokens.append(token)
+        elif ends:
+            tokens = [token for token in self._vocabulary if token.endswith(word)]
+        else:
+            tokens = [token for token in self._vocabulary if word in token]
+        if len(tokens) == 1:
+            return set(self.postings[tokens[0]])
+        return set().union(*(self.postings[token] for token in tokens))
+
+    def search(self, query, rows=None):
+        """
+        Ascending rows containing query, case-insensitively (the same matches as
+        a plain substring scan). The token index narrows the candidates, which
+        are then checked against the line itself.
+        rows optionally restricts the result (e.g. to the current level filter).
+        """
+        needle = query.lower()
+        words = [(m.group(), m.start() > 0, m.end() < len(needle)) for m in _TOKEN_RE.finditer(needle)]
+        if not words:
+            candidates = range(len(self.lines)) if rows is None else rows
+            return [row for row in candidates if needle in self.lines[row].lower()]
+
+        # Delimited and longer words usually match fewer rows: intersect them first
+        words.sort(key=lambda w: (w[1] + w[2], len(w[0])), reverse=True)
+        matched = None
+        for word, starts, ends in words:
+            found = self._rows_for_word(word, starts, ends)
+            matched = found if matched is None else matched & found
+            if not matched:
+                return []
+        if rows is not None:
+            matched.intersection_update(rows)
+        return sorted(row for row in matched if needle in self.lines[row].lower())
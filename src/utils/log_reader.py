@@ -0,0 +1,216 @@
+# src/utils/log_reader.py
+# This is the log file reading utility for the application.
+
+import gzip
+import os
+from collections import deque
+
+def iter_lines_reversed(path, chunk_size=65536, end=None):
+    """
+    Yield the lines of a file from last to first, reading fixed-size chunks
+    backwards from the end (or from byte offset end) so only the part actually
+    consumed is read. Lines keep their trailing newline; decoding ignores invalid UTF-8.
+    """
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        position = size = f.tell() if end is None else min(end, f.tell())
+        remainder = b""
+        at_end = True
+        while position > 0:
+            read_size = min(chunk_size, position)
+            position -= read_size
+            f.seek(position)
+            block = f.read(read_size) + remainder
+            parts = block.split(b"\n")
+            # The first part may be the tail of a line that starts in an earlier chunk
+            remainder = parts.pop(0)
+            if at_end and parts and not parts[-1]:
+                parts.pop()  # The file ends with a newline, not an empty line
+            at_end = False
+            for raw in reversed(parts):
+                yield raw.decode("utf-8", errors="ignore") + "\n"
+        if size:
+            # Whatever is left is the file's first line (possibly blank)
+            yield remainder.decode("utf-8", errors="ignore") + "\n"
+
+def log_stem(name):
+    """Base log name for a file or its rotated backup: app.log.3.gz -> app.log."""
+    if name.endswith(".gz"):
+        name = name[:-3]
+    while "." in name and name.rsplit(".", 1)[-1].isdigit():
+        name = name.rsplit(".", 1)[0]
+    return name
+
+def tail_lines(path, max_lines=1000, chunk_size=65536, end=None):
+    """
+    Return the last max_lines lines of a file in order, without reading the whole file.
+    end stops a plain file at that byte offset (ignored for .gz backups).
+    """
+    if path.endswith(".gz"):
+        # Compressed backups can't be read backwards; stream them through a bounded deque
+        with gzip.open(path, "rt", encoding="utf-8", errors="ignore") as f:
+            return [line if line.endswith("\n") else line + "\n" for line in deque(f, maxlen=max_lines)]
+    lines = []
+    for line in iter_lines_reversed(path, chunk_size, end):
+        lines.append(line)
+        if len(lines) >= max_lines:
+            break
+    lines.reverse()
+    return lines
+
+def rotated_paths(path, max_backups=5):
+    """The live log followed by its existing RotatingFileHandler backups (plain or gzipped), newest first."""
+    paths = [path] if os.path.exists(path) else []
+    for n in range(1, max_backups + 1):
+        backup = f"{path}.{n}"
+        if os.path.exists(backup):
+            paths.append(backup)  # Not compressed yet (or written before compression existed)
+        elif os.path.exists(backup + ".gz"):
+            paths.append(backup + ".gz")
+        else:
+            break
+    return paths
+
+def tail_block(path, max_bytes=65536):
+    """
+    (start, lines): the whole lines within the last max_bytes of a plain file, and
+    the byte offset the first of them starts at (where an older read can stop).
+    """
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        start = max(0, size - max_bytes)
+        f.seek(start)
+        data = f.read(size - start)
+    if start:
+        # Drop the partial line the block begins in; it belongs to the older part
+        cut = data.find(b"\n") + 1
+        if not cut:
+            return size, []
+        start += cut
+        data = data[cut:]
+    parts = data.split(b"\n")
+    if not parts[-1]:
+        parts.pop()  # Ends with a newline, not an empty line
+    return start, [raw.decode("utf-8", errors="ignore") + "\n" for raw in parts]
+
+def tail_rotated_lines(path, max_lines=20000, end=None):
+    """
+    Return up to max_lines of the most recent lines across a log and its backups,
+    oldest first. end stops the live log at that byte offset.
+    """
+    chunks = []
+    remaining = max_lines
+    for candidate in rotated_paths(path):
+        if remaining <= 0:
+            break
+        lines = tail_lines(candidate, remaining, end=end if candidate == path else None)
+        chunks.append(lines)
+        remaining -= len(lines)
+    return [line for chunk in reversed(chunks) for line in chunk]
+
+# Bytes kept from the end of the last read, to recognise the old file once it is gzipped
+TAIL_CHECK_BYTES = 64
+
+class LogFollower:
+    """
+    Incrementally reads lines appended to a log file. The byte offset and file
+    identity are tracked so a RotatingFileHandler rollover (rename + new file)
+    or a truncation restarts reading at the beginning of the new file. Lines
+    written just before a rollover are drained from the backup, plain or gzipped.
+    """
+    def __init__(self, path, start_at_end=True, max_read=4 * 1024 * 1024):
+        self.path = path
+        self.max_read = max_read
+        self.offset = 0
+        self._identity = None
+        self._partial = b""
+        self._tail = b""
+        if start_at_end:
+            self.seek_end()
+        else:
+            self._identity = self._stat_identity()
+
+    def _stat_identity(self):
+        try:
+            st = os.stat(self.path)
+            return (st.st_dev, st.st_ino)
+        except OSError:
+            return None
+
+    def seek_end(self):
+        """Skip everything currently in the file."""
+        try:
+            st = os.stat(self.path)
+            self.offset = st.st_size
+            self._identity = (st.st_dev, st.st_ino)
+            with open(self.path, "rb") as f:
+                f.seek(max(0, self.offset - TAIL_CHECK_BYTES))
+                self._tail = f.read(self.offset - f.tell())
+        except OSError:
+            self.offset = 0
+            self._identity = None
+            self._tail = b""
+        self._partial = b""
+
+    def _read_from(self, path, offset):
+        with open(path, "rb") as f:
+            f.seek(offset)
+            return f.read(self.max_read)
+
+    def _read_rotated(self):
+        """The old file's bytes past our offset, from .1 or, once the rotator compressed it, .1.gz."""
+        backup = self.path + ".1"
+        try:
+            bst = os.stat(backup)
+            if (bst.st_dev, bst.st_ino) == self._identity:
+                return self._read_from(backup, self.offset) if bst.st_size > self.offset else b""
+        except OSError:
+            pass
+        if not self._tail:
+            return b""
+        try:
+            with gzip.open(backup + ".gz", "rb") as f:
+                head = f.read(self.offset + self.max_read)
+        except (OSError, EOFError):
+            return b""
+        # No inode survives compression: check that the bytes we read last end at our offset
+        if head[max(0, self.offset - len(self._tail)):self.offset] != self._tail:
+            return b""
+        return head[self.offset:]
+
+    def read_new_lines(self):
+        """Return (lines, rotated): complete lines appended since the last call."""
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            # Mid-rotation: the old file was renamed and the new one isn't there yet
+            return [], False
+
+        data = b""
+        rotated = False
+        identity = (st.st_dev, st.st_ino)
+        if identity != self._identity or st.st_size < self.offset:
+            rotated = self._identity is not None
+            if rotated and identity != self._identity:
+                # Pick up whatever was written to the old file after our last read
+                data = self._read_rotated()
+            self._identity = identity
+            self.offset = 0
+            self._tail = b""
+
+        if st.st_size > self.offset:
+            try:
+                chunk = self._read_from(self.path, self.offset)
+            except OSError:
+                chunk = b""
+            self.offset += len(chunk)
+            self._tail = (self._tail + chunk)[-TAIL_CHECK_BYTES:]
+            data += chunk
+
+        if not data:
+            return [], rotated
+        parts = (self._partial + data).split(b"\n")
+        # Keep an incomplete trailing line until the writer finishes it
+        self._partial = parts.pop()
+        return [part.decode("utf-8", errors="ignore") + "\n" for part in parts], rotated
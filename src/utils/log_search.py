@@ -0,0 +1,136 @@
+# src/utils/log_search.py
+# This is the multi-file log search engine for the application.
+
+import gzip
+import heapq
+import mmap
+import os
+import re
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from .log_reader import log_stem
+
+SearchHit = namedtuple("SearchHit", ["timestamp", "path", "line_number", "text"])
+
+# "2024-05-01 12:00:00,123" (logging) and "2024/05/01 12:00:00.123456" (tailscaled)
+_TIMESTAMP_RE = re.compile(rb"\s*(\d{4})[-/](\d{2})[-/](\d{2})[ T](\d{2}):(\d{2}):(\d{2})(?:[.,](\d{1,6}))?")
+
+# How far back a continuation line (e.g. a traceback) looks for the entry's timestamp
+_TIMESTAMP_LOOKBACK = 4096
+
+def discover_log_files(app_dir):
+    """Every log the client writes: app-level logs, per-profile logs and their rotated backups."""
+    paths = []
+    for directory in (app_dir, os.path.join(app_dir, "GlobalLogs")):
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            continue
+        for name in names:
+            stem = log_stem(name)  # app.log.3.gz -> app.log
+            if stem.endswith(".log") or stem.endswith(".jsonl"):
+                full = os.path.join(directory, name)
+                if os.path.isfile(full):
+                    paths.append(full)
+    return sorted(paths)
+
+def parse_timestamp(line):
+    """Epoch seconds for a line starting with a timestamp, else None."""
+    if line.startswith(b'{"ts":'):
+        # Structured event lines (events.jsonl) carry epoch seconds first
+        try:
+            return float(line[6:line.index(b",")])
+        except ValueError:
+            return None
+    m = _TIMESTAMP_RE.match(line)
+    if not m:
+        return None
+    try:
+        parts = [int(g) for g in m.groups()[:6]]
+        fraction = m.group(7) or b"0"
+        return datetime(*parts).timestamp() + int(fraction) / (10 ** len(fraction))
+    except (ValueError, OverflowError):
+        return None
+
+def _timestamp_before(buf, line_start, fallback):
+    """Timestamp of the nearest timestamped line at or before line_start."""
+    floor = max(0, line_start - _TIMESTAMP_LOOKBACK)
+    start = line_start
+    while start >= floor:
+        end = buf.find(b"\n", start)
+        ts = parse_timestamp(buf[start:end if end != -1 else len(buf)])
+        if ts is not None:
+            return ts
+        if start == 0:
+            break
+        start = buf.rfind(b"\n", 0, start - 1) + 1
+    return fallback
+
+def compile_query(query, regex=False, ignore_case=True):
+    pattern = query.encode("utf-8") if regex else re.escape(query.encode("utf-8"))
+    return re.compile(pattern, re.IGNORECASE if ignore_case else 0)
+
+def search_file(path, pattern, max_hits=None):
+    """
+    Scan one file with a compiled bytes pattern: plain files through mmap, gzipped
+    backups decompressed in memory. Returns hits sorted by timestamp; untimestamped
+    lines use the nearest earlier timestamp or the file mtime.
+    """
+    try:
+        if path.endswith(".gz"):
+            mtime = os.path.getmtime(path)
+            with gzip.open(path, "rb") as f:
+                return _search_buffer(f.read(), path, pattern, mtime, max_hits)
+        with open(path, "rb") as f:
+            st = os.fstat(f.fileno())
+            if st.st_size == 0:
+                return []
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                return _search_buffer(buf, path, pattern, st.st_mtime, max_hits)
+    except (OSError, ValueError, EOFError):
+        return []
+
+def _search_buffer(buf, path, pattern, mtime, max_hits=None):
+    hits = []
+    size = len(buf)
+    line_number = 1
+    counted_to = 0
+    pos = 0
+    while pos < size:
+        m = pattern.search(buf, pos)
+        if not m:
+            break
+        line_start = buf.rfind(b"\n", 0, m.start()) + 1
+        line_end = buf.find(b"\n", m.end())
+        if line_end == -1:
+            line_end = size
+
+        line_number += buf[counted_to:line_start].count(b"\n")
+        counted_to = line_start
+
+        text = buf[line_start:line_end].decode("utf-8", errors="ignore").rstrip("\r")
+        ts = _timestamp_before(buf, line_start, mtime)
+        hits.append(SearchHit(ts, path, line_number, text))
+        if max_hits and len(hits) >= max_hits:
+            break
+        pos = line_end + 1  # One hit per line
+    hits.sort(key=lambda h: h.timestamp)
+    return hits
+
+def search_logs(paths, query, regex=False, ignore_case=True, newest_first=True, limit=5000, max_workers=4):
+    """Search many log files in parallel and merge the hits by timestamp."""
+    pattern = compile_query(query, regex, ignore_case)
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="log-search") as executor:
+        per_file = list(executor.map(lambda p: search_file(p, pattern), paths))
+
+    if newest_first:
+        for hits in per_file:
+            hits.reverse()
+    merged = heapq.merge(*per_file, key=lambda h: h.timestamp, reverse=newest_first)
+    results = []
+    for hit in merged:
+        results.append(hit)
+        if limit and len(results) >= limit:
+            break
+    return results
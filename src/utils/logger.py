@@ -1,8 +1,11 @@
+import atexit
 import logging
 import os
+import queue
 import sys
 import json
-from logging.handlers import RotatingFileHandler
+import threading
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 
 # This will be set during initialization in main.py
 APP_DIR = None
@@ -18,29 +21,127 @@ class ScrubbingFormatter(logging.Formatter):
             record.msg = orig_msg
         return val
 
+# --- Compressed rotation ---
+
+import gzip
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+# One worker keeps compressions ordered; its thread is joined at interpreter exit
+_compress_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="log-compress")
+
+def _gzip_file(source, dest):
+    tmp = dest + ".tmp"
+    try:
+        with open(source, "rb") as src, gzip.open(tmp, "wb", compresslevel=6) as dst:
+            shutil.copyfileobj(src, dst, 1024 * 1024)
+        os.replace(tmp, dest)
+        os.remove(source)
+    except Exception:
+        # Leave the uncompressed backup in place; readers handle both forms
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+def _gz_namer(name):
+    return name + ".gz"
+
+# Plain backup path -> its compression job, so a quick second rollover can wait for it
+_pending_compressions = {}
+
+def _move_up_pending_backup(plain, backup_count):
+    """
+    A rollover came before the previous backup was compressed. The handler only
+    shifts .N.gz files, so move that backup up one slot ourselves; otherwise the
+    new backup would overwrite it before readers (LogFollower) have drained it.
+    """
+    pending = _pending_compressions.pop(plain, None)
+    if pending is not None:
+        pending.result()  # Blocks the logging listener thread, never the GUI
+    base = plain.rsplit(".", 1)[0]
+    for path, target in ((plain + ".gz", f"{base}.2.gz"), (plain, f"{base}.2")):
+        if not os.path.exists(path):
+            continue
+        try:
+            if backup_count > 1:
+                os.replace(path, target)
+            else:
+                os.remove(path)  # No slot to move to, as the handler would do
+        except OSError:
+            pass
+
+def _compressing_rotator(source, dest, backup_count=1):
+    # Rename synchronously (cheap) so the handler can reopen the live file,
+    # then compress the backup off the logging thread
+    plain = dest[:-3] if dest.endswith(".gz") else dest
+    if plain != dest:
+        _move_up_pending_backup(plain, backup_count)
+    os.replace(source, plain)
+    if plain != dest:
+        _pending_compressions[plain] = _compress_executor.submit(_gzip_file, plain, dest)
+
+def compress_stale_backups(log_file, backup_count):
+    """Compress uncompressed numbered backups left by older versions or an interrupted rotation."""
+    for n in range(1, backup_count + 1):
+        plain = f"{log_file}.{n}"
+        if os.path.exists(plain) and not os.path.exists(plain + ".gz"):
+            _pending_compressions[plain] = _compress_executor.submit(_gzip_file, plain, plain + ".gz")
+
+def enable_compressed_rotation(handler):
+    """Make a RotatingFileHandler keep its backups as .N.gz, compressed in the background."""
+    handler.namer = _gz_namer
+    handler.rotator = lambda source, dest: _compressing_rotator(source, dest, handler.backupCount)
+    compress_stale_backups(handler.baseFilename, handler.backupCount)
+
+# Listener (and the real handlers behind it) per logger name, so re-running
+# setup_logger for the same name replaces the pipeline instead of stacking it
+_listeners = {}
+
+def _stop_listener(name):
+    listener = _listeners.pop(name, None)
+    if listener:
+        listener.stop()  # Drains the queue before returning
+        for handler in listener.handlers:
+            handler.close()
+
 def setup_logger(name, log_file, level=logging.DEBUG):
-    """Setup a standard logger with rotating file and console output."""
+    """Setup a standard logger with rotating file and console output.
+
+    Records are only enqueued on the calling thread; formatting, scrubbing and
+    file I/O happen on a QueueListener thread.
+    """
     os.makedirs(os.path.dirname(log_file), exist_ok=True)
     
     formatter = ScrubbingFormatter('%(asctime)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s')
     
     # Standard handler
     handler = RotatingFileHandler(log_file, maxBytes=10*1024*1024, backupCount=5)
+    enable_compressed_rotation(handler)
     handler.setFormatter(formatter)
 
+    # Also log to console. Bind the real stderr: sys.stderr may already be a
+    # StreamToLogger, which would feed console output back into this logger.
+    console_handler = logging.StreamHandler(sys.__stderr__)
+    console_handler.setFormatter(formatter)
+
+    return attach_queue_listener(name, level, handler, console_handler)
+
+def attach_queue_listener(name, level, *handlers):
+    """Route a logger through a queue to handlers served by a background listener thread."""
     logger = logging.getLogger(name)
     logger.setLevel(level)
     
     # Clear existing handlers to avoid duplicates
     if logger.hasHandlers():
         logger.handlers.clear()
-        
-    logger.addHandler(handler)
+    _stop_listener(name)
 
-    # Also log to console
-    console_handler = logging.StreamHandler()
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(QueueHandler(log_queue))
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    _listeners[name] = listener
 
     return logger
 
@@ -48,15 +149,16 @@ def setup_logger(name, log_file, level=logging.DEBUG):
 
 import re
 
+# Tailscale auth keys (tskey-auth-...) and auth keys passed as connection arguments
+_CREDENTIALS_RE = re.compile(r'(tskey-auth-|--authkey=|--auth-key=)\S+')
+
 def scrub_credentials(text):
     if not text or not isinstance(text, str):
         return text
-    # Mask Tailscale auth keys (e.g. tskey-auth-...)
-    text = re.sub(r'tskey-auth-\S+', 'tskey-auth-[REDACTED]', text)
-    # Mask any potential API keys/passwords in connection arguments
-    text = re.sub(r'--authkey=\S+', '--authkey=[REDACTED]', text)
-    text = re.sub(r'--auth-key=\S+', '--auth-key=[REDACTED]', text)
-    return text
+    # Cheap substring checks skip the regex for the vast majority of lines
+    if "tskey-auth-" not in text and "--auth" not in text:
+        return text
+    return _CREDENTIALS_RE.sub(r'\1[REDACTED]', text)
 
 class StreamToLogger:
     """Redirects stdout/stderr to the logging module with integrated credential scrubbing."""
@@ -65,8 +167,8 @@ class StreamToLogger:
         self.log_level = log_level
 
     def write(self, buf):
-        scrubbed = scrub_credentials(buf)
-        for line in scrubbed.rstrip().splitlines():
+        # Scrubbing happens once, in the logger's ScrubbingFormatter
+        for line in buf.rstrip().splitlines():
             if line.strip():
                 self.logger.log(self.log_level, line.rstrip())
 
@@ -101,23 +203,72 @@ def refresh_all_loggers(base_dir, enabled):
     manage_sys_streams(enabled, logger)
     return logger
 
-def write_profile_log(profile_name, data):
-    """Safely append connection standard output to a profile-specific log file."""
-    try:
-        safe_name = "".join(c for c in profile_name if c.isalnum() or c in (' ', '.', '_', '-')).strip().replace(' ', '_')
+# Persistent, buffered per-profile log files. Connection output arrives in many
+# small chunks; a background flusher bounds how stale the files can get.
+PROFILE_LOG_FLUSH_INTERVAL = 2.0
+_profile_files = {}
+_profile_lock = threading.Lock()
+_profile_flusher = None
+_profile_flusher_stop = threading.Event()
+
+def _profile_log_path(profile_name):
+    safe_name = "".join(c for c in profile_name if c.isalnum() or c in (' ', '.', '_', '-')).strip().replace(' ', '_')
+    app_dir = APP_DIR
+    if not app_dir:
         if sys.platform == "win32":
             app_dir = os.path.join(os.environ.get('APPDATA', ''), "Tailscale_VPN_Client")
         else:
             app_dir = os.path.join(os.path.expanduser("~"), ".local", "share", "Tailscale_VPN_Client")
-        
-        log_dir = os.path.join(app_dir, "GlobalLogs")
-        os.makedirs(log_dir, exist_ok=True)
-        log_file = os.path.join(log_dir, f"{safe_name}_connection.log")
-        
-        with open(log_file, "a", encoding="utf-8") as f:
+    return os.path.join(app_dir, "GlobalLogs", f"{safe_name}_connection.log")
+
+def _profile_flush_loop():
+    while not _profile_flusher_stop.wait(PROFILE_LOG_FLUSH_INTERVAL):
+        flush_profile_logs()
+
+def flush_profile_logs():
+    with _profile_lock:
+        for f in _profile_files.values():
+            try:
+                f.flush()
+            except Exception:
+                pass
+
+def close_profile_logs():
+    with _profile_lock:
+        for f in _profile_files.values():
+            try:
+                f.close()
+            except Exception:
+                pass
+        _profile_files.clear()
+
+def write_profile_log(profile_name, data):
+    """Safely append connection standard output to a profile-specific log file."""
+    global _profile_flusher
+    try:
+        with _profile_lock:
+            f = _profile_files.get(profile_name)
+            if f is None:
+                log_file = _profile_log_path(profile_name)
+                os.makedirs(os.path.dirname(log_file), exist_ok=True)
+                f = open(log_file, "a", encoding="utf-8", buffering=64 * 1024)
+                _profile_files[profile_name] = f
             f.write(data + "\n")
+
+        if _profile_flusher is None:
+            _profile_flusher = threading.Thread(target=_profile_flush_loop, name="profile-log-flusher", daemon=True)
+            _profile_flusher.start()
     except Exception:
         pass
 
+def shutdown_logging():
+    """Flush everything still buffered or queued; registered to run at exit."""
+    _profile_flusher_stop.set()
+    close_profile_logs()
+    for name in list(_listeners):
+        _stop_listener(name)
+
+atexit.register(shutdown_logging)
+
 # Global instance for easy access
 app_logger = None